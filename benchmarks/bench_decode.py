@@ -0,0 +1,82 @@
+"""Micro-benchmark of the JSON decoders of smm_wrapper.decoders
+
+Measures the decode time per MB of every installed decoder on JSON fixtures, by default generated
+payloads shaped like the aggregated, entity list and raw chobs responses of the SMM API.
+
+Usage:
+    python benchmarks/bench_decode.py [--fixtures DIR] [--repeat N]
+"""
+import os
+import glob
+import json
+import time
+import random
+import argparse
+
+from smm_wrapper.decoders import DECODERS, get_decoder
+
+
+def generated_fixtures() -> dict:
+    """Returns payloads shaped like the responses of the SMM API
+    """
+    random.seed(0)
+    labels = ['{}-{:02d}-01'.format(year, month) for year in range(2000, 2020) for month in range(1, 13)]
+
+    aggregated = {'response_type': 'aggregated', 'aggregated_by': 'month',
+                  'labels': labels, 'values': [random.randint(0, 500) for _ in labels]}
+    entities = [{'politician_id': i, 'name': 'Name {}'.format(i), 'firstname': 'First', 'affiliation': 'Party',
+                 'fb_ids': [random.randint(10**14, 10**15)], 'tw_ids': [random.randint(10**8, 10**9)],
+                 'wp_ids': [random.randint(10**5, 10**7)], 'wp_titles': ['Title {}'.format(i)],
+                 'tw_sns': ['screen_name_{}'.format(i)], 'wp_sns': []} for i in range(5000)]
+    chobs = {'response_type': 'chobs', 'chobs': [
+        {'right_token': i, 'left_token': i - 1,
+         'ins_tokens': [random.randint(0, 10**6) for _ in range(random.randint(0, 20))],
+         'del_tokens': [random.randint(0, 10**6) for _ in range(random.randint(0, 5))],
+         'right_token_str': 'word', 'left_token_str': 'other',
+         'ins_tokens_str': ['token'] * random.randint(0, 20), 'del_tokens_str': ['gone'] * random.randint(0, 5)}
+        for i in range(50000)]}
+
+    return {'aggregated': json.dumps([aggregated] * 200).encode(),
+            'entities': json.dumps(entities).encode(),
+            'chobs': json.dumps(chobs).encode()}
+
+
+def recorded_fixtures(directory: str) -> dict:
+    """Returns the JSON files of a directory of recorded responses
+    """
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(directory, '**', '*.json'), recursive=True)):
+        with open(path, 'rb') as f:
+            fixtures[os.path.relpath(path, directory)] = f.read()
+    return fixtures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fixtures', help='directory of recorded JSON responses (generated payloads by default)')
+    parser.add_argument('--repeat', type=int, default=5, help='decodes per payload, the best one is reported')
+    args = parser.parse_args()
+
+    fixtures = recorded_fixtures(args.fixtures) if args.fixtures else generated_fixtures()
+
+    decoders = {}
+    for name in DECODERS:
+        try:
+            decoders[name] = get_decoder(name)
+        except ImportError:
+            print('{:<10} not installed'.format(name))
+
+    print('{:<24} {:>9} {:<10} {:>10}'.format('fixture', 'MB', 'decoder', 'ms/MB'))
+    for fixture, content in fixtures.items():
+        size = len(content) / 2**20
+        for name, decode in decoders.items():
+            best = float('inf')
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                decode(content)
+                best = min(best, time.perf_counter() - start)
+            print('{:<24} {:>9.2f} {:<10} {:>10.2f}'.format(fixture, size, name, best * 1000 / size))
+
+
+if __name__ == '__main__':
+    main()
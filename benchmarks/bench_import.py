@@ -0,0 +1,81 @@
+"""Import time of smm_wrapper
+
+Imports smm_wrapper in fresh interpreters with python -X importtime and reports the median time of the
+import, the slowest modules it imports, and whether pandas was imported (it should only be imported
+when a DataView is used). With --max-ms, exits with an error if the median is above the limit, e.g. to
+keep it from regressing in CI.
+
+Usage:
+    python benchmarks/bench_import.py [--module smm_wrapper] [--repeat N] [--top N] [--max-ms MS]
+"""
+import sys
+import argparse
+import statistics
+import subprocess
+
+
+def import_times(module: str) -> dict:
+    """Import module in a fresh interpreter
+
+    Returns:
+        dict: module and the modules imported by it -> cumulative import time in ms
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, check=True)
+
+    lines = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        lines.append((len(name) - len(name.lstrip()), name.strip(), int(cumulative) / 1000))
+
+    # a module is listed after the modules it imports, which are nested deeper; the interpreter
+    # startup (site, ...) is listed before
+    index = max(i for i, (_, name, _) in enumerate(lines) if name == module)
+    depth = lines[index][0]
+    times = {module: lines[index][2]}
+    for level, name, ms in reversed(lines[:index]):
+        if level <= depth:
+            break
+        times[name] = ms
+    return times
+
+
+def imports(module: str, other: str) -> bool:
+    """Returns whether importing module imports other
+    """
+    result = subprocess.run([sys.executable, '-c', f'import sys, {module}; print({other!r} in sys.modules)'],
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip() == 'True'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--module', default='smm_wrapper', help='the module to import')
+    parser.add_argument('--repeat', type=int, default=10, help='number of fresh interpreters')
+    parser.add_argument('--top', type=int, default=10, help='number of slowest imported modules to show')
+    parser.add_argument('--max-ms', type=float, help='fail if the median import time is above this')
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.repeat)]
+    median = statistics.median(run[args.module] for run in runs)
+
+    print('{:<40} {:>10.1f} ms (median of {})'.format(args.module, median, args.repeat))
+    print('{:<40} {:>10}'.format('imports pandas', str(imports(args.module, 'pandas'))))
+
+    # top level packages only, their submodules are included in their time
+    packages = {}
+    for name in runs[0]:
+        if name != args.module and '.' not in name:
+            packages[name] = statistics.median(run.get(name, 0.0) for run in runs)
+    print('\nslowest imports:')
+    for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print('  {:<38} {:>10.1f} ms'.format(name, ms))
+
+    if args.max_ms is not None and median > args.max_ms:
+        sys.exit(f'import of {args.module} took {median:.1f} ms, more than {args.max_ms} ms')
+
+
+if __name__ == '__main__':
+    main()
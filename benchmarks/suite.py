@@ -0,0 +1,211 @@
+"""Benchmark suite of smm_wrapper
+
+Measures, against the local mock server (smm_wrapper.mockserver) and its fixtures:
+    request.*   sequential and concurrent request throughput of the SMMAPI
+    decode.*    JSON decode time of every installed decoder
+    dataview.*  the public DataView methods (get_all, tweets_by, posts_by, wikipedia, ...) on the
+                fixtures, answered in process so that only the DataView is timed
+    wikipedia.* conversion of raw chobs (_wikipedia_frame with aggregate_by=None), wide and long
+
+Every run is saved as benchmarks/results/<commit>.json, so that runs of different commits can be
+compared with --compare.
+
+Usage:
+    python benchmarks/suite.py [--filter TEXT] [--repeat N] [--scale N] [--latency S] [--compare COMMIT]
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+import subprocess
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+from smm_wrapper import SMMAPI
+from smm_wrapper.decoders import DECODERS, get_decoder
+from smm_wrapper.mockserver import MockServer, _load, _scale
+from smm_wrapper.views import DataView, _wikipedia_frame
+
+
+RESULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+#: name -> function(context) returning (the function to time, the number of items it processes, unit)
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark
+    """
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+@benchmark('request.sequential')
+def request_sequential(context):
+    api, ids = context['api'], range(1, 51)
+    return lambda: [api.tweets_by(_id=_id) for _id in ids], len(ids), 'requests'
+
+
+@benchmark('request.concurrent')
+def request_concurrent(context):
+    api, ids = context['api'], range(1, 201)
+    return lambda: api.fetch_many('tweets_by', ids), len(ids), 'requests'
+
+
+def _decode_benchmark(decoder: str, fixture: str):
+    def setup(context):
+        decode = get_decoder(decoder)
+        content = json.dumps(context['payloads'][fixture]).encode()
+        return lambda: decode(content), len(content) / 2**20, 'MB'
+    return setup
+
+
+for _decoder in DECODERS:
+    for _fixture in ('aggregated', 'entities', 'chobs'):
+        benchmark(f'decode.{_decoder}.{_fixture}')(_decode_benchmark(_decoder, _fixture))
+
+
+class _FixtureAPI(SMMAPI):
+
+    """SMMAPI answered by a MockServer in process, without HTTP nor decoding
+    """
+
+    def __init__(self, server: MockServer, unit: str='politicians'):
+        super().__init__(domain=server.domain, unit=unit)
+        self.server = server
+
+    def request(self, url: str, tries=2, params: dict=None, stream: bool=False):
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        return self.server.respond(urlsplit(url).path, params)[1]
+
+
+def _dataview_benchmark(method: str, **query):
+    def setup(context):
+        dv = context['dataview']
+        rows = len(getattr(dv, method)(**query))
+        return lambda: getattr(dv, method)(**query), rows, 'rows'
+    return setup
+
+
+for _method, _query in [('get_all', {}),
+                        ('get_one', {'_id': 1}),
+                        ('tweets_by', {'_id': 1, 'aggregate_by': 'day'}),
+                        ('replies_to', {'_id': 1, 'aggregate_by': 'day'}),
+                        ('posts_by', {'_id': 1, 'aggregate_by': 'day'}),
+                        ('comments_by', {'_id': 1, 'aggregate_by': 'day'}),
+                        ('general_tweets', {'aggregate_by': 'day'}),
+                        ('wikipedia', {'_id': 1, 'aggregate_by': 'day'}),
+                        ('wikipedia.raw', {'_id': 1, 'aggregate_by': None})]:
+    benchmark(f'dataview.{_method}')(_dataview_benchmark(_method.split('.')[0], **_query))
+
+
+@benchmark('wikipedia.raw.wide')
+def wikipedia_wide(context):
+    response = context['payloads']['chobs']
+    return lambda: _wikipedia_frame(response, None, 'wide', _id=1), len(response['chobs']), 'chobs'
+
+
+@benchmark('wikipedia.raw.long')
+def wikipedia_long(context):
+    response = context['payloads']['chobs']
+    return lambda: _wikipedia_frame(response, None, 'long', _id=1), len(response['chobs']), 'chobs'
+
+
+def measure(func, repeat: int) -> dict:
+    """Time func repeat times (after a warm up call)
+
+    Returns:
+        dict: best and median seconds per call
+    """
+    func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {'best': min(times), 'median': statistics.median(times)}
+
+
+def commit() -> str:
+    """Returns the short hash of the checked out commit, with a + if the tree has changes
+    """
+    try:
+        sha = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                             check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True,
+                               text=True, check=True).stdout.strip()
+        return sha + ('+' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filter', default='', help='only run the benchmarks whose name contains this text')
+    parser.add_argument('--repeat', type=int, default=5, help='timed calls per benchmark')
+    parser.add_argument('--scale', type=int, default=100, help='repeat the records of the payloads this many times')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds of latency of the mock server')
+    parser.add_argument('--compare', help='commit of a stored run to compare with')
+    parser.add_argument('--no-save', action='store_true', help='do not store the results')
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    server = MockServer(latency=args.latency).start()
+    context = {
+        'api': SMMAPI(domain=server.domain, unit='politicians', max_workers=16),
+        'dataview': DataView(_FixtureAPI(MockServer(scale=args.scale)), id_column='politician_id'),
+        'payloads': {'aggregated': _load('aggregated_day.json'),
+                     'entities': _scale(_load('politicians_all.json'), args.scale),
+                     'chobs': _scale(_load('chobs.json'), args.scale)},
+    }
+
+    baseline = {}
+    if args.compare:
+        with open(os.path.join(RESULTS, f'{args.compare}.json')) as f:
+            baseline = json.load(f)['results']
+
+    results = {}
+    print('{:<32} {:>12} {:>12} {:>27} {:>9}'.format('benchmark', 'best ms', 'median ms', 'rate',
+                                                     'vs ' + args.compare if args.compare else ''))
+    for name in names:
+        try:
+            func, items, unit = BENCHMARKS[name](context)
+        except ImportError:
+            print('{:<32} not installed'.format(name))
+            continue
+
+        result = dict(measure(func, args.repeat), items=items, unit=unit)
+        result['rate'] = items / result['best']
+        results[name] = result
+
+        change = ''
+        if name in baseline:
+            change = '{:+.1%}'.format(result['best'] / baseline[name]['best'] - 1)
+        print('{:<32} {:>12.3f} {:>12.3f} {:>14.1f} {:<12} {:>9}'.format(
+            name, result['best'] * 1000, result['median'] * 1000, result['rate'], unit + '/s', change))
+
+    server.stop()
+
+    if not args.no_save:
+        run = {'commit': commit(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': sys.version.split()[0],
+               'pandas': pd.__version__, 'machine': platform.platform(), 'args': vars(args), 'results': results}
+        os.makedirs(RESULTS, exist_ok=True)
+        path = os.path.join(RESULTS, '{}.json'.format(run['commit']))
+        # runs of a subset of the benchmarks are merged into the stored run of the commit
+        if os.path.exists(path):
+            with open(path) as f:
+                stored = json.load(f)['results']
+            run['results'] = dict(stored, **results)
+        with open(path, 'w') as f:
+            json.dump(run, f, indent=2)
+        print('saved', os.path.relpath(path))
+
+
+if __name__ == '__main__':
+    main()
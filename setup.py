@@ -20,6 +20,8 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/gesiscss/smm_wrapper",
     packages=setuptools.find_packages(),
+    # recorded responses served by smm_wrapper.mockserver
+    package_data={'smm_wrapper': ['fixtures/*.json']},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -31,5 +33,13 @@ setuptools.setup(
     # your project is installed. For an analysis of "install_requires" vs pip's
     # requirements files see:
     # https://packaging.python.org/en/latest/requirements.html
-    install_requires=['requests', 'pandas']
+    # pandas 2 for to_datetime(format='ISO8601') and the Arrow backed arrays of the DataView
+    install_requires=['requests', 'pandas>=2.0'],
+    # optional dependencies, e.g. pip install smm_wrapper[async]
+    extras_require={
+        'async': ['httpx'],
+        'parquet': ['pyarrow'],
+        'fast': ['orjson'],
+        'prometheus': ['prometheus_client'],
+    }
 )
@@ -1,15 +1,49 @@
-import pkg_resources
+import importlib
 name = "smm_wrapper"
-try:
-	__version__ = pkg_resources.require(name)[0].version
-except:
-	__version__ = None
 
 
 from .api import SMMAPI
-from .views import DataView
 from .smm import SMM
 from .smm import SMMPoliticians
 from .smm import SMMOrganizations
+from .index import EntityIndex
+from .cache import ResponseCache, SQLiteCache, DateRangeCache
+from .retry import RetryPolicy
+from .ratelimit import TokenBucket, AIMDConcurrency
+from .singleflight import SingleFlight
+from .memo import FrameMemo
+from .instrumentation import Instrumentation, Recorder, PrometheusInstrumentation
 
+#: attributes imported on first use, their modules import pandas, httpx or pyarrow
+_LAZY = {
+	'DataView': 'views',
+	'AsyncSMMAPI': 'async_api',
+	'AsyncDataView': 'async_views',
+	'IncrementalSync': 'sync',
+	'ParquetStore': 'store',
+	'Reaggregator': 'reaggregate',
+}
 
+
+def _version():
+	try:
+		from importlib.metadata import version
+		return version(name)
+	except:
+		return None
+
+
+def __getattr__(attr):
+	if attr == '__version__':
+		value = _version()
+	elif attr in _LAZY:
+		value = getattr(importlib.import_module('.' + _LAZY[attr], __name__), attr)
+	else:
+		raise AttributeError(f"module '{__name__}' has no attribute '{attr}'")
+
+	globals()[attr] = value
+	return value
+
+
+def __dir__():
+	return sorted(set(globals()) | set(_LAZY) | {'__version__'})
@@ -1,15 +1,166 @@
 """Summary
 """
 from typing import Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
 import os
+import time
+import logging
+import datetime
+import functools
+import collections
+import importlib.util
 import requests
 
-from . import __version__
+from .cache import ResponseCache, DateRangeCache
+from .retry import RetryPolicy
+from .ratelimit import TokenBucket, AIMDConcurrency
+from .routes import Routes
+from .streaming import iter_json_array
+from .decoders import get_decoder
+from .singleflight import SingleFlight
+from .instrumentation import Instrumentation, RequestMetrics
 
 
-class SMMAPI:
+# urllib3 and httpx can only decode brotli if the brotli (or brotlicffi) package is installed
+if importlib.util.find_spec('brotli') or importlib.util.find_spec('brotlicffi'):
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+else:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+
+#: bytes read from the socket at a time when streaming a response
+STREAM_CHUNK_SIZE = 2**16
+
+logger = logging.getLogger(__name__)
+
+
+def _fan_out(func, ids, max_workers: int, ordered: bool=True, **kwargs):
+    """Call ``func(_id=_id, **kwargs)`` for every id on a bounded thread pool
+
+    Args:
+        func (callable): the function to call for each id
+        ids (iterable): the ids that will be passed as ``_id``
+        max_workers (int): maximum number of calls in flight at the same time
+        ordered (bool, optional): return the results in input order, or stream them as they finish
+        **kwargs: passed through to every call
+
+    Returns:
+        list: results in the same order as ``ids`` (ordered=True)
+        generator: ``(_id, result)`` tuples in completion order (ordered=False)
+    """
+    ids = list(ids)
+
+    if ordered:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(func, _id=_id, **kwargs) for _id in ids]
+            return [future.result() for future in futures]
+
+    def _completed():
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(func, _id=_id, **kwargs): _id for _id in ids}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    return _completed()
+
+
+def _metrics(url: str, family: str, attempt: int, response, error, elapsed: float, stream: bool) -> RequestMetrics:
+    """Returns the RequestMetrics of an attempt; the body of a streamed response is not read yet
+    """
+    if response is None:
+        return RequestMetrics(url, family, attempt, None, error, elapsed, None, None, None, None)
+
+    ttfb = response.elapsed.total_seconds()
+    length = response.headers.get('Content-Length')
+
+    return RequestMetrics(url, family, attempt, response.status_code, error, elapsed, ttfb,
+                          None if stream else max(elapsed - ttfb, 0.0),
+                          None if stream else len(response.content),
+                          int(length) if length is not None and length.isdigit() else None)
+
+
+def _attempt_end(client, url: str, family: str, attempt: int, response, error, start: float, stream: bool=False):
+    """Report the outcome of an attempt that started at start (time.monotonic) to the concurrency limit
+    and the instrumentation of the client. The SMMAPI and the AsyncSMMAPI both go through _attempt_end,
+    _retry_delay and _decode, so that they feed the same hooks; httpx responses have the attributes of
+    requests responses that are used.
+    """
+    elapsed = time.monotonic() - start
+    if client.concurrency is not None:
+        client.concurrency.release(elapsed, error is not None and client.retry.is_retryable(error))
+    if client.instrumentation is not None:
+        client.instrumentation.request_end(_metrics(url, family, attempt, response, error, elapsed, stream))
+
+
+def _retry_delay(client, url: str, family: str, attempt: int, error, response) -> float:
+    """Returns the seconds to wait before retrying a failed attempt, reporting the retry to the
+    instrumentation of the client and to the log, see _attempt_end
+    """
+    delay = client.retry.backoff(attempt, response)
+    if client.instrumentation is not None:
+        client.instrumentation.retry(url, family, attempt, error, delay)
+    logger.warning('%s failed (attempt %d of %d): %s, retrying in %.1fs',
+                   url, attempt + 1, client.retry.attempts + 1, error, delay)
+    return delay
+
+
+def _decode(client, url: str, content: bytes):
+    """Decode the body of a response, reporting the time it took to the instrumentation of the client,
+    see _attempt_end
+    """
+    if client.instrumentation is None:
+        return client.decode(content)
+
+    start = time.perf_counter()
+    result = client.decode(content)
+    client.instrumentation.decode(url, client.family(url), time.perf_counter() - start, len(content))
+    return result
+
+
+def _windows(from_date: str, to_date: str, window) -> list:
+    """Returns the (from_date, to_date) of consecutive date windows covering from_date to to_date, both
+    included
+
+    Args:
+        from_date (str): the first day (format: YYYY-MM-DD)
+        to_date (str): the last day (format: YYYY-MM-DD), today if None
+        window (int or str): a number of days (at least 1), or 'week', 'month' or 'year' for calendar windows
+
+    Raises:
+        ValueError: if window is not a positive number of days, 'week', 'month' or 'year'
+    """
+    if isinstance(window, str):
+        valid = window in ('week', 'month', 'year')
+    else:
+        valid = isinstance(window, int) and not isinstance(window, bool) and window >= 1
+    if not valid:
+        raise ValueError(f"window must be a number of days (at least 1), 'week', 'month' or 'year', not '{window}'")
+
+    day = datetime.timedelta(days=1)
+    start = datetime.date.fromisoformat(from_date)
+    end = datetime.date.fromisoformat(to_date) if to_date is not None else datetime.date.today()
+
+    windows = []
+    while start <= end:
+        if isinstance(window, int):
+            stop = start + (window - 1) * day
+        elif window == 'week':
+            stop = start + (6 - start.weekday()) * day
+        elif window == 'month':
+            stop = datetime.date(start.year + start.month // 12, start.month % 12 + 1, 1) - day
+        else:
+            stop = datetime.date(start.year, 12, 31)
+
+        stop = min(stop, end)
+        windows.append((start.isoformat(), stop.isoformat()))
+        start = stop + day
+
+    return windows
+
+
+class SMMAPI(Routes):
 
     """The APIs provide provenance and change information about the tokens a Wikipedia article consists of, for several languages. Apart from the source language edition they draw from, their specifications and usage are identical
 
@@ -18,8 +169,24 @@ class SMMAPI:
         base (url): Base request url
         base_editor (TYPE): Description
         session (TYPE): Description
+        max_workers (int): Maximum number of concurrent requests used by fetch_many
+        cache (ResponseCache): Cache of the decoded responses, or None
+        date_ranges (DateRangeCache): Cache answering the aggregated series from the dates already downloaded, or None
+        retry (RetryPolicy): Retry, backoff and timeout policy of every request
+        rate_limiter (TokenBucket): Rate limiter every request passes through, or None
+        concurrency (AIMDConcurrency): Adaptive limit of the requests in flight, or None
+        adapter (BaseAdapter): Transport adapter mounted on the session
+        decode (callable): Decodes the bytes of the JSON responses
+        flights (SingleFlight): Coalesces identical concurrent requests, or None
+        instrumentation (Instrumentation): Hooks called on every request, or None
     """
 
+    #: endpoints that accept an entity ``_id`` and can be used with fetch_many
+    BATCH_ENDPOINTS = ('get_one', 'tweets_by', 'replies_to', 'posts_by', 'comments_by', 'wikipedia')
+
+    #: endpoints with date filters that can be iterated by pages and date windows with iter_pages
+    PAGED_ENDPOINTS = ('tweets_by', 'replies_to', 'posts_by', 'comments_by', 'wikipedia', 'general_tweets')
+
     def __init__(self,
                  username: str=None,
                  password: str=None,
@@ -29,7 +196,20 @@ class SMMAPI:
                  domain: str="mediamonitoring.gesis.org",
                  unit: str="",
                  version: str="v1",
-                 attempts: int=2):
+                 attempts: int=2,
+                 max_workers: int=8,
+                 cache: ResponseCache=None,
+                 retry: RetryPolicy=None,
+                 rate_limiter: TokenBucket=None,
+                 concurrency: AIMDConcurrency=None,
+                 pool_connections: int=10,
+                 pool_maxsize: int=None,
+                 pool_block: bool=False,
+                 adapter: requests.adapters.BaseAdapter=None,
+                 json_decoder=None,
+                 coalesce: bool=True,
+                 instrumentation: Instrumentation=None,
+                 date_ranges: DateRangeCache=None):
         """Constructor of the SMMAPI
 
         Args:
@@ -40,11 +220,43 @@ class SMMAPI:
             protocol (str, optional): the protocol of the url
             domain (str, optional): the domain that hosts the api
             version (str, optional): the version of the api
-            attempts (int, optional): the number of attempts before giving up trying to connect
+            attempts (int, optional): the number of attempts before giving up trying to connect,
+                ignored if a retry policy is given
+            max_workers (int, optional): the maximum number of concurrent requests to the host in fetch_many
+            cache (ResponseCache, optional): a cache for the responses, e.g. SQLiteCache()
+            retry (RetryPolicy, optional): the retry policy of every request (RetryPolicy(attempts) by default)
+            rate_limiter (TokenBucket, optional): a rate limiter, which can be shared with other SMMAPI instances
+            concurrency (AIMDConcurrency, optional): an adaptive limit of the requests in flight
+            pool_connections (int, optional): the number of hosts whose connection pools are kept
+            pool_maxsize (int, optional): the maximum number of connections kept open per host (max_workers by default)
+            pool_block (bool, optional): never open more than pool_maxsize connections per host, wait instead
+            adapter (BaseAdapter, optional): a transport adapter to use instead of the default pooled
+                HTTPAdapter, e.g. an HTTP/2 capable one; the pool options are ignored if it is given
+            json_decoder (str or callable, optional): 'orjson', 'simdjson', 'json' or a function decoding
+                the bytes of a body (the fastest installed one by default)
+            coalesce (bool, optional): identical requests made concurrently by several threads share one
+                request, the waiting threads get a copy of its result (see SingleFlight)
+            instrumentation (Instrumentation, optional): hooks called with the timings, sizes, retries, cache
+                outcomes and decode times of the requests, and the frame times of the DataView, e.g. Recorder()
+            date_ranges (DateRangeCache, optional): answers the aggregated series whose dates were already
+                downloaded (by queries differing only by from_date and to_date) locally, e.g. DateRangeCache()
         """
         self.unit = unit
+        self.max_workers = max_workers
+        self.cache = cache
+        self.date_ranges = date_ranges
 
         self.session = requests.Session()
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        if adapter is None:
+            # keep (at least) one pooled connection per worker so that fetch_many
+            # does not discard and reopen connections to the host
+            adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections,
+                                                    pool_maxsize=pool_maxsize or max_workers,
+                                                    pool_block=pool_block)
+        self.adapter = adapter
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         if username and password:
             self.session.auth = (username, password)
 
@@ -53,22 +265,30 @@ class SMMAPI:
             self.session.params['api_key'] = api_key
 
         self.base = "{}://{}/api/{}/".format(protocol, domain, self.unit)
-        self.attempts = attempts
-
-    def get_all(self):
+        self.retry = retry or RetryPolicy(attempts=attempts)
+        self.attempts = self.retry.attempts
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.decode = get_decoder(json_decoder)
+        self.flights = SingleFlight() if coalesce else None
+        self.instrumentation = instrumentation
+
+    def get_all(self, stream=False):
         """Returns a list of all entities of politicians/organizations.
 
-        No input parameters
+        Input parameters:
+                        optional:
+                        stream (bool): yield the entities one by one while the response is downloaded
 
         Returns:
             list: result of the api query as documented in Entity list in 
                 http://mediamonitoring.gesis.org/api/politicians/swagger/
         """
 
-        smm_api_url = '{}all/'.format(self.base)
+        smm_api_url, _ = self.get_all_route()
 
         # return the dictionary
-        return self.request(smm_api_url)
+        return self.request(smm_api_url, stream=stream)
 
     def get_one(self, _id):
         """Returns the information of one politician/organization.
@@ -83,7 +303,7 @@ class SMMAPI:
         
         """
 
-        smm_api_url = '{}all/{}'.format(self.base, _id)
+        smm_api_url, _ = self.get_one_route(_id)
 
         # return the dictionary
         return self.request(smm_api_url)
@@ -101,16 +321,11 @@ class SMMAPI:
             names_contain: returns a list of all entities searched by names, firstnames and usernames
             _id: returns a given politician or organization by id
         """
-        if names_contain is not None:
-            url = '{}all/search/'.format(self.base)
-            parameters={'names_contain': names_contain}
-        elif _id is not None:
-            url = '{}all/{}/'.format(self.base, _id)
-            parameters = {}
+        url, parameters = self.all_search_route(names_contain, _id)
 
-        return self.session.get(url=url, params=parameters).json()
+        return self.request(url, params=parameters)
 
-    def tweets_by(self, twitter_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+    def tweets_by(self, twitter_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month', stream=False):
         """Returns query tweets made by politicians, or by a politician using twitter id or using politician id
 
         Input parameters:
@@ -122,23 +337,18 @@ class SMMAPI:
                         from_date (string($date)): filter by tweets posted after this date (format: YYYY-MM-DD)
                         to_date (string($date)): filter by tweets posted before this date (format: YYYY-MM-DD)
                         aggregate_by (str): criteria that will be used to aggregate (month by default)
+                        stream (bool): yield the records of a raw (aggregate_by=None) response one by one
+                            while it is downloaded, instead of returning the whole response
 
         Returns:
             dict, result of the api query as documented in twitter tweets_by/replies_to content in http://mediamonitoring.gesis.org/api/politicians/swagger/swagger/
         """
-        if twitter_user_id is None and _id is None:
-            url = '{}twitter/tweets_by/{}/'.format(self.base, self.unit)
-            parameters={'text_contains': text_contains, 'from_date': from_date, 'to_date':to_date, 'aggregate_by': aggregate_by}
-        elif twitter_user_id is not None:
-            url = '{}twitter/tweets_by/{}/user_id/{}/'.format(self.base, self.unit, twitter_user_id)
-            parameters={'text_contains': text_contains, 'from_date': from_date, 'to_date':to_date, 'aggregate_by': aggregate_by}
-        elif _id is not None:
-            url = '{}twitter/tweets_by/{}/{}/'.format(self.base, self.unit, _id)
-            parameters={'text_contains': text_contains, 'from_date': from_date, 'to_date':to_date, 'aggregate_by': aggregate_by}
-
-        return self.session.get(url=url, params=parameters).json()
-
-    def replies_to(self, twitter_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        url, parameters = self.entity_route(
+            'tweets_by', twitter_user_id, _id, text_contains, from_date, to_date, aggregate_by)
+
+        return self.request(url, params=parameters, stream=stream)
+
+    def replies_to(self, twitter_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month', stream=False):
         """Returns query twitter replies made by politicians, or by a politician using twitter id or using politician id
 
         Input parameters:
@@ -150,23 +360,18 @@ class SMMAPI:
                         from_date (string($date)): filter by tweets posted after this date (format: YYYY-MM-DD)
                         to_date (string($date)): filter by tweets posted before this date (format: YYYY-MM-DD)
                         aggregate_by (str): criteria that will be used to aggregate (month by default)
+                        stream (bool): yield the records of a raw (aggregate_by=None) response one by one
+                            while it is downloaded, instead of returning the whole response
 
         Returns:
             dict, result of the api query as documented in twitter tweets_by/replies_to content in http://mediamonitoring.gesis.org/api/politicians/swagger/swagger/
         """
-        if twitter_user_id is None and _id is None:
-            url = '{}twitter/replies_to/{}/'.format(self.base, self.unit)
-            parameters={'text_contains': text_contains, 'from_date': from_date, 'to_date':to_date, 'aggregate_by': aggregate_by}
-        elif twitter_user_id is not None:
-            url = '{}twitter/replies_to/{}/user_id/{}/'.format(self.base, self.unit, twitter_user_id)
-            parameters={'text_contains': text_contains, 'from_date': from_date, 'to_date':to_date, 'aggregate_by': aggregate_by}
-        elif _id is not None:
-            url = '{}twitter/replies_to/{}/{}/'.format(self.base, self.unit, _id)
-            parameters={'text_contains': text_contains, 'from_date': from_date, 'to_date':to_date, 'aggregate_by': aggregate_by}
-
-        return self.session.get(url=url, params=parameters).json()
-
-    def posts_by(self, facebook_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        url, parameters = self.entity_route(
+            'replies_to', twitter_user_id, _id, text_contains, from_date, to_date, aggregate_by)
+
+        return self.request(url, params=parameters, stream=stream)
+
+    def posts_by(self, facebook_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month', stream=False):
         """Returns query posts from facebook made by politicians, or by a politician using facebook id or using politician id
 
         Input parameters:
@@ -178,23 +383,18 @@ class SMMAPI:
                         from_date (string($date)): filter by tweets posted after this date (format: YYYY-MM-DD)
                         to_date (string($date)): filter by tweets posted before this date (format: YYYY-MM-DD)
                         aggregate_by (str): criteria that will be used to aggregate (month by default)
+                        stream (bool): yield the records of a raw (aggregate_by=None) response one by one
+                            while it is downloaded, instead of returning the whole response
 
         Returns:
             dict, result of the api query as documented in facebook posts_by/comments_by content in http://mediamonitoring.gesis.org/api/politicians/swagger/swagger/
         """
-        if facebook_user_id is None and _id is None:
-            url = '{}facebook/posts_by/{}/'.format(self.base, self.unit)
-            parameters={'text_contains': text_contains, 'from_date': from_date, 'to_date':to_date, 'aggregate_by': aggregate_by}
-        elif facebook_user_id is not None:
-            url = '{}facebook/posts_by/{}/user_id/{}/'.format(self.base, self.unit, facebook_user_id)
-            parameters={'text_contains': text_contains, 'from_date': from_date, 'to_date':to_date, 'aggregate_by': aggregate_by}
-        elif _id is not None:
-            url = '{}facebook/posts_by/{}/{}/'.format(self.base, self.unit, _id)
-            parameters={'text_contains': text_contains, 'from_date': from_date, 'to_date':to_date, 'aggregate_by': aggregate_by}
-
-        return self.session.get(url=url, params=parameters).json()
-
-    def comments_by(self, facebook_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        url, parameters = self.entity_route(
+            'posts_by', facebook_user_id, _id, text_contains, from_date, to_date, aggregate_by)
+
+        return self.request(url, params=parameters, stream=stream)
+
+    def comments_by(self, facebook_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month', stream=False):
         """Returns query comments from facebook made by politicians, or by a politician using facebook id or using politician id
 
         Input parameters:
@@ -206,23 +406,18 @@ class SMMAPI:
                         from_date (string($date)): filter by tweets posted after this date (format: YYYY-MM-DD)
                         to_date (string($date)): filter by tweets posted before this date (format: YYYY-MM-DD)
                         aggregate_by (str): criteria that will be used to aggregate (month by default)
+                        stream (bool): yield the records of a raw (aggregate_by=None) response one by one
+                            while it is downloaded, instead of returning the whole response
 
         Returns:
             dict, result of the api query as documented in facebook posts_by/comments_by content in http://mediamonitoring.gesis.org/api/politicians/swagger/swagger/
         """
-        if facebook_user_id is None and _id is None:
-            url = '{}facebook/comments_by/{}/'.format(self.base, self.unit)
-            parameters={'text_contains': text_contains, 'from_date': from_date, 'to_date':to_date, 'aggregate_by': aggregate_by}
-        elif facebook_user_id is not None:
-            url = '{}facebook/comments_by/{}/user_id/{}/'.format(self.base, self.unit, facebook_user_id)
-            parameters={'text_contains': text_contains, 'from_date': from_date, 'to_date':to_date, 'aggregate_by': aggregate_by}
-        elif _id is not None:
-            url = '{}facebook/comments_by/{}/{}/'.format(self.base, self.unit, _id)
-            parameters={'text_contains': text_contains, 'from_date': from_date, 'to_date':to_date, 'aggregate_by': aggregate_by}
-
-        return self.session.get(url=url, params=parameters).json()
-
-    def wikipedia(self, wikipedia_page_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        url, parameters = self.entity_route(
+            'comments_by', facebook_user_id, _id, text_contains, from_date, to_date, aggregate_by)
+
+        return self.request(url, params=parameters, stream=stream)
+
+    def wikipedia(self, wikipedia_page_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month', stream=False):
         """Returns change objects (chobs) that refer to politicians Wikipedia pages, or by a politician using wikipedia page id or using politician id
 
         Input parameters:
@@ -234,23 +429,18 @@ class SMMAPI:
                         from_date (string($date)): filter by chobs  after this date (format: YYYY-MM-DD)
                         to_date (string($date)): filter by chobs before this date (format: YYYY-MM-DD)
                         aggregate_by (str): criteria that will be used to aggregate (month by default)
+                        stream (bool): yield the records of a raw (aggregate_by=None) response one by one
+                            while it is downloaded, instead of returning the whole response
 
         Returns:
             dict, result of the api query as documented in wikipedia content in http://mediamonitoring.gesis.org/api/politicians/swagger/swagger/
         """
-        if wikipedia_page_id is None and _id is None:
-            url = '{}wikipedia/chobs/{}/'.format(self.base, self.unit)
-            parameters={'text_contains': text_contains, 'from_date': from_date, 'to_date':to_date, 'aggregate_by': aggregate_by}
-        elif wikipedia_page_id is not None:
-            url = '{}wikipedia/chobs/{}/page_id/{}/'.format(self.base, self.unit, wikipedia_page_id)
-            parameters={'text_contains': text_contains, 'from_date': from_date, 'to_date':to_date, 'aggregate_by': aggregate_by}
-        elif _id is not None:
-            url = '{}wikipedia/chobs/{}/{}/'.format(self.base, self.unit, _id)
-            parameters={'text_contains': text_contains, 'from_date': from_date, 'to_date':to_date, 'aggregate_by': aggregate_by}
-
-        return self.session.get(url=url, params=parameters).json()
-
-    def general_tweets(self, twitter_user_id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        url, parameters = self.entity_route(
+            'wikipedia', wikipedia_page_id, _id, text_contains, from_date, to_date, aggregate_by)
+
+        return self.request(url, params=parameters, stream=stream)
+
+    def general_tweets(self, twitter_user_id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month', stream=False):
         """Returns query tweets made by the general population. This tweets were collected separatedly using keywords.
 
         Input parameters:
@@ -260,26 +450,169 @@ class SMMAPI:
                         from_date (string($date)): filter by chobs  after this date (format: YYYY-MM-DD)
                         to_date (string($date)): filter by chobs before this date (format: YYYY-MM-DD)
                         aggregate_by (str): criteria that will be used to aggregate (month by default)
+                        stream (bool): yield the records of a raw (aggregate_by=None) response one by one
+                            while it is downloaded, instead of returning the whole response
 
         Returns:
             dict, result of the api query as documented in twitter (general public) content in http://mediamonitoring.gesis.org/api/politicians/swagger/swagger/
         """
-        if twitter_user_id is None:
-            url = '{}twitter/general_population/'.format(self.base)
-            parameters={'text_contains': text_contains, 'from_date': from_date, 'to_date':to_date, 'aggregate_by': aggregate_by}
-        else:
-            url = '{}twitter/general_population/user_id/{}/'.format(self.base, twitter_user_id)
-            parameters={'text_contains': text_contains, 'from_date': from_date, 'to_date':to_date, 'aggregate_by': aggregate_by}
-        
-        return self.session.get(url=url, params=parameters).json()
+        url, parameters = self.general_tweets_route(
+            twitter_user_id, text_contains, from_date, to_date, aggregate_by)
 
+        return self.request(url, params=parameters, stream=stream)
 
-    def request(self, url: str, tries=2) -> dict:
-        """Do the request
+    def fetch_many(self, endpoint: str, ids, max_workers: int=None, ordered: bool=True, **filters):
+        """Query one endpoint for many politicians/organizations concurrently
+
+        Input parameters:
+                        endpoint (str): one of BATCH_ENDPOINTS, e.g. 'tweets_by' or 'wikipedia'
+                        ids (iterable): unique values identifying the politicians or organizations
+                        optional:
+                        max_workers (int): maximum number of requests in flight (self.max_workers by default)
+                        ordered (bool): return the results in input order (True by default), or
+                            stream (_id, result) tuples as they finish
+                        **filters: passed to the endpoint, e.g. text_contains, from_date, to_date, aggregate_by
+
+        Returns:
+            list: the result of the endpoint for every id, in the same order as ids
+            generator: (_id, result) tuples in completion order if ordered is False
+        """
+        if endpoint not in self.BATCH_ENDPOINTS:
+            raise ValueError(f"endpoint must be one of {self.BATCH_ENDPOINTS}, not '{endpoint}'")
+
+        return _fan_out(getattr(self, endpoint), ids, max_workers or self.max_workers, ordered, **filters)
+
+    def batch(self, endpoint: str, ids, max_workers: int=None, **filters) -> dict:
+        """Query one endpoint for many politicians/organizations and return the results keyed by id
+
+        The SMM API has no route that accepts several ids, so every distinct id is one request. The
+        requests are sent concurrently over the pooled keep-alive connections of the session (see
+        pool_maxsize), so only the first requests to the host pay for the connection and TLS setup.
+
+        Input parameters:
+                        endpoint (str): one of BATCH_ENDPOINTS, e.g. 'tweets_by'
+                        ids (iterable): unique values identifying the politicians or organizations,
+                            repeated ids are requested once
+                        optional:
+                        max_workers (int): maximum number of requests in flight (self.max_workers by default)
+                        **filters: passed to the endpoint, e.g. text_contains, from_date, to_date, aggregate_by
+
+        Returns:
+            dict: id -> result of the endpoint, in the order of ids
+        """
+        ids = list(dict.fromkeys(ids))
+        results = dict(self.fetch_many(endpoint, ids, max_workers, ordered=False, **filters))
+
+        return {_id: results[_id] for _id in ids}
+
+    def iter_pages(self, endpoint: str, window=None, prefetch: int=2, **query):
+        """Iterate over the responses of a query page by page, downloading the next pages while the
+        previous ones are consumed, so that big queries start returning sooner and are not held in memory
+        at once.
+
+        Paginated responses (with a 'next' link, as the pages of Django REST framework) are followed page
+        by page. Queries can also be split into date windows, which is useful for endpoints that return
+        everything in one body, e.g. the raw chobs of wikipedia(aggregate_by=None).
+
+        Input parameters:
+                        endpoint (str): one of PAGED_ENDPOINTS, e.g. 'wikipedia'
+                        optional:
+                        window (int or str): split the query from from_date to to_date (today by default)
+                            into windows of this many days, or into calendar 'week', 'month' or 'year'
+                            windows, which do not split the buckets of an aggregated series of the same
+                            aggregate_by; requires from_date
+                        prefetch (int): number of pages or windows downloaded ahead (2 by default)
+                        **query: the ids and filters of the endpoint, e.g. _id, from_date, aggregate_by
+
+        Returns:
+            generator: the responses of the pages, in order
+        """
+        return (response for _, response in self._iter_windows(endpoint, window, prefetch, **query))
+
+    def _iter_windows(self, endpoint: str, window=None, prefetch: int=2, **query):
+        """Iterate over the responses of iter_pages with the query of the window they answer (query itself
+        if window is None), see iter_pages
+
+        Returns:
+            generator: (query of the window, response) tuples of the pages, in order
+        """
+        if endpoint not in self.PAGED_ENDPOINTS:
+            raise ValueError(f"endpoint must be one of {self.PAGED_ENDPOINTS}, not '{endpoint}'")
+
+        if window is None:
+            return self._follow(getattr(self, endpoint), [query], prefetch)
+
+        if query.get('from_date') is None:
+            raise ValueError('from_date is required to split a query into date windows')
+
+        windows = _windows(query['from_date'], query.get('to_date'), window)
+        return self._follow(getattr(self, endpoint),
+                            (dict(query, from_date=start, to_date=stop) for start, stop in windows), prefetch)
+
+    def _follow(self, func, queries, prefetch: int):
+        """Yield (query, response) for the calls func(**query) in order, and for the pages they link to, with
+        up to prefetch requests in flight ahead of the consumer
+        """
+        executor = ThreadPoolExecutor(max_workers=max(prefetch, 1))
+        queries = iter(queries)
+        pending = collections.deque()
+
+        def _submit():
+            query = next(queries, None)
+            if query is not None:
+                pending.append((query, executor.submit(functools.partial(func, **query))))
+
+        try:
+            for _ in range(max(prefetch, 1)):
+                _submit()
+
+            while pending:
+                query, future = pending.popleft()
+                response = future.result()
+                _submit()
+
+                # the pages of a response are requested one ahead, each one holds the link to the next
+                while True:
+                    link = response.get('next') if isinstance(response, dict) else None
+                    page = executor.submit(self.request, link) if link else None
+                    yield query, response
+                    if page is None:
+                        break
+                    response = page.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def connection_stats(self) -> dict:
+        """Returns how many requests reused an open connection to the host
+
+        Returns:
+            dict: requests, connections (opened), and reuse_ratio (share of the requests that did not
+                open a new connection); empty if the adapter does not use urllib3 connection pools
+        """
+        poolmanager = getattr(self.adapter, 'poolmanager', None)
+        if poolmanager is None:
+            return {}
+
+        pools = [poolmanager.pools[key] for key in poolmanager.pools.keys()]
+        n_requests = sum(pool.num_requests for pool in pools)
+        n_connections = sum(pool.num_connections for pool in pools)
+
+        return {
+            'requests': n_requests,
+            'connections': n_connections,
+            'reuse_ratio': 1 - n_connections / n_requests if n_requests else None,
+        }
+
+    def request(self, url: str, tries=2, params: dict=None, stream: bool=False) -> dict:
+        """Do the request, going through the caches if there are any. Threads requesting the same url and
+        parameters at the same time share one request (see coalesce)
 
         Args:
             url (str): The request url
-            tries (int, optional): the number of attemts to be done in the server
+            tries (int, optional): unused, the attempts are defined by the retry policy
+            params (dict, optional): The request parameters
+            stream (bool, optional): return a generator of the records of the response instead (see
+                iter_json_array), parsed while the body is downloaded; the cache is not used
 
         Returns:
             dict: The results of the request
@@ -287,14 +620,96 @@ class SMMAPI:
         Raises:
             exc: If a connection has failed
         """
+        if stream:
+            return self._stream(url, params)
+
+        if self.date_ranges is not None:
+            return self.date_ranges.get(url, params, self._shared)
+
+        return self._shared(url, params)
+
+    def _shared(self, url: str, params: dict=None) -> dict:
+        """Do the request, unless the same one is in flight in another thread, see request
+        """
+        if self.flights is not None:
+            return self.flights.do(ResponseCache.key(url, params), lambda: self._request(url, params))
+
+        return self._request(url, params)
+
+    def _request(self, url: str, params: dict=None) -> dict:
+        """Do the request, going through the cache if there is one, see request
+        """
+        if self.cache is None:
+            return _decode(self, url, self._send(url, params).content)
+
+        key = self.cache.key(url, params)
+        family = self.family(url)
+
+        entry, headers = self.cache.lookup(key)
+        if headers is None:
+            if self.instrumentation is not None:
+                self.instrumentation.cache(url, family, 'hit')
+            return entry.value
+
+        response = self._send(url, params, headers)
+        result, outcome = self.cache.resolve(key, family, entry, response,
+                                             lambda: _decode(self, url, response.content))
+        if self.instrumentation is not None:
+            self.instrumentation.cache(url, family, outcome)
+
+        return result
+
+    def _stream(self, url: str, params: dict=None):
+        """Yield the records of the response while it is downloaded, see iter_json_array
+        """
+        with self._send(url, params, stream=True) as response:
+            yield from iter_json_array(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+
+    def _send(self, url: str, params: dict=None, headers: dict=None, stream: bool=False) -> requests.Response:
+        """Send a GET request, retrying it as defined by the retry policy
+
+        Args:
+            url (str): The request url
+            params (dict, optional): The request parameters
+            headers (dict, optional): Additional request headers
+            stream (bool, optional): do not download the body yet
+
+        Returns:
+            Response: the successful (or 304 Not Modified) response
 
-        for attempt in range(0, self.attempts + 1):
+        Raises:
+            exc: If the request failed and cannot be retried anymore
+        """
+        family = self.family(url) if self.instrumentation is not None else None
+
+        for attempt in range(0, self.retry.attempts + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            if self.concurrency is not None:
+                self.concurrency.acquire()
+            if self.instrumentation is not None:
+                self.instrumentation.request_start(url, family, attempt)
+
+            error = response = None
+            start = time.monotonic()
             try:
-                response = self.session.get(url)
+                response = self.session.get(url=url, params=params, headers=headers,
+                                            timeout=self.retry.timeout, stream=stream)
                 response.raise_for_status()
-                return response.json()
-            except Exception as exc:
-                if attempt == self.attempts:
-                    raise exc
-                else:
-                    print(f"Connection failed (attempt {attempt + 1} of {self.attempts}) ")
+            except requests.RequestException as exc:
+                error = exc
+                response = exc.response
+            finally:
+                _attempt_end(self, url, family, attempt, response, error, start, stream)
+
+            if error is None:
+                return response
+            if stream and response is not None:
+                # the body of a failed streamed response is not read, release its connection
+                response.close()
+            if attempt == self.retry.attempts or not self.retry.is_retryable(error):
+                raise error
+
+            # sleeping only blocks the thread of this request, no lock or slot is held
+            time.sleep(_retry_delay(self, url, family, attempt, error, error.response))
+
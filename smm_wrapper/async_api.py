@@ -0,0 +1,290 @@
+"""Summary
+"""
+import time
+import asyncio
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from .cache import ResponseCache
+from .retry import RetryPolicy
+from .ratelimit import TokenBucket, AIMDConcurrency
+from .routes import Routes
+from .api import ACCEPT_ENCODING, _attempt_end, _retry_delay, _decode
+from .decoders import get_decoder
+from .instrumentation import Instrumentation
+
+
+class AsyncSMMAPI(Routes):
+
+    """asyncio version of the SMMAPI. It has the same methods, as coroutines, and builds the same urls.
+    It requires httpx (pip install smm_wrapper[async]).
+
+    Attributes:
+        base (url): Base request url
+        client (httpx.AsyncClient): Pooled HTTP client of all the requests
+        max_workers (int): Maximum number of concurrent requests used by fetch_many
+        cache (ResponseCache): Cache of the decoded responses, or None
+        retry (RetryPolicy): Retry, backoff and timeout policy of every request
+        rate_limiter (TokenBucket): Rate limiter every request passes through, or None
+        concurrency (AIMDConcurrency): Adaptive limit of the requests in flight, or None
+        decode (callable): Decodes the bytes of the JSON responses
+        instrumentation (Instrumentation): Hooks called on every request, or None
+    """
+
+    BATCH_ENDPOINTS = ('get_one', 'tweets_by', 'replies_to', 'posts_by', 'comments_by', 'wikipedia')
+
+    def __init__(self,
+                 username: str=None,
+                 password: str=None,
+                 api_key: str=None,
+                 lng: str="en",
+                 protocol: str="http",
+                 domain: str="mediamonitoring.gesis.org",
+                 unit: str="",
+                 version: str="v1",
+                 attempts: int=2,
+                 max_workers: int=8,
+                 cache: ResponseCache=None,
+                 retry: RetryPolicy=None,
+                 rate_limiter: TokenBucket=None,
+                 pool_maxsize: int=None,
+                 http2: bool=False,
+                 transport=None,
+                 json_decoder=None,
+                 concurrency: AIMDConcurrency=None,
+                 instrumentation: Instrumentation=None):
+        """Constructor of the AsyncSMMAPI
+
+        Args:
+            username (str, optional): SMM API username
+            password (str, optional): SMM API password
+            api_key (str, optional): SMM API key
+            lng (str, optional): the language that needs to be query
+            protocol (str, optional): the protocol of the url
+            domain (str, optional): the domain that hosts the api
+            unit (str, optional): politicians or organizations
+            version (str, optional): the version of the api
+            attempts (int, optional): the number of attempts before giving up trying to connect,
+                ignored if a retry policy is given
+            max_workers (int, optional): the maximum number of concurrent requests in fetch_many
+            cache (ResponseCache, optional): a cache for the responses, e.g. SQLiteCache()
+            retry (RetryPolicy, optional): the retry policy of every request (RetryPolicy(attempts) by default)
+            rate_limiter (TokenBucket, optional): a rate limiter, which can be shared with other instances
+            pool_maxsize (int, optional): the maximum number of connections kept open (max_workers by default)
+            http2 (bool, optional): negotiate HTTP/2 with the host (requires pip install httpx[http2])
+            transport (httpx.AsyncBaseTransport, optional): a custom transport for the client
+            json_decoder (str or callable, optional): 'orjson', 'simdjson', 'json' or a function decoding
+                the bytes of a body (the fastest installed one by default)
+            concurrency (AIMDConcurrency, optional): an adaptive limit of the requests in flight, which can be
+                shared with an SMMAPI
+            instrumentation (Instrumentation, optional): hooks called with the timings, sizes, retries, cache
+                outcomes and decode times of the requests, as by the SMMAPI; httpx includes the download of
+                the body in response.elapsed, so it is part of ttfb
+        """
+        if httpx is None:
+            raise ImportError('AsyncSMMAPI requires httpx: pip install smm_wrapper[async]')
+
+        self.unit = unit
+        self.max_workers = max_workers
+        self.cache = cache
+        self.retry = retry or RetryPolicy(attempts=attempts)
+        self.attempts = self.retry.attempts
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.decode = get_decoder(json_decoder)
+        self.instrumentation = instrumentation
+
+        # requests follows redirects (e.g. from all/<id> to all/<id>/), httpx only if asked to
+        self.client = httpx.AsyncClient(
+            follow_redirects=True,
+            auth=(username, password) if username and password else None,
+            params={'api_key': api_key} if api_key else None,
+            headers={'Accept-Encoding': ACCEPT_ENCODING},
+            limits=httpx.Limits(max_connections=pool_maxsize or max_workers,
+                                max_keepalive_connections=pool_maxsize or max_workers),
+            http2=http2,
+            transport=transport,
+            timeout=_timeout(self.retry.timeout))
+
+        self.base = "{}://{}/api/{}/".format(protocol, domain, self.unit)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the pooled connections of the client
+        """
+        await self.client.aclose()
+
+    async def get_all(self):
+        """Returns a list of all entities of politicians/organizations, see SMMAPI.get_all
+        """
+        url, params = self.get_all_route()
+        return await self.request(url, params=params)
+
+    async def get_one(self, _id):
+        """Returns the information of one politician/organization, see SMMAPI.get_one
+        """
+        url, params = self.get_one_route(_id)
+        return await self.request(url, params=params)
+
+    async def all_search(self, names_contain=None, _id=None):
+        """Returns politicians/organizations by text search or by id, see SMMAPI.all_search
+        """
+        url, params = self.all_search_route(names_contain, _id)
+        return await self.request(url, params=params)
+
+    async def tweets_by(self, twitter_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        """Returns query tweets made by politicians/organizations, see SMMAPI.tweets_by
+        """
+        url, params = self.entity_route(
+            'tweets_by', twitter_user_id, _id, text_contains, from_date, to_date, aggregate_by)
+        return await self.request(url, params=params)
+
+    async def replies_to(self, twitter_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        """Returns query twitter replies made by politicians/organizations, see SMMAPI.replies_to
+        """
+        url, params = self.entity_route(
+            'replies_to', twitter_user_id, _id, text_contains, from_date, to_date, aggregate_by)
+        return await self.request(url, params=params)
+
+    async def posts_by(self, facebook_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        """Returns query facebook posts made by politicians/organizations, see SMMAPI.posts_by
+        """
+        url, params = self.entity_route(
+            'posts_by', facebook_user_id, _id, text_contains, from_date, to_date, aggregate_by)
+        return await self.request(url, params=params)
+
+    async def comments_by(self, facebook_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        """Returns query facebook comments made by politicians/organizations, see SMMAPI.comments_by
+        """
+        url, params = self.entity_route(
+            'comments_by', facebook_user_id, _id, text_contains, from_date, to_date, aggregate_by)
+        return await self.request(url, params=params)
+
+    async def wikipedia(self, wikipedia_page_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        """Returns wikipedia change objects (chobs) of politicians/organizations, see SMMAPI.wikipedia
+        """
+        url, params = self.entity_route(
+            'wikipedia', wikipedia_page_id, _id, text_contains, from_date, to_date, aggregate_by)
+        return await self.request(url, params=params)
+
+    async def general_tweets(self, twitter_user_id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        """Returns query tweets made by the general population, see SMMAPI.general_tweets
+        """
+        url, params = self.general_tweets_route(
+            twitter_user_id, text_contains, from_date, to_date, aggregate_by)
+        return await self.request(url, params=params)
+
+    async def fetch_many(self, endpoint: str, ids, max_workers: int=None, **filters) -> list:
+        """Query one endpoint for many politicians/organizations concurrently, see SMMAPI.fetch_many
+
+        Returns:
+            list: the result of the endpoint for every id, in the same order as ids
+        """
+        if endpoint not in self.BATCH_ENDPOINTS:
+            raise ValueError(f"endpoint must be one of {self.BATCH_ENDPOINTS}, not '{endpoint}'")
+
+        return await _gather(getattr(self, endpoint), ids, max_workers or self.max_workers, **filters)
+
+    async def request(self, url: str, params: dict=None) -> dict:
+        """Do the request, going through the cache if there is one
+
+        Args:
+            url (str): The request url
+            params (dict, optional): The request parameters
+
+        Returns:
+            dict: The results of the request
+        """
+        if self.cache is None:
+            return _decode(self, url, (await self._send(url, params)).content)
+
+        key = self.cache.key(url, params)
+        family = self.family(url)
+
+        entry, headers = self.cache.lookup(key)
+        if headers is None:
+            if self.instrumentation is not None:
+                self.instrumentation.cache(url, family, 'hit')
+            return entry.value
+
+        response = await self._send(url, params, headers)
+        result, outcome = self.cache.resolve(key, family, entry, response,
+                                             lambda: _decode(self, url, response.content))
+        if self.instrumentation is not None:
+            self.instrumentation.cache(url, family, outcome)
+
+        return result
+
+    async def _send(self, url: str, params: dict=None, headers: dict=None):
+        """Send a GET request, retrying it as defined by the retry policy
+
+        Args:
+            url (str): The request url
+            params (dict, optional): The request parameters, None values are dropped
+            headers (dict, optional): Additional request headers
+
+        Returns:
+            httpx.Response: the successful (or 304 Not Modified) response
+        """
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        family = self.family(url) if self.instrumentation is not None else None
+
+        for attempt in range(0, self.retry.attempts + 1):
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+            if self.concurrency is not None:
+                await self.concurrency.acquire_async()
+            if self.instrumentation is not None:
+                self.instrumentation.request_start(url, family, attempt)
+
+            error = response = None
+            start = time.monotonic()
+            try:
+                response = await self.client.get(url, params=params, headers=headers)
+                if response.status_code != 304:
+                    response.raise_for_status()
+            except httpx.HTTPStatusError as exc:
+                error, response = exc, exc.response
+            except httpx.TransportError as exc:
+                error = exc
+            finally:
+                _attempt_end(self, url, family, attempt, response, error, start)
+
+            if error is None:
+                return response
+            if attempt == self.retry.attempts or not self.retry.is_retryable(error):
+                raise error
+
+            await asyncio.sleep(_retry_delay(self, url, family, attempt, error, response))
+
+
+def _timeout(timeout):
+    """Returns the httpx timeout of a RetryPolicy timeout, which is, as for requests, a (connect, read)
+    tuple, one number for both or None for no timeout
+    """
+    if isinstance(timeout, (tuple, list)):
+        return httpx.Timeout(timeout[1], connect=timeout[0])
+    return httpx.Timeout(timeout)
+
+
+async def _gather(func, ids, max_workers: int, **kwargs) -> list:
+    """Await ``func(_id=_id, **kwargs)`` for every id with at most max_workers calls in flight
+
+    Returns:
+        list: results in the same order as ``ids``
+    """
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def _bounded(_id):
+        async with semaphore:
+            return await func(_id=_id, **kwargs)
+
+    return await asyncio.gather(*[_bounded(_id) for _id in ids])
@@ -0,0 +1,113 @@
+"""Summary
+"""
+import pandas as pd
+
+from .async_api import AsyncSMMAPI, _gather
+from .views import _aggregated_frame, _wikipedia_frame
+from .instrumentation import _timed
+
+
+class AsyncDataView:
+
+    """asyncio version of the DataView. The methods are coroutines and return the same DataFrames.
+
+    Attributes:
+        api (AsyncSMMAPI): the AsyncSMMAPI
+        id_column (str): politician_id or organization_id
+    """
+
+    def __init__(self, api: AsyncSMMAPI, id_column: str):
+        """Constructor of the AsyncDataView
+
+        Args:
+            api (AsyncSMMAPI): the AsyncSMMAPI
+            id_column (str): politician_id or organization_id
+        """
+        self.api = api
+        self.id_column = id_column
+
+    async def get_all(self) -> pd.DataFrame:
+        """Get all entities and their respective facebook, twitter and wikipedia ids, see DataView.get_all
+        """
+        response = await self.api.get_all()
+
+        return pd.DataFrame(response).set_index(self.id_column)
+
+    async def get_one(self, _id) -> pd.Series:
+        """Get an entity and their respective facebook, twitter and wikipedia ids, see DataView.get_one
+        """
+        response = await self.api.get_one(_id)
+
+        return pd.Series(response)
+
+    async def tweets_by(self, twitter_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        """Returns query tweets made by politicians/organizations, see DataView.tweets_by
+        """
+        response = await self.api.tweets_by(
+            twitter_user_id, _id, text_contains, from_date, to_date, aggregate_by)
+
+        return _timed(self.api.instrumentation, 'tweets_by', _aggregated_frame, response, 'tweets',
+                      twitter_user_id=twitter_user_id, _id=_id, text_contains=text_contains,
+                      from_date=from_date, to_date=to_date)
+
+    async def replies_to(self, twitter_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        """Returns query twitter replies made by politicians/organizations, see DataView.replies_to
+        """
+        response = await self.api.replies_to(
+            twitter_user_id, _id, text_contains, from_date, to_date, aggregate_by)
+
+        return _timed(self.api.instrumentation, 'replies_to', _aggregated_frame, response, 'replies',
+                      twitter_user_id=twitter_user_id, _id=_id, text_contains=text_contains,
+                      from_date=from_date, to_date=to_date)
+
+    async def posts_by(self, facebook_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        """Returns query facebook posts made by politicians/organizations, see DataView.posts_by
+        """
+        response = await self.api.posts_by(
+            facebook_user_id, _id, text_contains, from_date, to_date, aggregate_by)
+
+        return _timed(self.api.instrumentation, 'posts_by', _aggregated_frame, response, 'posts',
+                      facebook_user_id=facebook_user_id, _id=_id, text_contains=text_contains,
+                      from_date=from_date, to_date=to_date)
+
+    async def comments_by(self, facebook_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        """Returns query facebook comments made by politicians/organizations, see DataView.comments_by
+        """
+        response = await self.api.comments_by(
+            facebook_user_id, _id, text_contains, from_date, to_date, aggregate_by)
+
+        return _timed(self.api.instrumentation, 'comments_by', _aggregated_frame, response, 'comments',
+                      facebook_user_id=facebook_user_id, _id=_id, text_contains=text_contains,
+                      from_date=from_date, to_date=to_date)
+
+    async def wikipedia(self, wikipedia_page_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month',
+                        chobs_format='wide'):
+        """Returns query wikipedia change objects (chobs) of politicians/organizations, see DataView.wikipedia
+        """
+        response = await self.api.wikipedia(
+            wikipedia_page_id, _id, text_contains, from_date, to_date, aggregate_by)
+
+        return _timed(self.api.instrumentation, 'wikipedia', _wikipedia_frame, response, aggregate_by, chobs_format,
+                      wikipedia_page_id=wikipedia_page_id, _id=_id, text_contains=text_contains,
+                      from_date=from_date, to_date=to_date)
+
+    async def general_tweets(self, twitter_user_id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        """Returns query tweets made by the general population, see DataView.general_tweets
+        """
+        response = await self.api.general_tweets(
+            twitter_user_id, text_contains, from_date, to_date, aggregate_by)
+
+        return _timed(self.api.instrumentation, 'general_tweets', _aggregated_frame, response, 'tweets',
+                      twitter_user_id=twitter_user_id, text_contains=text_contains,
+                      from_date=from_date, to_date=to_date)
+
+    async def fetch_many(self, endpoint: str, ids, max_workers: int=None, **filters) -> list:
+        """Query one endpoint for many politicians/organizations concurrently, see DataView.fetch_many
+
+        Returns:
+            list: the DataFrame (or Series for get_one) of every id, in the same order as ids
+        """
+        if endpoint not in AsyncSMMAPI.BATCH_ENDPOINTS:
+            raise ValueError(f"endpoint must be one of {AsyncSMMAPI.BATCH_ENDPOINTS}, not '{endpoint}'")
+
+        return await _gather(getattr(self, endpoint), ids, max_workers or self.api.max_workers, **filters)
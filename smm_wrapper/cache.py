@@ -0,0 +1,413 @@
+"""Summary
+"""
+import os
+import time
+import pickle
+import sqlite3
+import datetime
+import threading
+from collections import namedtuple, OrderedDict
+from urllib.parse import urlencode
+
+
+CacheEntry = namedtuple('CacheEntry', ['value', 'etag', 'last_modified', 'expires'])
+
+
+class ResponseCache:
+
+    """Base class of the response caches used by the SMMAPI. Subclasses implement load, store, touch and clear.
+
+    Attributes:
+        ttl (dict): Seconds a response stays fresh, per endpoint family ('all', 'twitter', 'facebook', 'wikipedia')
+        default_ttl (int): Seconds a response stays fresh if its family is not in ttl
+        hits (int): Number of responses served from the cache without contacting the server
+        misses (int): Number of responses that had to be downloaded
+        revalidations (int): Number of stale responses confirmed by the server (304 Not Modified)
+    """
+
+    def __init__(self, ttl: dict=None, default_ttl: int=3600):
+        """Constructor of the ResponseCache
+
+        Args:
+            ttl (dict, optional): seconds a response stays fresh, per endpoint family
+            default_ttl (int, optional): seconds a response stays fresh if its family is not in ttl
+        """
+        self.ttl = ttl or {}
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        # the counters are updated by the threads of the SMMAPI (fetch_many, coalesced requests)
+        self._counters = threading.Lock()
+
+    @staticmethod
+    def key(url: str, params: dict=None) -> str:
+        """Normalize the url and the parameters of a request into a cache key
+
+        Args:
+            url (str): the request url
+            params (dict, optional): the request parameters; None values are dropped as requests does
+
+        Returns:
+            str: the cache key
+        """
+        params = sorted((k, v) for k, v in (params or {}).items() if v is not None)
+        return '{}?{}'.format(url, urlencode(params))
+
+    def expires(self, family: str) -> float:
+        """Returns the timestamp until which a response of the family stays fresh
+        """
+        return time.time() + self.ttl.get(family, self.default_ttl)
+
+    def get(self, key: str):
+        """Returns the cache entry of the key, fresh or stale, or None
+        """
+        return self.load(key)
+
+    def set(self, key: str, value, family: str, etag: str=None, last_modified: str=None):
+        """Store a decoded response under the key
+        """
+        self.store(key, CacheEntry(value, etag, last_modified, self.expires(family)))
+
+    def refresh(self, key: str, family: str):
+        """Mark a stale entry as fresh again after the server revalidated it
+        """
+        self.touch(key, self.expires(family))
+
+    def lookup(self, key: str) -> tuple:
+        """Look up a request before sending it; the SMMAPI and the AsyncSMMAPI go through lookup and
+        resolve so that they take the same decisions
+
+        Returns:
+            tuple: the entry of the key (or None), and the headers of the request, or None if the entry is
+                fresh and the request must not be sent (a hit)
+        """
+        entry = self.get(key)
+        if entry is not None and entry.expires > time.time():
+            with self._counters:
+                self.hits += 1
+            return entry, None
+
+        headers = {}
+        if entry is not None and entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return entry, headers
+
+    def resolve(self, key: str, family: str, entry: CacheEntry, response, decode) -> tuple:
+        """Returns the result of a request sent after lookup, storing it if it was downloaded
+
+        Args:
+            key (str): the cache key of the request
+            family (str): the endpoint family of the request
+            entry (CacheEntry): the entry returned by lookup, or None
+            response: the requests or httpx response, successful or 304 Not Modified
+            decode (callable): decodes the body of the response, without arguments
+
+        Returns:
+            tuple: the result, and 'revalidated' if it is the stored one or 'miss' if it was downloaded
+        """
+        if response.status_code == 304 and entry is not None:
+            with self._counters:
+                self.revalidations += 1
+            self.refresh(key, family)
+            return entry.value, 'revalidated'
+
+        with self._counters:
+            self.misses += 1
+        result = decode()
+        if response.status_code == 200:
+            self.set(key, result, family, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return result, 'miss'
+
+    def stats(self) -> dict:
+        """Returns the hit and miss counters of the cache
+        """
+        with self._counters:
+            return {'hits': self.hits, 'misses': self.misses, 'revalidations': self.revalidations}
+
+    def load(self, key: str):
+        raise NotImplementedError
+
+    def store(self, key: str, entry: CacheEntry):
+        raise NotImplementedError
+
+    def touch(self, key: str, expires: float):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class SQLiteCache(ResponseCache):
+
+    """Persistent response cache in a SQLite database. The decoded responses are pickled, so a hit skips
+    both the network and the JSON decoding. The least recently used responses are evicted once the stored
+    responses exceed max_size bytes.
+
+    Attributes:
+        path (str): Location of the SQLite database
+        max_size (int): Maximum number of bytes of stored responses
+    """
+
+    def __init__(self, path: str='~/.cache/smm_wrapper/responses.sqlite', max_size: int=512 * 2**20,
+                 ttl: dict=None, default_ttl: int=3600):
+        """Constructor of the SQLiteCache
+
+        Args:
+            path (str, optional): location of the SQLite database
+            max_size (int, optional): maximum number of bytes of stored responses
+            ttl (dict, optional): seconds a response stays fresh, per endpoint family
+            default_ttl (int, optional): seconds a response stays fresh if its family is not in ttl
+        """
+        super().__init__(ttl, default_ttl)
+        self.path = os.path.expanduser(path)
+        self.max_size = max_size
+
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, value BLOB, etag TEXT, last_modified TEXT, '
+                'expires REAL, accessed REAL, size INTEGER)')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+
+    def load(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, etag, last_modified, expires FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            with self._conn:
+                self._conn.execute('UPDATE responses SET accessed = ? WHERE key = ?', (time.time(), key))
+
+        return CacheEntry(pickle.loads(row[0]), row[1], row[2], row[3])
+
+    def store(self, key: str, entry: CacheEntry):
+        value = pickle.dumps(entry.value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, value, entry.etag, entry.last_modified, entry.expires, time.time(), len(value)))
+            self._evict()
+
+    def touch(self, key: str, expires: float):
+        with self._lock, self._conn:
+            self._conn.execute(
+                'UPDATE responses SET expires = ?, accessed = ? WHERE key = ?', (expires, time.time(), key))
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM responses')
+
+    def _evict(self):
+        """Delete the least recently used responses until the cache fits in max_size
+        """
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_size:
+            return
+
+        for key, size in self._conn.execute('SELECT key, size FROM responses ORDER BY accessed').fetchall():
+            self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            total -= size
+            if total <= self.max_size:
+                break
+
+
+def _bucket_start(day: datetime.date, aggregate_by: str) -> datetime.date:
+    """Returns the first day of the aggregate_by bucket of day; weeks start on Monday
+    """
+    if aggregate_by == 'week':
+        return day - datetime.timedelta(days=day.weekday())
+    if aggregate_by == 'month':
+        return day.replace(day=1)
+    if aggregate_by == 'year':
+        return day.replace(month=1, day=1)
+    return day
+
+
+def _today() -> datetime.date:
+    """Returns the current day, the last one that can have activity
+    """
+    return datetime.date.today()
+
+
+class _Coverage:
+
+    """The date intervals of a query that were downloaded, and the labels and values found in them
+    """
+
+    def __init__(self, expires: float):
+        self.intervals = []
+        self.points = {}
+        self.extra = {}
+        self.expires = expires
+
+    def missing(self, start: datetime.date, end: datetime.date) -> list:
+        """Returns the intervals of [start, end] that were not downloaded
+        """
+        gaps = []
+        for first, last in self.intervals:
+            if last < start:
+                continue
+            if first > end:
+                break
+            if first > start:
+                gaps.append((start, first - datetime.timedelta(days=1)))
+            if last >= end:
+                return gaps
+            start = last + datetime.timedelta(days=1)
+
+        gaps.append((start, end))
+        return gaps
+
+    def add(self, start: datetime.date, end: datetime.date, response: dict):
+        """Store the response of the interval [start, end]
+        """
+        self.points.update(zip(response['labels'], response['values']))
+        self.extra = {k: v for k, v in response.items() if k not in ('labels', 'values')}
+
+        intervals = []
+        for first, last in sorted(self.intervals + [(start, end)]):
+            # adjacent intervals are merged too
+            if intervals and first <= intervals[-1][1] + datetime.timedelta(days=1):
+                intervals[-1] = (intervals[-1][0], max(intervals[-1][1], last))
+            else:
+                intervals.append((first, last))
+        self.intervals = intervals
+
+    def slice(self, start: datetime.date, end: datetime.date) -> dict:
+        """Returns the response of [start, end], built from the stored labels and values
+        """
+        first, last = start.isoformat(), end.isoformat()
+        labels = sorted(label for label in self.points if first <= label[:10] <= last)
+        return dict(self.extra, labels=labels, values=[self.points[label] for label in labels])
+
+
+class DateRangeCache:
+
+    """In memory cache of the aggregated series (tweets_by, replies_to, posts_by, comments_by, wikipedia and
+    general_tweets with an aggregate_by) that knows which date intervals of every query were downloaded.
+    A query whose from_date and to_date fall inside the downloaded intervals is answered by slicing them,
+    and a query that overlaps them partly only downloads the missing intervals. Queries differing only by
+    their dates share the intervals, e.g. the windows of a date range slider.
+
+    A bucket of a week, month or year is only complete if the dates do not cut it, so these aggregations are
+    only cached for dates on bucket boundaries (from_date the first day of a bucket, to_date the last one);
+    the other queries are sent to the server as they are. Dates are inclusive, as in iter_pages. The days
+    after today are never stored as downloaded: a missing or later to_date stands for today, so the
+    activity of the next days is downloaded when they come.
+
+    Attributes:
+        ttl (int): Seconds the intervals of a query are kept, None to keep them until clear
+        max_queries (int): Maximum number of queries kept, the least recently used ones are dropped
+        hits (int): Number of responses sliced from the downloaded intervals
+        partial (int): Number of responses that downloaded only the missing intervals
+        misses (int): Number of responses that were downloaded whole
+    """
+
+    def __init__(self, ttl: int=3600, max_queries: int=1024):
+        """Constructor of the DateRangeCache
+
+        Args:
+            ttl (int, optional): seconds the intervals of a query are kept, None to keep them until clear
+            max_queries (int, optional): maximum number of queries kept in memory
+        """
+        self.ttl = ttl
+        self.max_queries = max_queries
+        self.hits = 0
+        self.partial = 0
+        self.misses = 0
+        self._queries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def interval(params: dict):
+        """Returns the first and last days of the dates of a request, or None if its response cannot be
+        sliced (not aggregated, invalid dates or dates cutting a bucket); the last day is at most today
+        """
+        aggregate_by = (params or {}).get('aggregate_by')
+        if aggregate_by not in ('day', 'week', 'month', 'year'):
+            return None
+
+        today = _today()
+        try:
+            start = datetime.date.fromisoformat(str(params['from_date'])) if params.get('from_date') else datetime.date.min
+            end = datetime.date.fromisoformat(str(params['to_date'])) if params.get('to_date') else today
+        except ValueError:
+            return None
+        # the activity after today is not known yet, so it is never stored as downloaded
+        end = min(end, today)
+
+        if start > end or _bucket_start(start, aggregate_by) != start:
+            return None
+        # the bucket of today is incomplete: week, month and year queries up to today are not stored
+        following = end + datetime.timedelta(days=1)
+        if _bucket_start(following, aggregate_by) != following:
+            return None
+
+        return start, end
+
+    def get(self, url: str, params: dict, fetch) -> dict:
+        """Returns the response of a request, downloading with fetch(url, params) only the dates that are
+        not stored
+
+        Args:
+            url (str): the request url
+            params (dict): the request parameters, with aggregate_by, from_date and to_date
+            fetch (callable): does a request, given its url and parameters
+
+        Returns:
+            dict: the response, a new dict at every call
+        """
+        bounds = self.interval(params)
+        if bounds is None:
+            return fetch(url, params)
+        start, end = bounds
+
+        key = ResponseCache.key(url, {k: v for k, v in params.items() if k not in ('from_date', 'to_date')})
+        with self._lock:
+            coverage = self._queries.get(key)
+            if coverage is None or (coverage.expires is not None and coverage.expires <= time.time()):
+                coverage = self._queries[key] = _Coverage(time.time() + self.ttl if self.ttl is not None else None)
+            self._queries.move_to_end(key)
+            while len(self._queries) > self.max_queries:
+                self._queries.popitem(last=False)
+            gaps = coverage.missing(start, end)
+
+            if not gaps:
+                self.hits += 1
+            elif gaps == [(start, end)]:
+                self.misses += 1
+            else:
+                self.partial += 1
+
+        for first, last in gaps:
+            response = fetch(url, dict(params,
+                                       from_date=first.isoformat() if first != datetime.date.min else None,
+                                       to_date=last.isoformat()))
+            if not isinstance(response, dict) or 'labels' not in response:
+                # e.g. an error message, returned as the server sent it
+                return response
+            with self._lock:
+                coverage.add(first, last, response)
+
+        with self._lock:
+            return coverage.slice(start, end)
+
+    def stats(self) -> dict:
+        """Returns the hit, partial and miss counters of the cache
+        """
+        with self._lock:
+            return {'hits': self.hits, 'partial': self.partial, 'misses': self.misses}
+
+    def clear(self):
+        """Drop the stored intervals
+        """
+        with self._lock:
+            self._queries.clear()
@@ -0,0 +1,53 @@
+"""Summary
+"""
+import json
+
+
+def _stdlib(content: bytes):
+    return json.loads(content)
+
+
+def _orjson():
+    import orjson
+    return orjson.loads
+
+
+def _simdjson():
+    import simdjson
+    return simdjson.loads
+
+
+#: decoder name -> function returning the decode function, in order of preference
+DECODERS = {
+    'orjson': _orjson,
+    'simdjson': _simdjson,
+    'json': lambda: _stdlib,
+}
+
+
+def get_decoder(decoder=None):
+    """Returns a function that decodes the bytes of a JSON body
+
+    Args:
+        decoder (str or callable, optional): 'orjson', 'simdjson' or 'json', or a function that takes
+            the bytes of the body; by default the fastest installed one of DECODERS
+
+    Returns:
+        callable: the decode function
+
+    Raises:
+        ImportError: if the requested decoder is not installed
+    """
+    if callable(decoder):
+        return decoder
+
+    if decoder is not None:
+        if decoder not in DECODERS:
+            raise ValueError(f"decoder must be one of {tuple(DECODERS)}, not '{decoder}'")
+        return DECODERS[decoder]()
+
+    for load in DECODERS.values():
+        try:
+            return load()
+        except ImportError:
+            pass
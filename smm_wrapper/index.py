@@ -0,0 +1,157 @@
+"""Summary
+"""
+import pickle
+from collections import defaultdict
+
+
+#: unit -> id column of its entities
+ID_COLUMNS = {'politicians': 'politician_id', 'organizations': 'organization_id'}
+
+#: fields of the entities that can be looked up, and whether their values are compared case insensitively
+LOOKUP_FIELDS = {'fb_ids': False, 'tw_ids': False, 'wp_ids': False, 'tw_sns': True, 'wp_titles': True}
+
+#: fields searched by search(), like names_contain in SMMAPI.all_search
+NAME_FIELDS = ('name', 'firstname', 'tw_sns', 'fb_sns', 'wp_titles')
+
+
+def _trigrams(text: str) -> set:
+    """Returns the substrings of three characters of the text
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _values(value) -> list:
+    """Returns the values of a field of an entity as a list (fields are either scalars or lists)
+    """
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+class EntityIndex:
+
+    """In-memory index of the entities of get_all() of one or more units (politicians, organizations), to find
+    entities by their facebook/twitter/wikipedia ids, screen names and titles, or by name, without querying
+    the API. The index can be saved to a file and loaded by other workers instead of being rebuilt.
+
+    Attributes:
+        entities (dict): (unit, entity id) -> entity, as returned by get_all()
+    """
+
+    def __init__(self, entities_by_unit: dict):
+        """Constructor of the EntityIndex
+
+        Args:
+            entities_by_unit (dict): unit (politicians or organizations) -> list of entities of get_all()
+        """
+        self.entities = {}
+        self._lookup = {field: defaultdict(list) for field in LOOKUP_FIELDS}
+        self._names = {}
+        self._trigram_index = defaultdict(set)
+
+        for unit, entities in entities_by_unit.items():
+            id_column = ID_COLUMNS[unit]
+            for entity in entities:
+                key = (unit, entity[id_column])
+                self.entities[key] = entity
+
+                for field, lower in LOOKUP_FIELDS.items():
+                    for value in _values(entity.get(field)):
+                        self._lookup[field][self._normalize(value, lower)].append(key)
+
+                names = [str(value).lower() for field in NAME_FIELDS for value in _values(entity.get(field))]
+                self._names[key] = names
+                for name in names:
+                    for trigram in _trigrams(name):
+                        self._trigram_index[trigram].add(key)
+
+        self._lookup = {field: dict(values) for field, values in self._lookup.items()}
+        self._trigram_index = dict(self._trigram_index)
+
+    @classmethod
+    def from_api(cls, *apis):
+        """Build the index from the get_all() of SMMAPI instances, e.g. SMMPoliticians().api and
+        SMMOrganizations().api
+        """
+        return cls({api.unit: api.get_all() for api in apis})
+
+    @staticmethod
+    def _normalize(value, lower: bool) -> str:
+        value = str(value)
+        return value.lower() if lower else value
+
+    def lookup(self, field: str, value, unit: str=None) -> list:
+        """Returns the keys of the entities whose field contains value
+
+        Args:
+            field (str): one of LOOKUP_FIELDS, e.g. 'tw_ids'
+            value: the id, screen name or title
+            unit (str, optional): only entities of this unit
+
+        Returns:
+            list: (unit, entity id) tuples
+        """
+        keys = self._lookup[field].get(self._normalize(value, LOOKUP_FIELDS[field]), [])
+        return [key for key in keys if unit is None or key[0] == unit]
+
+    def by_twitter_id(self, twitter_user_id, unit: str=None) -> list:
+        """Returns the (unit, entity id) of the entities of a twitter user id
+        """
+        return self.lookup('tw_ids', twitter_user_id, unit)
+
+    def by_facebook_id(self, facebook_user_id, unit: str=None) -> list:
+        """Returns the (unit, entity id) of the entities of a facebook user id
+        """
+        return self.lookup('fb_ids', facebook_user_id, unit)
+
+    def by_wikipedia_id(self, wikipedia_page_id, unit: str=None) -> list:
+        """Returns the (unit, entity id) of the entities of a wikipedia page id
+        """
+        return self.lookup('wp_ids', wikipedia_page_id, unit)
+
+    def by_twitter_screen_name(self, screen_name: str, unit: str=None) -> list:
+        """Returns the (unit, entity id) of the entities of a twitter screen name (case insensitive)
+        """
+        return self.lookup('tw_sns', screen_name, unit)
+
+    def by_wikipedia_title(self, title: str, unit: str=None) -> list:
+        """Returns the (unit, entity id) of the entities of a wikipedia title (case insensitive)
+        """
+        return self.lookup('wp_titles', title, unit)
+
+    def search(self, names_contain: str, unit: str=None) -> list:
+        """Returns the entities whose names, screen names or wikipedia titles contain the text, like
+        SMMAPI.all_search(names_contain=...) but without a request
+
+        Args:
+            names_contain (str): the text to search (case insensitive)
+            unit (str, optional): only entities of this unit
+
+        Returns:
+            list: the matching entities, as returned by get_all()
+        """
+        text = names_contain.lower()
+
+        if len(text) < 3:
+            candidates = self._names.keys()
+        else:
+            sets = sorted((self._trigram_index.get(trigram, set()) for trigram in _trigrams(text)), key=len)
+            candidates = set.intersection(*sets) if sets else set()
+
+        keys = [key for key in candidates
+                if (unit is None or key[0] == unit) and any(text in name for name in self._names[key])]
+
+        return [self.entities[key] for key in sorted(keys)]
+
+    def save(self, path: str):
+        """Save the index to a file, see load
+        """
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str):
+        """Load an index saved with save
+        """
+        with open(path, 'rb') as f:
+            return pickle.load(f)
@@ -0,0 +1,193 @@
+"""Summary
+"""
+import time
+import threading
+from collections import namedtuple
+
+
+#: timings and sizes of one attempt of a request. requests does not expose the DNS and connect times,
+#: they are part of ttfb (the time until the headers were parsed, response.elapsed); download is the
+#: time spent reading the body after that
+RequestMetrics = namedtuple('RequestMetrics', ['url', 'family', 'attempt', 'status', 'error', 'elapsed',
+                                               'ttfb', 'download', 'bytes', 'wire_bytes'])
+
+
+class Instrumentation:
+
+    """Hooks called by the SMMAPI and the DataView on their hot paths. This base class does nothing;
+    subclasses override the hooks they need and are given to the SMMAPI, e.g.
+    SMMPoliticians(instrumentation=Recorder()). Without instrumentation (the default) the hooks are not
+    called at all.
+
+    The hooks are called from the threads doing the requests (e.g. the workers of fetch_many), so
+    implementations must be thread safe.
+    """
+
+    def request_start(self, url: str, family: str, attempt: int):
+        """Called before every attempt of a request
+
+        Args:
+            url (str): the request url
+            family (str): the endpoint family (all, twitter, facebook or wikipedia)
+            attempt (int): the attempt, from 0
+        """
+
+    def request_end(self, metrics: RequestMetrics):
+        """Called after every attempt of a request, successful or not
+        """
+
+    def retry(self, url: str, family: str, attempt: int, error: Exception, delay: float):
+        """Called when a failed attempt is retried after delay seconds
+        """
+
+    def cache(self, url: str, family: str, outcome: str):
+        """Called when a request goes through the cache of the SMMAPI
+
+        Args:
+            outcome (str): 'hit' (served from the cache), 'revalidated' (304 Not Modified) or 'miss'
+        """
+
+    def decode(self, url: str, family: str, seconds: float, size: int):
+        """Called after the body of a response (size bytes) was decoded in seconds
+        """
+
+    def frame(self, method: str, seconds: float, rows: int):
+        """Called after a DataView method built its DataFrame (rows rows) in seconds
+        """
+
+
+class Recorder(Instrumentation):
+
+    """Instrumentation that keeps the events in memory, to find out where the time of a few calls goes
+
+    Attributes:
+        events (list): (hook name, dict of the arguments of the hook) in the order they were called
+    """
+
+    def __init__(self):
+        """Constructor of the Recorder
+        """
+        self.events = []
+        self._lock = threading.Lock()
+
+    def _record(self, name: str, **fields):
+        with self._lock:
+            self.events.append((name, fields))
+
+    def request_start(self, url, family, attempt):
+        self._record('request_start', url=url, family=family, attempt=attempt)
+
+    def request_end(self, metrics):
+        self._record('request_end', **metrics._asdict())
+
+    def retry(self, url, family, attempt, error, delay):
+        self._record('retry', url=url, family=family, attempt=attempt, error=error, delay=delay)
+
+    def cache(self, url, family, outcome):
+        self._record('cache', url=url, family=family, outcome=outcome)
+
+    def decode(self, url, family, seconds, size):
+        self._record('decode', url=url, family=family, seconds=seconds, size=size)
+
+    def frame(self, method, seconds, rows):
+        self._record('frame', method=method, seconds=seconds, rows=rows)
+
+    def summary(self) -> dict:
+        """Returns the total seconds spent in the network (ttfb and download), decoding and building frames
+
+        Returns:
+            dict: ttfb, download, decode and frame seconds, and the number of requests, retries and bytes
+        """
+        summary = dict.fromkeys(['ttfb', 'download', 'decode', 'frame'], 0.0)
+        summary.update(requests=0, retries=0, bytes=0)
+        with self._lock:
+            events = list(self.events)
+
+        for name, fields in events:
+            if name == 'request_end':
+                summary['requests'] += 1
+                summary['ttfb'] += fields['ttfb'] or 0.0
+                summary['download'] += fields['download'] or 0.0
+                summary['bytes'] += fields['bytes'] or 0
+            elif name == 'retry':
+                summary['retries'] += 1
+            elif name in ('decode', 'frame'):
+                summary[name] += fields['seconds']
+
+        return summary
+
+
+class PrometheusInstrumentation(Instrumentation):
+
+    """Exports the hooks as Prometheus metrics (smm_request_seconds, smm_request_bytes_total,
+    smm_retries_total, smm_cache_total, smm_decode_seconds and smm_frame_seconds). The metrics are
+    registered in the default registry of prometheus_client unless another one is given, and can be
+    served with prometheus_client.start_http_server. It requires prometheus_client
+    (pip install smm_wrapper[prometheus]).
+    """
+
+    def __init__(self, registry=None, namespace: str='smm'):
+        """Constructor of the PrometheusInstrumentation
+
+        Args:
+            registry (CollectorRegistry, optional): the registry of the metrics (the default one by default)
+            namespace (str, optional): the prefix of the metric names
+        """
+        # imported here so that importing smm_wrapper does not import prometheus_client
+        try:
+            import prometheus_client
+        except ImportError:
+            raise ImportError('PrometheusInstrumentation requires prometheus_client: '
+                              'pip install smm_wrapper[prometheus]') from None
+
+        registry = registry if registry is not None else prometheus_client.REGISTRY
+        options = {'namespace': namespace, 'registry': registry}
+
+        self.request_seconds = prometheus_client.Histogram(
+            'request_seconds', 'Duration of the attempts of the requests', ['family', 'status', 'phase'], **options)
+        self.request_bytes = prometheus_client.Counter(
+            'request_bytes', 'Bytes of the response bodies', ['family', 'encoding'], **options)
+        self.retries = prometheus_client.Counter(
+            'retries', 'Retried attempts', ['family'], **options)
+        self.cache_outcomes = prometheus_client.Counter(
+            'cache', 'Requests that went through the cache', ['family', 'outcome'], **options)
+        self.decode_seconds = prometheus_client.Histogram(
+            'decode_seconds', 'Duration of the JSON decoding of the responses', ['family'], **options)
+        self.frame_seconds = prometheus_client.Histogram(
+            'frame_seconds', 'Duration of the DataFrame construction of the DataView', ['method'], **options)
+
+    def request_end(self, metrics):
+        status = str(metrics.status) if metrics.status is not None else 'error'
+        self.request_seconds.labels(metrics.family, status, 'total').observe(metrics.elapsed)
+        if metrics.ttfb is not None:
+            self.request_seconds.labels(metrics.family, status, 'ttfb').observe(metrics.ttfb)
+        if metrics.download is not None:
+            self.request_seconds.labels(metrics.family, status, 'download').observe(metrics.download)
+        if metrics.bytes:
+            self.request_bytes.labels(metrics.family, 'identity').inc(metrics.bytes)
+        if metrics.wire_bytes:
+            self.request_bytes.labels(metrics.family, 'wire').inc(metrics.wire_bytes)
+
+    def retry(self, url, family, attempt, error, delay):
+        self.retries.labels(family).inc()
+
+    def cache(self, url, family, outcome):
+        self.cache_outcomes.labels(family, outcome).inc()
+
+    def decode(self, url, family, seconds, size):
+        self.decode_seconds.labels(family).observe(seconds)
+
+    def frame(self, method, seconds, rows):
+        self.frame_seconds.labels(method).observe(seconds)
+
+
+def _timed(instrumentation: Instrumentation, method: str, build, *args, **kwargs):
+    """Build a DataFrame with build(*args, **kwargs), reporting its duration to the frame hook
+    """
+    if instrumentation is None:
+        return build(*args, **kwargs)
+
+    start = time.perf_counter()
+    df = build(*args, **kwargs)
+    instrumentation.frame(method, time.perf_counter() - start, len(df))
+    return df
@@ -0,0 +1,204 @@
+"""Summary
+"""
+import copy
+import time
+import inspect
+import functools
+import threading
+from collections import namedtuple, OrderedDict
+
+
+MemoEntry = namedtuple('MemoEntry', ['value', 'size', 'expires', 'mutable'])
+
+#: cells that cannot be modified in place, the other cells of object columns are copied on every read
+_IMMUTABLE = (str, bytes, int, float, complex, bool, type(None))
+_SCALARS = frozenset(_IMMUTABLE)
+
+
+def _normalize(value):
+    """Returns a hashable form of an argument, in which equal collections are equal whatever their type
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted((_normalize(v) for v in value), key=repr))
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize(v)) for k, v in value.items()))
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def _copy_on_write() -> bool:
+    """Returns whether pandas copies the data of a shallow copy when either of them is modified
+    """
+    import pandas as pd
+
+    return int(pd.__version__.split('.')[0]) >= 3 or pd.options.mode.copy_on_write is True
+
+
+def _mutable(value) -> tuple:
+    """Returns the positions of the columns of a DataFrame (or (0,) for a Series) holding mutable python
+    objects, e.g. the lists of ids of get_all
+    """
+    columns = [value] if value.ndim == 1 else [value.iloc[:, i] for i in range(value.shape[1])]
+    return tuple(i for i, column in enumerate(columns)
+                 if column.dtype == object and any(not isinstance(cell, _IMMUTABLE) for cell in column))
+
+
+def _detach(cell):
+    """Returns a copy of a cell that shares no mutable object with it (faster than copy.deepcopy for the
+    lists and dicts of the responses)
+    """
+    if type(cell) is list:
+        return [item if type(item) in _SCALARS else _detach(item) for item in cell]
+    if type(cell) is dict:
+        return {key: item if type(item) in _SCALARS else _detach(item) for key, item in cell.items()}
+    if isinstance(cell, _IMMUTABLE):
+        return cell
+    return copy.deepcopy(cell)
+
+
+def _nbytes(value) -> int:
+    """Returns the memory used by a DataFrame or Series, including the python objects it holds
+    """
+    usage = value.memory_usage(deep=True)
+    return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+
+
+class FrameMemo:
+
+    """In memory memoization of the DataFrames and Series returned by the DataView methods, keyed on the
+    unit, the method and its arguments, e.g. DataView(api, id_column, memo=FrameMemo()) or
+    SMMPoliticians(memo=FrameMemo()). It is bounded by the memory of the frames (the least recently used
+    ones are dropped) and by their age.
+
+    Every call returns a copy of the stored frame, so the callers can modify what they get without
+    changing what the next callers get. With copy on write (pandas 3, or pd.options.mode.copy_on_write
+    = True) the copy is shallow and the data is only copied if it is modified; otherwise it is a deep
+    copy. The columns holding mutable python objects (e.g. the lists of ids of get_all) are deep copied,
+    since modifying such an object in place does not go through pandas.
+
+    Attributes:
+        max_bytes (int): Maximum memory of the stored frames, in bytes
+        ttl (int): Seconds a frame is kept, None to keep it until it is dropped or clear is called
+        hits (int): Number of calls answered with a stored frame
+        misses (int): Number of calls that ran the method
+        evictions (int): Number of frames dropped to fit in max_bytes
+    """
+
+    def __init__(self, max_bytes: int=256 * 2**20, ttl: int=600):
+        """Constructor of the FrameMemo
+
+        Args:
+            max_bytes (int, optional): maximum memory of the stored frames, in bytes (256 MiB by default)
+            ttl (int, optional): seconds a frame is kept, None to keep it until it is dropped
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._deep = None
+
+    def call(self, key, func):
+        """Returns a copy of the frame stored under the key, or of the result of func, which is stored
+
+        Args:
+            key: hashable key of the call, e.g. the unit, the method and its arguments
+            func (callable): computes the frame, without arguments
+
+        Returns:
+            DataFrame or Series: a copy of the frame; other results of func are returned as they are and
+                not stored
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry.expires is None or entry.expires > time.time()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._copy(entry)
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+
+        value = func()
+        if not hasattr(value, 'memory_usage'):
+            return value
+
+        entry = MemoEntry(value, _nbytes(value), time.time() + self.ttl if self.ttl is not None else None,
+                          _mutable(value))
+        if entry.size <= self.max_bytes:
+            with self._lock:
+                if key in self._entries:
+                    self._drop(key)
+                self._entries[key] = entry
+                self._size += entry.size
+                while self._size > self.max_bytes:
+                    self._drop(next(iter(self._entries)))
+                    self.evictions += 1
+
+        return self._copy(entry)
+
+    def stats(self) -> dict:
+        """Returns the counters of the memo, and the number and memory of the stored frames
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'frames': len(self._entries), 'bytes': self._size}
+
+    def clear(self):
+        """Drop the stored frames
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _drop(self, key):
+        self._size -= self._entries.pop(key).size
+
+    def _copy(self, entry: MemoEntry):
+        if self._deep is None:
+            self._deep = not _copy_on_write()
+
+        value = entry.value.copy(deep=self._deep)
+        if value.ndim == 1:
+            if not entry.mutable:
+                return value
+            copied = value.__class__(list(map(_detach, value.tolist())), index=value.index, name=value.name, dtype=object)
+            copied.attrs = value.attrs
+            return copied
+
+        if entry.mutable:
+            import numpy as np
+
+            cells = value.iloc[:, list(entry.mutable)].to_numpy(dtype=object)
+            detached = np.fromiter(map(_detach, cells.ravel().tolist()), dtype=object, count=cells.size)
+            value.iloc[:, list(entry.mutable)] = detached.reshape(cells.shape)
+        return value
+
+
+def _memoized(method):
+    """Decorator of the DataView methods returning frames: the calls go through the memo of the DataView,
+    if it has one
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.memo is None:
+            return method(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = tuple((name, _normalize(value)) for name, value in bound.arguments.items() if name != 'self')
+        key = (self.api.base, method.__name__, arguments)
+
+        return self.memo.call(key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
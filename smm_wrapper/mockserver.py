@@ -0,0 +1,366 @@
+"""Summary
+"""
+import os
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import functools
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl
+
+from .cache import ResponseCache
+from .index import ID_COLUMNS
+
+
+#: directory of the fixtures shipped with the package
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+#: request headers forwarded to the API in record mode
+FORWARDED_HEADERS = ('Authorization',)
+
+#: path of the endpoints after /api/<unit>/ -> kind of response
+ROUTES = [
+    (re.compile(r'^all/$'), 'all'),
+    (re.compile(r'^all/search/$'), 'search'),
+    (re.compile(r'^all/(?P<id>[^/]+)/?$'), 'one'),
+    (re.compile(r'^(twitter/(tweets_by|replies_to)|facebook/(posts_by|comments_by))/'), 'aggregated'),
+    (re.compile(r'^twitter/general_population/'), 'aggregated'),
+    (re.compile(r'^wikipedia/chobs/'), 'wikipedia'),
+]
+
+_API_PATH = re.compile(r'^/api/(?P<unit>[^/]+)/(?P<route>.*)$')
+
+
+@functools.lru_cache(maxsize=None)
+def _load(name: str):
+    """Returns the content of a fixture shipped with the package, which must not be modified
+    """
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return json.load(f)
+
+
+class MockServer:
+
+    """Local stand-in for the SMM API, to benchmark and load test the SMMAPI and the DataView without
+    contacting mediamonitoring.gesis.org. It answers every route of the SMMAPI (all/, all/search/,
+    all/<id>/, tweets_by, replies_to, posts_by, comments_by, wikipedia/chobs and general_population) for
+    politicians and organizations, from responses recorded with record, or else from the fixtures
+    shipped with the package. The shipped fixtures are synthetic entities, series from 2017 to 2019 for
+    every aggregate_by, and raw chobs; the series are filtered by from_date and to_date.
+
+    Latency and errors can be injected, and the payloads scaled, e.g.:
+
+        from smm_wrapper.mockserver import MockServer
+
+        with MockServer(latency=0.05, error_rate=0.01) as server:
+            smm = SMMPoliticians(domain=server.domain)
+
+    or from the command line: python -m smm_wrapper.mockserver --port 8000 --latency 0.05
+
+    Attributes:
+        host (str): Host the server listens on
+        port (int): Port the server listens on (a free one is picked if it is 0)
+        fixtures (str): Directory of the recorded responses, or None
+        latency (float or tuple): Seconds added to every response, or (min, max) for a random latency
+        error_rate (float): Probability that a request is answered with error_status
+        error_status (int): Status of the injected errors
+        scale (int): Number of times the records of every response are repeated
+        record (str): Url of the API whose responses are recorded into fixtures, or None
+        append_slash (bool): Redirect the urls without a trailing slash, as Django's APPEND_SLASH
+        requests (int): Number of requests received
+        errors (int): Number of injected errors
+    """
+
+    def __init__(self, host: str='127.0.0.1', port: int=0, fixtures: str=None, latency=0.0,
+                 error_rate: float=0.0, error_status: int=503, scale: int=1, record: str=None, seed: int=None,
+                 append_slash: bool=False):
+        """Constructor of the MockServer
+
+        Args:
+            host (str, optional): host to listen on
+            port (int, optional): port to listen on, a free one by default
+            fixtures (str, optional): directory of the recorded responses, which are served instead of the
+                shipped fixtures; required to record
+            latency (float or tuple, optional): seconds added to every response, or (min, max)
+            error_rate (float, optional): probability that a request is answered with error_status
+            error_status (int, optional): status of the injected errors (503 by default)
+            scale (int, optional): repeat the records (entities, labels and values, chobs) of every response
+                this many times, to test larger payloads
+            record (str, optional): url of the API, e.g. 'http://mediamonitoring.gesis.org'; the requests
+                are forwarded to it and its responses saved into fixtures
+            seed (int, optional): seed of the random latency and errors
+            append_slash (bool, optional): answer the urls without a trailing slash (e.g. all/<id>) with a
+                301 redirect to the url with one, as the SMM API does, instead of serving both
+        """
+        if record is not None and fixtures is None:
+            raise ValueError('a fixtures directory is required to record')
+
+        self.host = host
+        self.port = port
+        self.fixtures = os.path.expanduser(fixtures) if fixtures is not None else None
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.scale = scale
+        self.record = record.rstrip('/') if record is not None else None
+        self.append_slash = append_slash
+        self.requests = 0
+        self.errors = 0
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._session = None
+
+    @property
+    def domain(self) -> str:
+        """The domain to give to the SMMAPI, e.g. SMMPoliticians(domain=server.domain)
+        """
+        return '{}:{}'.format(self.host, self.port)
+
+    def start(self):
+        """Start serving in a background thread
+        """
+        self._server = ThreadingHTTPServer((self.host, self.port), type('Handler', (_Handler,), {'mock': self}))
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        # a short poll interval, so that stop does not wait half a second
+        threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stop serving
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def respond(self, path: str, params: dict, headers: dict=None) -> tuple:
+        """Returns the status and the body of a request
+
+        Args:
+            path (str): the path of the request, e.g. /api/politicians/all/
+            params (dict): the query parameters, including the api_key if any
+            headers (dict, optional): the request headers forwarded to the API in record mode (FORWARDED_HEADERS)
+
+        Returns:
+            tuple: the status and the decoded JSON body
+        """
+        with self._lock:
+            self.requests += 1
+            error = self.error_rate and self._random.random() < self.error_rate
+            if error:
+                self.errors += 1
+            latency = (self._random.uniform(*self.latency) if isinstance(self.latency, (tuple, list))
+                       else self.latency)
+
+        if latency:
+            time.sleep(latency)
+        if error:
+            return self.error_status, {'detail': 'Injected error.'}
+
+        if self.record is not None:
+            status, body = self._forward(path, params, headers or {})
+        else:
+            status, body = self._recorded(path, params) or self._fixture(path, params)
+
+        if status == 200 and self.scale > 1:
+            body = _scale(body, self.scale)
+
+        return status, body
+
+    def _file(self, path: str, params: dict) -> str:
+        """Returns the file of the recorded response of a request, which does not depend on the api_key
+        """
+        key = ResponseCache.key(path, {k: v for k, v in params.items() if k != 'api_key'})
+        return os.path.join(self.fixtures, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+    def _recorded(self, path: str, params: dict):
+        """Returns the status and body of the recorded response of a request, or None
+        """
+        if self.fixtures is None:
+            return None
+
+        file = self._file(path, params)
+        if not os.path.exists(file):
+            return None
+
+        with open(file, encoding='utf-8') as f:
+            recorded = json.load(f)
+        if 'body' not in recorded:
+            return recorded['status'], {'detail': recorded['text']}
+        return recorded['status'], recorded['body']
+
+    def _forward(self, path: str, params: dict, headers: dict) -> tuple:
+        """Forward a request, with its api_key and credentials, to the API and record its response; the
+        recorded file has neither
+        """
+        import requests
+
+        if self._session is None:
+            self._session = requests.Session()
+        response = self._session.get(self.record + path, params=params, headers=headers)
+
+        public = {k: v for k, v in params.items() if k != 'api_key'}
+        recorded = {'path': path, 'params': public, 'status': response.status_code}
+        try:
+            recorded['body'] = body = response.json()
+        except ValueError:
+            # e.g. the HTML error page of a proxy, answered as a JSON error
+            recorded['text'] = response.text
+            body = {'detail': response.text}
+
+        os.makedirs(self.fixtures, exist_ok=True)
+        with open(self._file(path, params), 'w', encoding='utf-8') as f:
+            json.dump(recorded, f, ensure_ascii=False)
+
+        return response.status_code, body
+
+    def _fixture(self, path: str, params: dict) -> tuple:
+        """Returns the status and body of a request answered from the shipped fixtures
+        """
+        match = _API_PATH.match(path)
+        if match is None or match.group('unit') not in ID_COLUMNS:
+            return 404, {'detail': 'Not found.'}
+        unit, route = match.group('unit'), match.group('route')
+
+        for pattern, kind in ROUTES:
+            route_match = pattern.match(route)
+            if route_match is not None:
+                break
+        else:
+            return 404, {'detail': 'Not found.'}
+
+        if kind in ('all', 'search', 'one'):
+            entities = _load(f'{unit}_all.json')
+            if kind == 'all':
+                return 200, entities
+            if kind == 'search':
+                text = params.get('names_contain', '').lower()
+                return 200, [entity for entity in entities
+                             if text in ' '.join(str(entity.get(field)) for field in ('name', 'firstname', 'tw_sns',
+                                                                                        'fb_sns', 'wp_titles')).lower()]
+            for entity in entities:
+                if str(entity[ID_COLUMNS[unit]]) == route_match.group('id'):
+                    return 200, entity
+            return 404, {'detail': 'Not found.'}
+
+        aggregate_by = params.get('aggregate_by')
+        if kind == 'wikipedia' and not aggregate_by:
+            return 200, _load('chobs.json')
+        if aggregate_by not in (None, 'day', 'week', 'month', 'year'):
+            return 400, {'aggregate_by': [f'"{aggregate_by}" is not a valid choice.']}
+
+        response = _load(f"aggregated_{aggregate_by or 'month'}.json")
+        from_date, to_date = params.get('from_date') or '', params.get('to_date') or '9999'
+        # ISO dates compare as strings
+        pairs = [(label, value) for label, value in zip(response['labels'], response['values'])
+                 if from_date <= label <= to_date]
+
+        return 200, dict(response, labels=[label for label, _ in pairs], values=[value for _, value in pairs])
+
+
+def _scale(body, scale: int):
+    """Repeat the records of a response scale times; repeated entities get new ids
+    """
+    if isinstance(body, list):
+        id_column = next((column for column in ID_COLUMNS.values() if body and column in body[0]), None)
+        if id_column is None:
+            return body * scale
+        offset = max(entity[id_column] for entity in body)
+        return [dict(entity, **{id_column: entity[id_column] + k * offset}) for k in range(scale) for entity in body]
+
+    if isinstance(body, dict) and 'chobs' in body:
+        return dict(body, chobs=body['chobs'] * scale)
+    if isinstance(body, dict) and 'labels' in body:
+        return dict(body, labels=body['labels'] * scale, values=body['values'] * scale)
+
+    return body
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    """Answers the requests of the MockServer (mock), with keep-alive connections and ETags
+    """
+
+    protocol_version = 'HTTP/1.1'
+    # the headers and the body are written separately, Nagle's algorithm would delay the body
+    disable_nagle_algorithm = True
+    mock = None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if self.mock.append_slash and not url.path.endswith('/'):
+            with self.mock._lock:
+                self.mock.requests += 1
+            self.send_response(301)
+            self.send_header('Location', url.path + '/' + ('?' + url.query if url.query else ''))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        headers = {name: self.headers[name] for name in FORWARDED_HEADERS if name in self.headers}
+        status, body = self.mock.respond(url.path, dict(parse_qsl(url.query)), headers)
+
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        etag = '"{}"'.format(hashlib.sha1(data).hexdigest())
+
+        if status == 200 and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        if status == 200:
+            self.send_header('ETag', etag)
+        elif status in (429, 503):
+            self.send_header('Retry-After', '1')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for the SMM API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--fixtures', help='directory of the recorded responses')
+    parser.add_argument('--latency', type=float, nargs='+', default=[0.0],
+                        help='seconds added to every response, or min and max')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--scale', type=int, default=1)
+    parser.add_argument('--record', help='url of the API to record into --fixtures')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--append-slash', action='store_true', help='redirect the urls without a trailing slash')
+    args = parser.parse_args()
+
+    latency = args.latency[0] if len(args.latency) == 1 else tuple(args.latency[:2])
+    server = MockServer(args.host, args.port, args.fixtures, latency, args.error_rate, args.error_status,
+                        args.scale, args.record, args.seed, args.append_slash).start()
+    print(f'serving the SMM API on http://{server.domain}/api/ (Ctrl+C to stop)')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
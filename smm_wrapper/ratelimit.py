@@ -0,0 +1,141 @@
+"""Summary
+"""
+import time
+import threading
+
+
+class TokenBucket:
+
+    """Client side rate limiter. Every request of the SMMAPI takes a token; tokens are refilled at rate
+    per second up to burst. The same TokenBucket can be passed to several SMMAPI instances (e.g. to
+    SMMPoliticians and SMMOrganizations) so that together they stay under the limit of the host.
+
+    Attributes:
+        rate (float): Tokens added per second, i.e. the sustained requests per second
+        burst (int): Maximum number of tokens, i.e. the requests that can be done at once after a pause
+    """
+
+    def __init__(self, rate: float=10.0, burst: int=10):
+        """Constructor of the TokenBucket
+
+        Args:
+            rate (float, optional): the sustained number of requests per second
+            burst (int, optional): the maximum number of requests that can be done at once
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, waiting until one is available
+        """
+        while True:
+            wait = self._take()
+            if wait == 0:
+                return
+
+            # wait outside of the lock so that other threads can refill and take tokens
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Take a token, waiting without blocking the event loop until one is available
+        """
+        # imported here, asyncio is only needed by the AsyncSMMAPI
+        import asyncio
+
+        while True:
+            wait = self._take()
+            if wait == 0:
+                return
+
+            await asyncio.sleep(wait)
+
+    def _take(self) -> float:
+        """Take a token if there is one and return 0, otherwise return the seconds until the next token
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+
+class AIMDConcurrency:
+
+    """Adaptive limit of the number of requests in flight (additive increase, multiplicative decrease).
+    The limit grows by one request per window of successful requests answered within latency_target, and
+    is multiplied by decrease when a request times out or the server answers with a retryable error.
+
+    Attributes:
+        limit (float): Current number of requests allowed in flight
+        min_limit (int): Lower bound of the limit
+        max_limit (int): Upper bound of the limit
+        latency_target (float): Latency in seconds under which the server is considered healthy
+        decrease (float): Factor applied to the limit on errors
+    """
+
+    def __init__(self, initial: int=4, min_limit: int=1, max_limit: int=32,
+                 latency_target: float=1.0, decrease: float=0.5):
+        """Constructor of the AIMDConcurrency
+
+        Args:
+            initial (int, optional): the initial number of requests allowed in flight
+            min_limit (int, optional): the lower bound of the limit
+            max_limit (int, optional): the upper bound of the limit
+            latency_target (float, optional): the latency in seconds under which the limit is increased
+            decrease (float, optional): the factor applied to the limit on errors
+        """
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.decrease = decrease
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Wait until a request can be sent under the current limit
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a request can be sent under the current limit
+        """
+        # imported here, asyncio is only needed by the AsyncSMMAPI
+        import asyncio
+
+        # the requests in flight are released by other tasks (or threads), poll until one was
+        while not self._try_acquire():
+            await asyncio.sleep(0.005)
+
+    def _try_acquire(self) -> bool:
+        """Count a request in flight and return True if the limit allows it, otherwise return False
+        """
+        with self._condition:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return True
+            return False
+
+    def release(self, latency: float, overloaded: bool=False):
+        """Record the outcome of a request and adapt the limit
+
+        Args:
+            latency (float): seconds the request took
+            overloaded (bool, optional): the request timed out or was answered with a retryable error
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if overloaded:
+                self.limit = max(self.min_limit, self.limit * self.decrease)
+            elif latency <= self.latency_target:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._condition.notify_all()
@@ -0,0 +1,191 @@
+"""Summary
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .views import DataView, PANEL_METRICS, _aggregated_frame
+
+
+#: aggregate_by of the API, from the finest to the coarsest
+AGGREGATIONS = ('day', 'week', 'month', 'year')
+
+
+def _derivable(finest: str, aggregate_by: str) -> bool:
+    """Returns whether the buckets of aggregate_by are unions of buckets of finest (weeks are not
+    unions of months, nor months of weeks)
+    """
+    return aggregate_by == finest or finest == 'day' or (finest == 'month' and aggregate_by == 'year')
+
+
+def _floor(days: np.ndarray, aggregate_by: str) -> np.ndarray:
+    """Returns the first day of the bucket of every day (datetime64[D]); weeks start on Monday
+    """
+    if aggregate_by == 'week':
+        # 1970-01-01, day 0, was a Thursday
+        return days - ((days.astype(np.int64) + 3) % 7).astype('timedelta64[D]')
+    if aggregate_by == 'day':
+        return days
+    return days.astype({'month': 'datetime64[M]', 'year': 'datetime64[Y]'}[aggregate_by]).astype('datetime64[D]')
+
+
+class _Series:
+
+    """The finest series of a query: its days in order, their values and the other keys of the response,
+    and the responses and frames of the aggregations computed from it
+    """
+
+    def __init__(self, response: dict):
+        days = np.asarray(response['labels'], dtype='datetime64[D]')
+        order = np.argsort(days, kind='stable')
+        self.days = days[order]
+        self.values = np.asarray(response['values'])[order]
+        self.extra = {k: v for k, v in response.items() if k not in ('labels', 'values', 'aggregated_by')}
+        self.responses = {}
+        self.frames = {}
+
+    def response(self, aggregate_by: str) -> dict:
+        """Returns the response of the series aggregated by aggregate_by, computed once
+        """
+        if aggregate_by not in self.responses:
+            buckets = _floor(self.days, aggregate_by)
+            starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]]) if len(buckets) else buckets[:0]
+            self.responses[aggregate_by] = dict(
+                self.extra, aggregated_by=aggregate_by,
+                labels=np.datetime_as_string(buckets[starts], unit='D').tolist(),
+                values=np.add.reduceat(self.values, starts).tolist() if len(starts) else [])
+
+        return self.responses[aggregate_by]
+
+    def frame(self, aggregate_by: str, value_column: str, query: dict) -> pd.DataFrame:
+        """Returns the frame of the series aggregated by aggregate_by, built once; it must not be modified
+        """
+        if aggregate_by not in self.frames:
+            self.frames[aggregate_by] = _aggregated_frame(self.response(aggregate_by), value_column, **query)
+
+        return self.frames[aggregate_by]
+
+
+class Reaggregator:
+
+    """Serves every aggregate_by of the aggregated series of a DataView from one request. The series of a
+    query is fetched once at the finest aggregation (by day) and kept in memory; the coarser aggregations
+    (week, starting on Monday, month and year) are computed locally from it, so switching between them
+    does not contact the server. The frames are the same as the ones of the DataView methods.
+
+    Attributes:
+        dv (DataView): the DataView used to download the series
+        finest (str): the aggregate_by of the downloaded series
+        max_series (int): Maximum number of series kept, the least recently used ones are dropped
+    """
+
+    #: DataView methods that return aggregated series
+    ENDPOINTS = ('tweets_by', 'replies_to', 'posts_by', 'comments_by', 'wikipedia', 'general_tweets')
+
+    def __init__(self, dv: DataView, finest: str='day', max_series: int=1024):
+        """Constructor of the Reaggregator
+
+        Args:
+            dv (DataView): the DataView used to download the series
+            finest (str, optional): the aggregate_by of the downloaded series, 'day' by default; the coarser
+                aggregations whose buckets contain whole buckets of finest are computed from it, the other
+                ones are requested from the server
+            max_series (int, optional): maximum number of series kept in memory
+        """
+        if finest not in AGGREGATIONS:
+            raise ValueError(f"finest must be one of {AGGREGATIONS}, not '{finest}'")
+
+        self.dv = dv
+        self.finest = finest
+        self.max_series = max_series
+        self._series = OrderedDict()
+        self._lock = threading.Lock()
+
+    def tweets_by(self, twitter_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        """Returns the tweets series, see DataView.tweets_by
+        """
+        return self.get('tweets_by', aggregate_by, twitter_user_id=twitter_user_id, _id=_id,
+                        text_contains=text_contains, from_date=from_date, to_date=to_date)
+
+    def replies_to(self, twitter_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        """Returns the replies series, see DataView.replies_to
+        """
+        return self.get('replies_to', aggregate_by, twitter_user_id=twitter_user_id, _id=_id,
+                        text_contains=text_contains, from_date=from_date, to_date=to_date)
+
+    def posts_by(self, facebook_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        """Returns the facebook posts series, see DataView.posts_by
+        """
+        return self.get('posts_by', aggregate_by, facebook_user_id=facebook_user_id, _id=_id,
+                        text_contains=text_contains, from_date=from_date, to_date=to_date)
+
+    def comments_by(self, facebook_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        """Returns the facebook comments series, see DataView.comments_by
+        """
+        return self.get('comments_by', aggregate_by, facebook_user_id=facebook_user_id, _id=_id,
+                        text_contains=text_contains, from_date=from_date, to_date=to_date)
+
+    def wikipedia(self, wikipedia_page_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        """Returns the wikipedia chobs series, see DataView.wikipedia
+        """
+        return self.get('wikipedia', aggregate_by, wikipedia_page_id=wikipedia_page_id, _id=_id,
+                        text_contains=text_contains, from_date=from_date, to_date=to_date)
+
+    def general_tweets(self, twitter_user_id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+        """Returns the general population tweets series, see DataView.general_tweets
+        """
+        return self.get('general_tweets', aggregate_by, twitter_user_id=twitter_user_id,
+                        text_contains=text_contains, from_date=from_date, to_date=to_date)
+
+    def get(self, endpoint: str, aggregate_by: str='month', **query) -> pd.DataFrame:
+        """Returns the series of a query aggregated by aggregate_by, computed from the finest series
+
+        Input parameters:
+                        endpoint (str): one of ENDPOINTS
+                        aggregate_by (str): 'day', 'week', 'month' or 'year'; the ones that cannot be computed
+                            from finest and None (raw chobs) are passed to the DataView
+                        **query: the ids and filters of the DataView method, except aggregate_by
+
+        Returns:
+            DataFrame: the series, as returned by the DataView method
+        """
+        if endpoint not in self.ENDPOINTS:
+            raise ValueError(f"endpoint must be one of {self.ENDPOINTS}, not '{endpoint}'")
+
+        if aggregate_by not in AGGREGATIONS or not _derivable(self.finest, aggregate_by):
+            return getattr(self.dv, endpoint)(aggregate_by=aggregate_by, **query)
+
+        series = self._get_series(endpoint, query)
+
+        # a copy, the frame is kept for the next switch to this aggregation
+        return series.frame(aggregate_by, PANEL_METRICS.get(endpoint, 'tweets'), query).copy()
+
+    def clear(self):
+        """Drop the series kept in memory, e.g. to download them again
+        """
+        with self._lock:
+            self._series.clear()
+
+    def _get_series(self, endpoint: str, query: dict) -> _Series:
+        """Returns the finest series of a query, downloading it if it is not kept
+        """
+        key = (endpoint, tuple(sorted((k, str(v)) for k, v in query.items() if v is not None)))
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is not None:
+                self._series.move_to_end(key)
+                return series
+
+        # the download is done without the lock, concurrent identical requests are coalesced by the SMMAPI
+        response = getattr(self.dv.api, endpoint)(aggregate_by=self.finest, **query)
+        series = _Series(response)
+
+        with self._lock:
+            self._series[key] = series
+            while len(self._series) > self.max_series:
+                self._series.popitem(last=False)
+
+        return series
@@ -0,0 +1,117 @@
+"""Summary
+"""
+import sys
+import time
+import random
+from email.utils import parsedate_to_datetime
+
+import requests
+
+
+def _errors() -> tuple:
+    """Returns the errors of a status in status_forcelist and the connection errors and timeouts that are
+    retried, of requests and, if it was imported (by the AsyncSMMAPI), of httpx
+    """
+    status_errors = (requests.HTTPError,)
+    transport_errors = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+    httpx = sys.modules.get('httpx')
+    if httpx is not None:
+        status_errors += (httpx.HTTPStatusError,)
+        transport_errors += (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+    return status_errors, transport_errors
+
+
+class RetryPolicy:
+
+    """Decides which failed requests of the SMMAPI are retried and how long to wait before the next attempt.
+
+    Only GET requests are done by the SMMAPI, so connection errors, timeouts and the status codes in
+    status_forcelist are retried; any other error status is raised right away.
+
+    Attributes:
+        attempts (int): Number of retries after the first request
+        backoff_factor (float): Base of the exponential backoff, in seconds
+        max_backoff (float): Maximum number of seconds to wait between attempts
+        jitter (bool): Randomize the backoff ("full jitter") so concurrent clients do not retry in lockstep
+        status_forcelist (tuple): Status codes that are retried
+        respect_retry_after (bool): Wait as long as the Retry-After header of the response asks for
+        timeout (tuple): Connect and read timeouts of every request, in seconds
+    """
+
+    def __init__(self,
+                 attempts: int=2,
+                 backoff_factor: float=0.5,
+                 max_backoff: float=30.0,
+                 jitter: bool=True,
+                 status_forcelist: tuple=(429, 500, 502, 503, 504),
+                 respect_retry_after: bool=True,
+                 timeout: tuple=(3.05, 60)):
+        """Constructor of the RetryPolicy
+
+        Args:
+            attempts (int, optional): the number of retries after the first request
+            backoff_factor (float, optional): the backoff before retry n is backoff_factor * 2 ** n seconds
+            max_backoff (float, optional): the maximum number of seconds to wait between attempts
+            jitter (bool, optional): wait a random time between 0 and the backoff
+            status_forcelist (tuple, optional): the status codes that are retried
+            respect_retry_after (bool, optional): honor the Retry-After header of 429 and 503 responses
+            timeout (tuple, optional): the (connect, read) timeouts of every request in seconds, one number
+                for both or None for no timeout
+        """
+        self.attempts = attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.status_forcelist = status_forcelist
+        self.respect_retry_after = respect_retry_after
+        self.timeout = timeout
+
+    def is_retryable(self, exc: Exception) -> bool:
+        """Returns whether a request that failed with exc (an error of requests, or of httpx for the
+        AsyncSMMAPI) can be tried again
+        """
+        status_errors, transport_errors = _errors()
+        if isinstance(exc, status_errors):
+            return exc.response is not None and exc.response.status_code in self.status_forcelist
+
+        return isinstance(exc, transport_errors)
+
+    def backoff(self, attempt: int, response: requests.Response=None) -> float:
+        """Returns the number of seconds to wait before the retry that follows attempt
+
+        Args:
+            attempt (int): the number of the failed attempt, starting at 0
+            response (Response, optional): the failed response, if the server answered
+
+        Returns:
+            float: seconds to wait
+        """
+        if self.respect_retry_after and response is not None:
+            retry_after = self.retry_after(response)
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+
+        delay = min(self.backoff_factor * 2 ** attempt, self.max_backoff)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    @staticmethod
+    def retry_after(response: requests.Response):
+        """Returns the seconds requested by the Retry-After header of the response, or None
+        """
+        value = response.headers.get('Retry-After')
+        if value is None:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,88 @@
+"""Summary
+"""
+
+
+#: endpoint name -> (path of the endpoint, path segment used for a platform user/page id)
+ENTITY_ROUTES = {
+    'tweets_by': ('twitter/tweets_by', 'user_id'),
+    'replies_to': ('twitter/replies_to', 'user_id'),
+    'posts_by': ('facebook/posts_by', 'user_id'),
+    'comments_by': ('facebook/comments_by', 'user_id'),
+    'wikipedia': ('wikipedia/chobs', 'page_id'),
+}
+
+
+class Routes:
+
+    """Builds the url and the parameters of every SMM API endpoint. It is shared by the SMMAPI and the
+    AsyncSMMAPI so that both query exactly the same urls.
+
+    Attributes:
+        base (url): Base request url
+        unit (str): politicians or organizations
+    """
+
+    def get_all_route(self):
+        """Returns the url and parameters of get_all
+        """
+        return '{}all/'.format(self.base), None
+
+    def get_one_route(self, _id):
+        """Returns the url and parameters of get_one
+        """
+        return '{}all/{}'.format(self.base, _id), None
+
+    def all_search_route(self, names_contain=None, _id=None):
+        """Returns the url and parameters of all_search
+        """
+        if names_contain is not None:
+            return '{}all/search/'.format(self.base), {'names_contain': names_contain}
+        elif _id is not None:
+            return '{}all/{}/'.format(self.base, _id), {}
+
+        raise ValueError('either names_contain or _id must be given')
+
+    def entity_route(self, endpoint, user_id=None, _id=None, text_contains=None, from_date=None, to_date=None,
+                     aggregate_by='month'):
+        """Returns the url and parameters of tweets_by, replies_to, posts_by, comments_by and wikipedia
+
+        Input parameters:
+                        endpoint (str): one of the keys of ENTITY_ROUTES
+                        user_id (str): twitter/facebook user id or wikipedia page id
+                        OR
+                        _id (str): A unique value identifying this politician or an organization.
+                        optional:
+                        text_contains, from_date, to_date, aggregate_by: the filters of the endpoint
+        """
+        path, user_segment = ENTITY_ROUTES[endpoint]
+
+        if user_id is None and _id is None:
+            url = '{}{}/{}/'.format(self.base, path, self.unit)
+        elif user_id is not None:
+            url = '{}{}/{}/{}/{}/'.format(self.base, path, self.unit, user_segment, user_id)
+        else:
+            url = '{}{}/{}/{}/'.format(self.base, path, self.unit, _id)
+
+        parameters = {'text_contains': text_contains, 'from_date': from_date, 'to_date': to_date,
+                      'aggregate_by': aggregate_by}
+
+        return url, parameters
+
+    def general_tweets_route(self, twitter_user_id=None, text_contains=None, from_date=None, to_date=None,
+                             aggregate_by='month'):
+        """Returns the url and parameters of general_tweets
+        """
+        if twitter_user_id is None:
+            url = '{}twitter/general_population/'.format(self.base)
+        else:
+            url = '{}twitter/general_population/user_id/{}/'.format(self.base, twitter_user_id)
+
+        parameters = {'text_contains': text_contains, 'from_date': from_date, 'to_date': to_date,
+                      'aggregate_by': aggregate_by}
+
+        return url, parameters
+
+    def family(self, url: str) -> str:
+        """Returns the endpoint family of the url (all, twitter, facebook or wikipedia)
+        """
+        return url[len(self.base):].split('/', 1)[0]
@@ -0,0 +1,77 @@
+"""Summary
+"""
+import copy
+import threading
+
+
+class _Call:
+
+    """A call in flight, shared by the threads that asked for the same key
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+
+    """Coalesces identical calls made concurrently by several threads: the first thread (the leader) runs
+    the call, the others wait for it and get a deep copy of its result, or its exception. The callers can
+    therefore modify what they get without affecting each other. Calls made after the leader returned run
+    again, nothing is cached.
+
+    Attributes:
+        shared (int): Number of calls that were answered with the result of another thread's call
+    """
+
+    def __init__(self):
+        """Constructor of the SingleFlight
+        """
+        self.shared = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """Run func, unless a call with the same key is in flight, in which case wait for its result
+
+        Args:
+            key: identifies identical calls, e.g. the normalized url and parameters of a request
+            func (callable): the call, without arguments
+
+        Returns:
+            the result of func, copied if it was shared with other threads
+
+        Raises:
+            exc: the exception raised by func
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.followers += 1
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = func()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                followers = call.followers
+            call.done.set()
+
+        # the followers copy the result, the leader must not hand out the original they copy from
+        return copy.deepcopy(call.result) if followers else call.result
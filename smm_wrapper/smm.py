@@ -1,8 +1,10 @@
 """Summary
 """
 from .api import SMMAPI
-
-from .views import DataView
+from .cache import ResponseCache
+from .retry import RetryPolicy
+from .ratelimit import TokenBucket, AIMDConcurrency
+from .index import ID_COLUMNS
 
 
 class SMM:
@@ -25,7 +27,21 @@ class SMM:
                  domain: str="mediamonitoring.gesis.org",
                  unit: str="politicians",
                  version: str="v1",
-                 attempts: int=2):
+                 attempts: int=2,
+                 max_workers: int=8,
+                 cache: ResponseCache=None,
+                 retry: RetryPolicy=None,
+                 rate_limiter: TokenBucket=None,
+                 concurrency: AIMDConcurrency=None,
+                 pool_connections: int=10,
+                 pool_maxsize: int=None,
+                 pool_block: bool=False,
+                 adapter=None,
+                 json_decoder=None,
+                 coalesce: bool=True,
+                 instrumentation=None,
+                 date_ranges=None,
+                 memo=None):
         """Constructor of the SMM
 
         Args:
@@ -35,8 +51,25 @@ class SMM:
             lng (str, optional): the language that needs to be query
             protocol (str, optional): the protocol of the url
             domain (str, optional): the domain that hosts the api
+            unit (str, optional): politicians or organizations, which sets the id column of the DataView
             version (str, optional): the version of the api
             attempts (int, optional): the number of attempts before giving up trying to connect
+            max_workers (int, optional): the maximum number of concurrent requests in fetch_many
+            cache (ResponseCache, optional): a cache for the responses, e.g. SQLiteCache()
+            retry (RetryPolicy, optional): the retry policy of every request (RetryPolicy(attempts) by default)
+            rate_limiter (TokenBucket, optional): a rate limiter, which can be shared with other instances
+            concurrency (AIMDConcurrency, optional): an adaptive limit of the requests in flight
+            pool_connections (int, optional): the number of hosts whose connection pools are kept
+            pool_maxsize (int, optional): the maximum number of connections kept open per host (max_workers by default)
+            pool_block (bool, optional): never open more than pool_maxsize connections per host, wait instead
+            adapter (BaseAdapter, optional): a transport adapter to use instead of the default pooled HTTPAdapter
+            json_decoder (str or callable, optional): 'orjson', 'simdjson', 'json' or a function decoding
+                the bytes of a body (the fastest installed one by default)
+            coalesce (bool, optional): identical concurrent requests share one request (see SingleFlight)
+            instrumentation (Instrumentation, optional): hooks called on every request and DataFrame, e.g. Recorder()
+            date_ranges (DateRangeCache, optional): answers the aggregated series from the dates already
+                downloaded, e.g. DateRangeCache() for a date range slider
+            memo (FrameMemo, optional): memoize the frames of the DataView (dv), e.g. FrameMemo()
         """
 
 
@@ -48,9 +81,32 @@ class SMM:
                               domain,
                               unit,
                               version,
-                              attempts)
+                              attempts,
+                              max_workers,
+                              cache,
+                              retry,
+                              rate_limiter,
+                              concurrency,
+                              pool_connections,
+                              pool_maxsize,
+                              pool_block,
+                              adapter,
+                              json_decoder,
+                              coalesce,
+                              instrumentation,
+                              date_ranges)
+
+        self.memo = memo
+        self._dv = None
 
-        self.dv = DataView(self.api)
+    @property
+    def dv(self):
+        """The DataView of the api, created on first use so that pandas is only imported when it is needed
+        """
+        if self._dv is None:
+            from .views import DataView
+            self._dv = DataView(self.api, id_column=ID_COLUMNS[self.api.unit], memo=self.memo)
+        return self._dv
 
 
 class SMMPoliticians:
@@ -72,7 +128,21 @@ class SMMPoliticians:
                  protocol: str="http",
                  domain: str="mediamonitoring.gesis.org",
                  version: str="v1",
-                 attempts: int=2):
+                 attempts: int=2,
+                 max_workers: int=8,
+                 cache: ResponseCache=None,
+                 retry: RetryPolicy=None,
+                 rate_limiter: TokenBucket=None,
+                 concurrency: AIMDConcurrency=None,
+                 pool_connections: int=10,
+                 pool_maxsize: int=None,
+                 pool_block: bool=False,
+                 adapter=None,
+                 json_decoder=None,
+                 coalesce: bool=True,
+                 instrumentation=None,
+                 date_ranges=None,
+                 memo=None):
         """Constructor of the SMM
 
         Args:
@@ -84,6 +154,22 @@ class SMMPoliticians:
             domain (str, optional): the domain that hosts the api
             version (str, optional): the version of the api
             attempts (int, optional): the number of attempts before giving up trying to connect
+            max_workers (int, optional): the maximum number of concurrent requests in fetch_many
+            cache (ResponseCache, optional): a cache for the responses, e.g. SQLiteCache()
+            retry (RetryPolicy, optional): the retry policy of every request (RetryPolicy(attempts) by default)
+            rate_limiter (TokenBucket, optional): a rate limiter, which can be shared with other instances
+            concurrency (AIMDConcurrency, optional): an adaptive limit of the requests in flight
+            pool_connections (int, optional): the number of hosts whose connection pools are kept
+            pool_maxsize (int, optional): the maximum number of connections kept open per host (max_workers by default)
+            pool_block (bool, optional): never open more than pool_maxsize connections per host, wait instead
+            adapter (BaseAdapter, optional): a transport adapter to use instead of the default pooled HTTPAdapter
+            json_decoder (str or callable, optional): 'orjson', 'simdjson', 'json' or a function decoding
+                the bytes of a body (the fastest installed one by default)
+            coalesce (bool, optional): identical concurrent requests share one request (see SingleFlight)
+            instrumentation (Instrumentation, optional): hooks called on every request and DataFrame, e.g. Recorder()
+            date_ranges (DateRangeCache, optional): answers the aggregated series from the dates already
+                downloaded, e.g. DateRangeCache() for a date range slider
+            memo (FrameMemo, optional): memoize the frames of the DataView (dv), e.g. FrameMemo()
         """
 
 
@@ -95,9 +181,32 @@ class SMMPoliticians:
                               domain,
                               'politicians',
                               version,
-                              attempts)
+                              attempts,
+                              max_workers,
+                              cache,
+                              retry,
+                              rate_limiter,
+                              concurrency,
+                              pool_connections,
+                              pool_maxsize,
+                              pool_block,
+                              adapter,
+                              json_decoder,
+                              coalesce,
+                              instrumentation,
+                              date_ranges)
 
-        self.dv = DataView(self.api, id_column='politician_id')
+        self.memo = memo
+        self._dv = None
+
+    @property
+    def dv(self):
+        """The DataView of the api, created on first use so that pandas is only imported when it is needed
+        """
+        if self._dv is None:
+            from .views import DataView
+            self._dv = DataView(self.api, id_column='politician_id', memo=self.memo)
+        return self._dv
 
 class SMMOrganizations:
 
@@ -118,7 +227,21 @@ class SMMOrganizations:
                  protocol: str="http",
                  domain: str="mediamonitoring.gesis.org",
                  version: str="v1",
-                 attempts: int=2):
+                 attempts: int=2,
+                 max_workers: int=8,
+                 cache: ResponseCache=None,
+                 retry: RetryPolicy=None,
+                 rate_limiter: TokenBucket=None,
+                 concurrency: AIMDConcurrency=None,
+                 pool_connections: int=10,
+                 pool_maxsize: int=None,
+                 pool_block: bool=False,
+                 adapter=None,
+                 json_decoder=None,
+                 coalesce: bool=True,
+                 instrumentation=None,
+                 date_ranges=None,
+                 memo=None):
         """Constructor of the SMM
 
         Args:
@@ -130,6 +253,22 @@ class SMMOrganizations:
             domain (str, optional): the domain that hosts the api
             version (str, optional): the version of the api
             attempts (int, optional): the number of attempts before giving up trying to connect
+            max_workers (int, optional): the maximum number of concurrent requests in fetch_many
+            cache (ResponseCache, optional): a cache for the responses, e.g. SQLiteCache()
+            retry (RetryPolicy, optional): the retry policy of every request (RetryPolicy(attempts) by default)
+            rate_limiter (TokenBucket, optional): a rate limiter, which can be shared with other instances
+            concurrency (AIMDConcurrency, optional): an adaptive limit of the requests in flight
+            pool_connections (int, optional): the number of hosts whose connection pools are kept
+            pool_maxsize (int, optional): the maximum number of connections kept open per host (max_workers by default)
+            pool_block (bool, optional): never open more than pool_maxsize connections per host, wait instead
+            adapter (BaseAdapter, optional): a transport adapter to use instead of the default pooled HTTPAdapter
+            json_decoder (str or callable, optional): 'orjson', 'simdjson', 'json' or a function decoding
+                the bytes of a body (the fastest installed one by default)
+            coalesce (bool, optional): identical concurrent requests share one request (see SingleFlight)
+            instrumentation (Instrumentation, optional): hooks called on every request and DataFrame, e.g. Recorder()
+            date_ranges (DateRangeCache, optional): answers the aggregated series from the dates already
+                downloaded, e.g. DateRangeCache() for a date range slider
+            memo (FrameMemo, optional): memoize the frames of the DataView (dv), e.g. FrameMemo()
         """
 
 
@@ -141,7 +280,30 @@ class SMMOrganizations:
                               domain,
                               'organizations',
                               version,
-                              attempts)
+                              attempts,
+                              max_workers,
+                              cache,
+                              retry,
+                              rate_limiter,
+                              concurrency,
+                              pool_connections,
+                              pool_maxsize,
+                              pool_block,
+                              adapter,
+                              json_decoder,
+                              coalesce,
+                              instrumentation,
+                              date_ranges)
+
+        self.memo = memo
+        self._dv = None
 
-        self.dv = DataView(self.api, id_column='organization_id')
+    @property
+    def dv(self):
+        """The DataView of the api, created on first use so that pandas is only imported when it is needed
+        """
+        if self._dv is None:
+            from .views import DataView
+            self._dv = DataView(self.api, id_column='organization_id', memo=self.memo)
+        return self._dv
 
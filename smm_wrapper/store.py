@@ -0,0 +1,160 @@
+"""Summary
+"""
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+class ParquetStore:
+
+    """Stores the DataFrames of the DataView as Parquet files, partitioned as
+    root/endpoint=<endpoint>/unit=<unit>/entity=<id>/. Reading back prunes the partitions by unit and
+    entity and skips the row groups whose date statistics are outside the requested range, so loading
+    one politician's year only reads the relevant row groups. It requires pyarrow
+    (pip install smm_wrapper[parquet]).
+
+    Attributes:
+        root (str): Directory of the store
+        row_group_size (int): Maximum number of rows per row group
+    """
+
+    #: DataView methods whose frames can be stored
+    ENDPOINTS = ('tweets_by', 'replies_to', 'posts_by', 'comments_by', 'wikipedia', 'general_tweets')
+
+    def __init__(self, root: str, row_group_size: int=10000):
+        """Constructor of the ParquetStore
+
+        Args:
+            root (str): directory of the store
+            row_group_size (int, optional): maximum number of rows per row group
+        """
+        if pa is None:
+            raise ImportError('ParquetStore requires pyarrow: pip install smm_wrapper[parquet]')
+
+        self.root = os.path.expanduser(root)
+        self.row_group_size = row_group_size
+
+    def write(self, df: pd.DataFrame, endpoint: str, unit: str, entity=None):
+        """Write the frame of an endpoint, replacing what was stored for the same unit and entity
+
+        Args:
+            df (DataFrame): a frame returned by the DataView method endpoint
+            endpoint (str): one of ENDPOINTS
+            unit (str): politicians or organizations
+            entity (optional): the id of the politician/organization; by default the _id of the query of
+                the frame, or <column>-<id> for a twitter_user_id, facebook_user_id or wikipedia_page_id
+                query (e.g. 'twitter_user_id-123'), or 'all' for a query without id
+
+        Raises:
+            ValueError: if entity is not given and cannot be found out from the frame (several ids, or raw
+                chobs, which do not record their query), rather than overwriting another entity
+        """
+        if endpoint not in self.ENDPOINTS:
+            raise ValueError(f"endpoint must be one of {self.ENDPOINTS}, not '{endpoint}'")
+
+        if entity is None:
+            entity = _entity(df)
+
+        directory = self._partition(endpoint, unit, entity)
+        os.makedirs(directory, exist_ok=True)
+
+        # sorted by date, the row group statistics let readers skip the groups out of the date range
+        if 'date' in df:
+            df = df.sort_values('date', kind='stable')
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pq.write_table(table, os.path.join(directory, 'part-0.parquet'), row_group_size=self.row_group_size)
+
+    def read(self, endpoint: str, unit: str=None, entity=None, from_date=None, to_date=None,
+             columns: list=None) -> pd.DataFrame:
+        """Read stored frames of an endpoint, reading only the matching partitions and row groups
+
+        Args:
+            endpoint (str): one of ENDPOINTS
+            unit (str, optional): politicians or organizations, all units by default
+            entity (optional): an id or a list of ids of politicians/organizations, all by default
+            from_date (str, optional): only rows on or after this date (format: YYYY-MM-DD)
+            to_date (str, optional): only rows on or before this date (format: YYYY-MM-DD)
+            columns (list, optional): the columns to read, all by default
+
+        Returns:
+            DataFrame: the stored rows, with the unit and entity columns of the partitions
+        """
+        directory = os.path.join(self.root, f'endpoint={endpoint}')
+        if not os.path.isdir(directory):
+            return pd.DataFrame(columns=columns)
+
+        partitioning = ds.partitioning(pa.schema([('unit', pa.string()), ('entity', pa.string())]),
+                                       flavor='hive')
+        dataset = ds.dataset(directory, format='parquet', partitioning=partitioning)
+        # the stored frames of an endpoint may differ in their query columns (e.g. from_date)
+        schema = pa.unify_schemas([fragment.physical_schema for fragment in dataset.get_fragments()] +
+                                  [partitioning.schema])
+        dataset = ds.dataset(directory, format='parquet', partitioning=partitioning, schema=schema)
+
+        expression = None
+        if unit is not None:
+            expression = _and(expression, ds.field('unit') == unit)
+        if entity is not None:
+            entities = entity if isinstance(entity, (list, tuple, set)) else [entity]
+            expression = _and(expression, ds.field('entity').isin([str(e) for e in entities]))
+        if from_date is not None:
+            expression = _and(expression, ds.field('date') >= pd.Timestamp(from_date))
+        if to_date is not None:
+            expression = _and(expression, ds.field('date') <= pd.Timestamp(to_date))
+
+        # token lists (see DataView.wikipedia) come back as Arrow list columns, as they were written
+        return dataset.to_table(columns=columns, filter=expression).to_pandas(
+            ignore_metadata=True, types_mapper=_list_types)
+
+    def _partition(self, endpoint: str, unit: str, entity) -> str:
+        """Returns the directory of a partition
+        """
+        return os.path.join(self.root, f'endpoint={endpoint}', f'unit={unit}', f'entity={entity}')
+
+
+#: query columns identifying the entity of a frame, the first one found is used
+ENTITY_COLUMNS = ('_id', 'twitter_user_id', 'facebook_user_id', 'wikipedia_page_id')
+
+
+def _entity(df: pd.DataFrame) -> str:
+    """Returns the entity partition of a frame of the DataView, from its query (see _aggregated_frame)
+    """
+    if 'query' not in df.attrs:
+        raise ValueError('the query of the frame is unknown, give the entity to write it')
+
+    for column in ENTITY_COLUMNS:
+        if column in df.attrs['query']:
+            values = [df.attrs['query'][column]]
+        elif column in df:
+            values = list(df[column].dropna().unique())
+        else:
+            continue
+
+        if len(values) > 1:
+            raise ValueError(f'the frame has several {column}, give the entity to write it')
+        if values:
+            return str(values[0]) if column == '_id' else f'{column}-{values[0]}'
+
+    return 'all'
+
+
+def _list_types(arrow_type):
+    """Map Arrow list types to pandas ArrowDtype when converting a table to pandas
+    """
+    if pa.types.is_list(arrow_type) or pa.types.is_large_list(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+def _and(expression, other):
+    """Combine two dataset filter expressions, the first may be None
+    """
+    return other if expression is None else expression & other
@@ -0,0 +1,127 @@
+"""Summary
+"""
+import json
+import codecs
+
+
+_WHITESPACE = ' \t\n\r'
+_decoder = json.JSONDecoder()
+
+
+class _Buffer:
+
+    """Text buffer filled from an iterator of byte chunks, consumed from the front.
+
+    Attributes:
+        text (str): the decoded text that was not consumed yet
+        pos (int): the position of the parser in text
+        eof (bool): all the chunks were read
+    """
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read the next chunk, dropping the consumed text. Returns False at the end of the chunks
+        """
+        if self.eof:
+            return False
+
+        self.text = self.text[self.pos:]
+        self.pos = 0
+        try:
+            self.text += self.utf8.decode(next(self.chunks))
+        except StopIteration:
+            self.text += self.utf8.decode(b'', final=True)
+            self.eof = True
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or '' at the end of the body
+        """
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str):
+        """Consume the next (non whitespace) character, which must be char
+        """
+        if self.peek() != char:
+            raise ValueError(f"expected '{char}' at position {self.pos} of the streamed JSON")
+        self.pos += 1
+
+    def value(self):
+        """Decode the JSON value at the current position, reading chunks until it is complete
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+                if self.eof or not self._truncated(value, end):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+    def _truncated(self, value, end: int) -> bool:
+        """Returns whether a decoded number may continue in the next chunk: raw_decode accepts a prefix
+        of a number (e.g. 2 of 2.5 or 1 of 1e10), so a number must be followed by a delimiter
+        """
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return False
+
+        while end < len(self.text) and self.text[end] in _WHITESPACE:
+            end += 1
+        return end == len(self.text) or self.text[end] not in ',]}'
+
+
+def iter_json_array(chunks, key: str=None):
+    """Yield the items of a JSON array from the chunks of a body, without holding the whole body in memory
+
+    The array is the body itself if it is a list; otherwise the value of key in the top level object,
+    or, if key is None, the first array value of the top level object (e.g. the chobs of a raw wikipedia
+    response). The other values of the object are skipped.
+
+    Args:
+        chunks (iterable): the bytes of the body, e.g. response.iter_content(chunk_size)
+        key (str, optional): the key of the array in the top level object
+
+    Yields:
+        the items of the array
+    """
+    buffer = _Buffer(chunks)
+
+    if buffer.peek() == '{':
+        buffer.expect('{')
+        while True:
+            if buffer.peek() == '}':
+                return
+            name = buffer.value()
+            buffer.expect(':')
+            if (key is None and buffer.peek() == '[') or name == key:
+                break
+            buffer.value()
+            if buffer.peek() == ',':
+                buffer.expect(',')
+
+    buffer.expect('[')
+    if buffer.peek() == ']':
+        return
+
+    while True:
+        yield buffer.value()
+        if buffer.peek() == ',':
+            buffer.expect(',')
+        else:
+            buffer.expect(']')
+            return
@@ -0,0 +1,145 @@
+"""Summary
+"""
+import os
+import json
+import hashlib
+
+import pandas as pd
+
+from .views import DataView, _constant
+
+
+class IncrementalSync:
+
+    """Keeps local copies of the aggregated series of a DataView up to date by downloading only what changed.
+
+    The first call of a query downloads the whole series and stores it. Later calls only request the
+    buckets from the high-water mark (the last stored date) minus overlap, so late data of the recent
+    buckets is picked up, and merge them into the stored series.
+
+    Attributes:
+        dv (DataView): the DataView used to download the series
+        path (str): Directory of the stored series
+        overlap (pd.Timedelta): How far before the high-water mark the series are downloaded again
+    """
+
+    #: DataView methods that return aggregated series and can be synced
+    ENDPOINTS = ('tweets_by', 'replies_to', 'posts_by', 'comments_by', 'wikipedia', 'general_tweets')
+
+    def __init__(self, dv: DataView, path: str='~/.cache/smm_wrapper/sync', overlap: str='31D'):
+        """Constructor of the IncrementalSync
+
+        Args:
+            dv (DataView): the DataView used to download the series
+            path (str, optional): directory of the stored series
+            overlap (str, optional): how far before the high-water mark the series are downloaded again,
+                as a pandas Timedelta string
+        """
+        self.dv = dv
+        self.path = os.path.expanduser(path)
+        self.overlap = pd.Timedelta(overlap)
+        os.makedirs(self.path, exist_ok=True)
+
+    def tweets_by(self, twitter_user_id=None, _id=None, text_contains=None, from_date=None, aggregate_by='month'):
+        """Returns the up to date tweets series, see DataView.tweets_by
+        """
+        return self.sync('tweets_by', twitter_user_id=twitter_user_id, _id=_id, text_contains=text_contains,
+                         from_date=from_date, aggregate_by=aggregate_by)
+
+    def replies_to(self, twitter_user_id=None, _id=None, text_contains=None, from_date=None, aggregate_by='month'):
+        """Returns the up to date replies series, see DataView.replies_to
+        """
+        return self.sync('replies_to', twitter_user_id=twitter_user_id, _id=_id, text_contains=text_contains,
+                         from_date=from_date, aggregate_by=aggregate_by)
+
+    def posts_by(self, facebook_user_id=None, _id=None, text_contains=None, from_date=None, aggregate_by='month'):
+        """Returns the up to date facebook posts series, see DataView.posts_by
+        """
+        return self.sync('posts_by', facebook_user_id=facebook_user_id, _id=_id, text_contains=text_contains,
+                         from_date=from_date, aggregate_by=aggregate_by)
+
+    def comments_by(self, facebook_user_id=None, _id=None, text_contains=None, from_date=None, aggregate_by='month'):
+        """Returns the up to date facebook comments series, see DataView.comments_by
+        """
+        return self.sync('comments_by', facebook_user_id=facebook_user_id, _id=_id, text_contains=text_contains,
+                         from_date=from_date, aggregate_by=aggregate_by)
+
+    def wikipedia(self, wikipedia_page_id=None, _id=None, text_contains=None, from_date=None, aggregate_by='month'):
+        """Returns the up to date wikipedia chobs series, see DataView.wikipedia
+        """
+        return self.sync('wikipedia', wikipedia_page_id=wikipedia_page_id, _id=_id, text_contains=text_contains,
+                         from_date=from_date, aggregate_by=aggregate_by)
+
+    def general_tweets(self, twitter_user_id=None, text_contains=None, from_date=None, aggregate_by='month'):
+        """Returns the up to date general population tweets series, see DataView.general_tweets
+        """
+        return self.sync('general_tweets', twitter_user_id=twitter_user_id, text_contains=text_contains,
+                         from_date=from_date, aggregate_by=aggregate_by)
+
+    def sync(self, endpoint: str, **query) -> pd.DataFrame:
+        """Download the new part of the series of a query, merge it into the stored series and return it
+
+        Input parameters:
+                        endpoint (str): one of ENDPOINTS
+                        **query: the ids and filters of the DataView method, except to_date
+
+        Returns:
+            DataFrame: the whole series, as returned by the DataView method
+        """
+        query = self._query(endpoint, query)
+        path = self._file(endpoint, query)
+        stored = pd.read_pickle(path) if os.path.exists(path) else None
+
+        if stored is None or stored.empty:
+            df = getattr(self.dv, endpoint)(**query)
+        else:
+            mark = stored['date'].max()
+            # restart at a stored label so that only complete buckets are requested
+            start = stored.loc[stored['date'] >= mark - self.overlap, 'date'].min()
+
+            new = getattr(self.dv, endpoint)(**dict(query, from_date=start.strftime('%Y-%m-%d')))
+            # the query columns as the DataView method builds them (categorical), whatever the run history
+            if query.get('from_date') is None:
+                new = new.drop(columns='from_date')
+            else:
+                new['from_date'] = _constant(query['from_date'], len(new))
+
+            df = pd.concat([stored[stored['date'] < start], new[new['date'] >= start]], ignore_index=True)
+            df.attrs = stored.attrs
+
+        df.to_pickle(path)
+
+        return df
+
+    def high_water_mark(self, endpoint: str, **query):
+        """Returns the last stored date of the series of a query, or None if it was never synced
+
+        Input parameters:
+                        endpoint (str): one of ENDPOINTS
+                        **query: the ids and filters given to sync
+        """
+        path = self._file(endpoint, self._query(endpoint, query))
+        if not os.path.exists(path):
+            return None
+
+        return pd.read_pickle(path)['date'].max()
+
+    def _query(self, endpoint: str, query: dict) -> dict:
+        """Returns the query of a series with the default aggregate_by of the DataView methods (month), so
+        that sync and high_water_mark find the same file whether it is given or not
+        """
+        if endpoint not in self.ENDPOINTS:
+            raise ValueError(f"endpoint must be one of {self.ENDPOINTS}, not '{endpoint}'")
+
+        query = dict({'aggregate_by': 'month'}, **query)
+        if query['aggregate_by'] is None:
+            raise ValueError('only aggregated series can be synced')
+
+        return query
+
+    def _file(self, endpoint: str, query: dict) -> str:
+        """Returns the file of the stored series of a query
+        """
+        key = json.dumps([endpoint, self.dv.api.base, sorted((k, str(v)) for k, v in query.items() if v is not None)])
+
+        return os.path.join(self.path, hashlib.sha1(key.encode()).hexdigest() + '.pkl')
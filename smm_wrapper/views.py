@@ -1,11 +1,232 @@
 """Summary
 """
 import pandas as pd
+import numpy as np
 import itertools
+import functools
 from typing import Union
+from concurrent.futures import ThreadPoolExecutor
 
-from .api import SMMAPI
-from . import __version__
+from .api import SMMAPI, _fan_out
+from .instrumentation import _timed
+from .memo import FrameMemo, _memoized
+
+
+#: time-series methods of the panel and the name of their value column
+PANEL_METRICS = {
+    'tweets_by': 'tweets',
+    'replies_to': 'replies',
+    'posts_by': 'posts',
+    'comments_by': 'comments',
+    'wikipedia': 'chobs',
+}
+
+#: aggregate_by of the API -> pandas frequency of its buckets (labelled by their first day)
+TIMELINE_FREQS = {'day': 'D', 'week': 'W-MON', 'month': 'MS', 'year': 'YS'}
+
+
+#: keys of an aggregated response that are not broadcast into columns
+_AGGREGATED_KEYS = ('response_type', 'aggregated_by', 'labels', 'values')
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_labels(labels: tuple) -> pd.DatetimeIndex:
+    """Parse the labels of an aggregated response into dates. Responses of the same date range share
+    their labels, so each distinct list of labels is only parsed once.
+
+    Args:
+        labels (tuple): the labels of an aggregated response (format: YYYY-MM-DD)
+
+    Returns:
+        DatetimeIndex: the parsed labels
+    """
+    return pd.DatetimeIndex(pd.to_datetime(list(labels), format='ISO8601'))
+
+
+def _constant(value, length: int) -> pd.Categorical:
+    """Returns a column of length rows that all hold value, stored as a single category
+    """
+    return pd.Categorical.from_codes(np.zeros(length, dtype=np.int8), categories=[value])
+
+
+def _aggregated_frame(response: dict, value_column: str, **query) -> pd.DataFrame:
+    """Convert an aggregated response (labels and values) into a DataFrame, without modifying the response
+
+    Args:
+        response (dict): the aggregated response of the SMMAPI
+        value_column (str): the name of the column of the values, e.g. 'tweets'
+        **query: the id and filters of the query, added as columns if not None
+
+    Returns:
+        DataFrame: the query columns (categorical, also in df.attrs['query']), the date and the values
+    """
+    query = {key: value for key, value in query.items() if value is not None}
+    length = len(response['labels'])
+
+    columns = {key: _constant(value, length) for key, value in response.items() if key not in _AGGREGATED_KEYS}
+    columns.update((key, _constant(value, length)) for key, value in query.items())
+    columns['date'] = _parse_labels(tuple(response['labels']))
+    columns[value_column] = np.asarray(response['values'])
+
+    df = pd.DataFrame(columns)
+    df.attrs['query'] = query
+
+    return df
+
+
+#: columns of the raw chobs and, for the token lists, the column of their strings
+_CHOBS_COLUMNS = ['right_token','left_token', 'ins_tokens', 'del_tokens',
+                  'right_token_str', 'left_token_str', 'ins_tokens_str', 'del_tokens_str']
+_TOKEN_LISTS = {'ins_tokens': 'ins_tokens_str', 'del_tokens': 'del_tokens_str'}
+
+
+@functools.lru_cache(maxsize=None)
+def _pyarrow():
+    """Returns the pyarrow module, or None if it is not installed
+    """
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        return None
+
+
+def _offsets(lists: list) -> np.ndarray:
+    """Returns the offsets of the lists in their concatenation (len(lists) + 1 values)
+    """
+    offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, lists), dtype=np.int64, count=len(lists)), out=offsets[1:])
+    return offsets
+
+
+def _list_column(lists: list, value_type: str):
+    """Returns a column of token lists as an Arrow list array (offsets plus one flat array of values), or
+    the python lists if pyarrow is not installed
+    """
+    pa = _pyarrow()
+    if pa is None:
+        return lists
+
+    flat = pa.array(list(itertools.chain.from_iterable(lists)), type=getattr(pa, value_type)())
+    array = pa.LargeListArray.from_arrays(pa.array(_offsets(lists)), flat)
+
+    return pd.arrays.ArrowExtensionArray(array)
+
+
+def _chobs_frame(chobs: list, chobs_format: str='wide') -> pd.DataFrame:
+    """Convert the raw chobs of a wikipedia response into a DataFrame in one pass over the chobs
+
+    Args:
+        chobs (list): the change objects of the wikipedia response
+        chobs_format (str, optional): 'wide' for one row per chob, with the token lists as Arrow list
+            columns if pyarrow is installed; 'long' for one row per inserted or deleted token
+
+    Returns:
+        DataFrame: wide: the columns of _CHOBS_COLUMNS; long: chob (the row of the chob in the wide
+            frame), op ('ins' or 'del'), token and token_str
+    """
+    columns = {column: [] for column in _CHOBS_COLUMNS}
+    appends = [(column, columns[column].append) for column in _CHOBS_COLUMNS]
+    for chob in chobs:
+        for column, append in appends:
+            append(chob.get(column))
+
+    for column in itertools.chain(_TOKEN_LISTS, _TOKEN_LISTS.values()):
+        columns[column] = [tokens or [] for tokens in columns[column]]
+
+    if chobs_format == 'wide':
+        for tokens, strings in _TOKEN_LISTS.items():
+            columns[tokens] = _list_column(columns[tokens], 'int64')
+            columns[strings] = _list_column(columns[strings], 'string')
+        return pd.DataFrame(columns, columns=_CHOBS_COLUMNS)
+
+    if chobs_format != 'long':
+        raise ValueError(f"chobs_format must be 'wide' or 'long', not '{chobs_format}'")
+
+    parts = []
+    for op, (tokens, strings) in zip(('ins', 'del'), _TOKEN_LISTS.items()):
+        lengths = np.diff(_offsets(columns[tokens]))
+        parts.append(pd.DataFrame({
+            'chob': np.repeat(np.arange(len(chobs)), lengths),
+            'op': _constant(op, int(lengths.sum())),
+            'token': np.fromiter(itertools.chain.from_iterable(columns[tokens]), dtype=np.int64,
+                                 count=int(lengths.sum())),
+            'token_str': np.asarray(list(itertools.chain.from_iterable(columns[strings])), dtype=object),
+        }))
+
+    df = pd.concat(parts, ignore_index=True)
+    df['op'] = pd.Categorical(df['op'], categories=['ins', 'del'])
+
+    return df.sort_values('chob', kind='stable', ignore_index=True)
+
+
+def _chobs_chunks(chobs, chunksize: int, chobs_format: str='wide'):
+    """Yield DataFrames of chunksize chobs from an iterable of chobs (see _chobs_frame), numbering the
+    chobs across the chunks
+    """
+    chobs = iter(chobs)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(chobs, chunksize))
+        if not chunk:
+            return
+
+        yield _number_chobs(_chobs_frame(chunk, chobs_format), start, len(chunk), chobs_format)
+        start += len(chunk)
+
+
+def _number_chobs(df: pd.DataFrame, start: int, length: int, chobs_format: str='wide') -> pd.DataFrame:
+    """Number the length chobs of a frame of _chobs_frame from start, when they follow other chobs
+    """
+    if chobs_format == 'wide':
+        df.index = pd.RangeIndex(start, start + length)
+    else:
+        df['chob'] += start
+    return df
+
+
+def _batch_frame(responses: dict, value_column: str, id_column: str) -> pd.DataFrame:
+    """Convert the aggregated responses of many entities into one long frame
+
+    Args:
+        responses (dict): entity id -> aggregated response
+        value_column (str): the name of the values column, e.g. tweets
+        id_column (str): the name of the entity column, e.g. politician_id
+
+    Returns:
+        DataFrame: the id_column, date and value_column of every label of every response
+    """
+    ids = list(responses)
+    lengths = [len(responses[_id]['labels']) for _id in ids]
+    labels = list(itertools.chain.from_iterable(response['labels'] for response in responses.values()))
+
+    # parse every distinct label only once
+    distinct = tuple(pd.unique(np.asarray(labels, dtype=object)))
+    dates = pd.Series(_parse_labels(distinct), index=distinct)
+
+    return pd.DataFrame({
+        id_column: np.repeat(np.asarray(ids), lengths),
+        'date': dates.reindex(labels).to_numpy() if labels else pd.DatetimeIndex([]),
+        value_column: np.asarray(list(itertools.chain.from_iterable(r['values'] for r in responses.values()))),
+    })
+
+
+def _wikipedia_frame(response: dict, aggregate_by, chobs_format: str='wide', **query) -> pd.DataFrame:
+    """Convert a wikipedia response, raw chobs or aggregated, into a DataFrame
+
+    Args:
+        response (dict): the wikipedia response of the SMMAPI
+        aggregate_by (str): the aggregation of the query, None for raw chobs
+        chobs_format (str, optional): 'wide' or 'long', the format of raw chobs (see _chobs_frame)
+        **query: the id and filters of the query, added as columns if not None
+
+    Returns:
+        DataFrame: the chobs, or the query columns, the date and the number of chobs
+    """
+    if aggregate_by is not None:
+        return _aggregated_frame(response, 'chobs', **query)
+
+    return _chobs_frame(response['chobs'], chobs_format)
 
 
 class DataView:
@@ -13,16 +234,21 @@ class DataView:
     """Qurey methods for correspondence of the SMMAPI methods
     Attributes:
         api (TYPE): Description
+        memo (FrameMemo): Memoization of the returned frames, or None
     """
 
-    def __init__(self, api, id_column):
+    def __init__(self, api, id_column, memo: FrameMemo=None):
         """Constructor of the DataView
         Args:
             api (TYPE): the SMMAPI
+            memo (FrameMemo, optional): memoize the frames, the calls with the same arguments return
+                copies of the stored frame instead of querying the api again
         """
         self.api = api
         self.id_column = id_column
+        self.memo = memo
 
+    @_memoized
     def get_politicians(self) -> pd.DataFrame:
         """Get entities of all politicians and their respective facebook, twitter and wikipedia ids.
 
@@ -45,6 +271,7 @@ class DataView:
             'wp_ids', 'wp_titles', 'tw_sns', 'wp_sns'
         ]).set_index('politician_id')
 
+    @_memoized
     def get_politician(self, _id) -> pd.DataFrame:
         """Get entities of a politicians and their respective facebook, twitter and wikipedia ids.
         Input parameters:
@@ -66,6 +293,7 @@ class DataView:
 
         return pd.Series(response)
 
+    @_memoized
     def get_organizations(self) -> pd.DataFrame:
         """Get entities of all organizations and their respective facebook, twitter and wikipedia ids.
 
@@ -89,6 +317,7 @@ class DataView:
         ]).set_index('organization_id')
 
 
+    @_memoized
     def get_organization(self, _id) -> pd.DataFrame:
         """Get entities of an organization and their respective facebook, twitter and wikipedia ids.
         Input parameters:
@@ -111,6 +340,7 @@ class DataView:
         return pd.Series(response)
 
 
+    @_memoized
     def get_all(self) -> pd.DataFrame:
         """Get all entities and their respective facebook, twitter and wikipedia ids.
 
@@ -131,6 +361,7 @@ class DataView:
         return pd.DataFrame(response).set_index(self.id_column)
 
 
+    @_memoized
     def get_one(self, _id) -> pd.DataFrame:
         """Get an entity and their respective facebook, twitter and wikipedia ids.
         Input parameters:
@@ -152,6 +383,7 @@ class DataView:
 
         return pd.Series(response)
 
+    @_memoized
     def tweets_by(self, twitter_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
         """Returns query tweets made by politicians, or by a politician using twitter id or using politician id
 
@@ -172,29 +404,12 @@ class DataView:
         response = self.api.tweets_by(
             twitter_user_id, _id, text_contains, from_date, to_date, aggregate_by)
 
-        if twitter_user_id is not None:
-            response['twitter_user_id'] = twitter_user_id
-        if _id is not None:
-            response['_id'] = _id
-        if text_contains is not None:
-            response['text_contains'] = text_contains
-        if from_date is not None:
-            response['from_date'] = from_date
-        if to_date is not None:
-            response['to_date'] = to_date
-
-        response.pop('response_type')
-        response.pop('aggregated_by')
-        response['date'] = response.pop('labels')
-        response['tweets'] = response.pop('values')
-
-        df = pd.DataFrame(response)
-
-        df['date'] = pd.to_datetime(df['date'])
-
-        return df
+        return _timed(self.api.instrumentation, 'tweets_by', _aggregated_frame, response, 'tweets',
+                      twitter_user_id=twitter_user_id, _id=_id, text_contains=text_contains, from_date=from_date,
+                      to_date=to_date)
 
 
+    @_memoized
     def replies_to(self, twitter_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
         """Returns query twitter replies made by politicians, or by a politician using twitter id or using politician id
 
@@ -215,28 +430,11 @@ class DataView:
         response = self.api.replies_to(
             twitter_user_id, _id, text_contains, from_date, to_date, aggregate_by)
 
-        if twitter_user_id is not None:
-            response['twitter_user_id'] = twitter_user_id
-        if _id is not None:
-            response['_id'] = _id
-        if text_contains is not None:
-            response['text_contains'] = text_contains
-        if from_date is not None:
-            response['from_date'] = from_date
-        if to_date is not None:
-            response['to_date'] = to_date
-
-        response.pop('response_type')
-        response.pop('aggregated_by')
-        response['date'] = response.pop('labels')
-        response['replies'] = response.pop('values')
-
-        df = pd.DataFrame(response)
-
-        df['date'] = pd.to_datetime(df['date'])
-
-        return df
+        return _timed(self.api.instrumentation, 'replies_to', _aggregated_frame, response, 'replies',
+                      twitter_user_id=twitter_user_id, _id=_id, text_contains=text_contains, from_date=from_date,
+                      to_date=to_date)
 
+    @_memoized
     def posts_by(self, facebook_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
         """Returns query facebook posts made by politicians, or by a politician using facebook id or using politician id
 
@@ -257,28 +455,11 @@ class DataView:
         response = self.api.posts_by(
             facebook_user_id, _id, text_contains, from_date, to_date, aggregate_by)
 
-        if facebook_user_id is not None:
-            response['facebook_user_id'] = facebook_user_id
-        if _id is not None:
-            response['_id'] = _id
-        if text_contains is not None:
-            response['text_contains'] = text_contains
-        if from_date is not None:
-            response['from_date'] = from_date
-        if to_date is not None:
-            response['to_date'] = to_date
-
-        response.pop('response_type')
-        response.pop('aggregated_by')
-        response['date'] = response.pop('labels')
-        response['posts'] = response.pop('values')
-
-        df = pd.DataFrame(response)
-
-        df['date'] = pd.to_datetime(df['date'])
-
-        return df
+        return _timed(self.api.instrumentation, 'posts_by', _aggregated_frame, response, 'posts',
+                      facebook_user_id=facebook_user_id, _id=_id, text_contains=text_contains,
+                      from_date=from_date, to_date=to_date)
 
+    @_memoized
     def comments_by(self, facebook_user_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
         """Returns query facebook comments made by politicians, or by a politician using facebook id or using politician id
 
@@ -299,29 +480,13 @@ class DataView:
         response = self.api.comments_by(
             facebook_user_id, _id, text_contains, from_date, to_date, aggregate_by)
 
-        if facebook_user_id is not None:
-            response['facebook_user_id'] = facebook_user_id
-        if _id is not None:
-            response['_id'] = _id
-        if text_contains is not None:
-            response['text_contains'] = text_contains
-        if from_date is not None:
-            response['from_date'] = from_date
-        if to_date is not None:
-            response['to_date'] = to_date
-
-        response.pop('response_type')
-        response.pop('aggregated_by')
-        response['date'] = response.pop('labels')
-        response['comments'] = response.pop('values')
-
-        df = pd.DataFrame(response)
+        return _timed(self.api.instrumentation, 'comments_by', _aggregated_frame, response, 'comments',
+                      facebook_user_id=facebook_user_id, _id=_id, text_contains=text_contains,
+                      from_date=from_date, to_date=to_date)
 
-        df['date'] = pd.to_datetime(df['date'])
-
-        return df
-
-    def wikipedia(self, wikipedia_page_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
+    @_memoized
+    def wikipedia(self, wikipedia_page_id=None, _id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month',
+                  chobs_format='wide', chunksize=None):
         """Returns query wikipedia change objects (chobs) made by politicians, or by a politician using wikipedia id or using politician id
 
         Input parameters:
@@ -333,41 +498,29 @@ class DataView:
                         from_date (string($date)): filter by chobs posted after this date (format: YYYY-MM-DD)
                         to_date (string($date)): filter by chobs posted before this date (format: YYYY-MM-DD)
                         aggregate_by (str): criteria that will be used to aggregate (month by default)
+                        chobs_format (str): if aggregate_by is None, 'wide' for one row per chob (the token lists
+                            are Arrow list columns if pyarrow is installed) or 'long' for one row per
+                            inserted/deleted token
+                        chunksize (int): if aggregate_by is None, stream the response and yield DataFrames of
+                            chunksize chobs while it is downloaded, so the memory is bounded by the chunk size
 
         Returns:
             DataFrame, result of the api query as documented in wikipedia content in http://mediamonitoring.gesis.org/api/politicians/swagger/
+            generator of DataFrames if chunksize is given
         """
+        if aggregate_by is None and chunksize is not None:
+            records = self.api.wikipedia(
+                wikipedia_page_id, _id, text_contains, from_date, to_date, aggregate_by, stream=True)
+            return _chobs_chunks(records, chunksize, chobs_format)
 
         response = self.api.wikipedia(
            wikipedia_page_id, _id, text_contains, from_date, to_date, aggregate_by)
 
-        if wikipedia_page_id is not None:
-            response['wikipedia_page_id'] = wikipedia_page_id
-        if _id is not None:
-            response['_id'] = _id
-        if text_contains is not None:
-            response['text_contains'] = text_contains
-        if from_date is not None:
-            response['from_date'] = from_date
-        if to_date is not None:
-            response['to_date'] = to_date
-        if aggregate_by is None:
-            response.pop('response_type')
-            df = pd.DataFrame(response)
-            df = df['chobs'].apply(pd.Series)[['right_token','left_token', 'ins_tokens', 'del_tokens', 
-            'right_token_str', 'left_token_str', 'ins_tokens_str', 'del_tokens_str']]
-            #df = df[['right_token','left_token']]
-
-        else:
-            response.pop('response_type')
-            response.pop('aggregated_by')
-            response['date'] = response.pop('labels')
-            response['chobs'] = response.pop('values')
-            df = pd.DataFrame(response)
-            df['date'] = pd.to_datetime(df['date'])
-
-        return df
+        return _timed(self.api.instrumentation, 'wikipedia', _wikipedia_frame, response, aggregate_by, chobs_format,
+                      wikipedia_page_id=wikipedia_page_id, _id=_id, text_contains=text_contains,
+                      from_date=from_date, to_date=to_date)
 
+    @_memoized
     def general_tweets(self, twitter_user_id=None, text_contains=None, from_date=None, to_date=None, aggregate_by='month'):
         """Returns query tweets made by the general population. This tweets were collected separatedly using keywords.
 
@@ -386,22 +539,249 @@ class DataView:
         response = self.api.general_tweets(
            twitter_user_id, text_contains, from_date, to_date, aggregate_by)
 
-        if twitter_user_id is not None:
-            response['twitter_user_id'] = twitter_user_id
-        if text_contains is not None:
-            response['text_contains'] = text_contains
-        if from_date is not None:
-            response['from_date'] = from_date
-        if to_date is not None:
-            response['to_date'] = to_date
+        return _timed(self.api.instrumentation, 'general_tweets', _aggregated_frame, response, 'tweets',
+                      twitter_user_id=twitter_user_id, text_contains=text_contains, from_date=from_date,
+                      to_date=to_date)
+
+    def fetch_many(self, endpoint: str, ids, max_workers: int=None, ordered: bool=True, **filters):
+        """Query one endpoint for many politicians/organizations concurrently
+
+        Input parameters:
+                        endpoint (str): one of SMMAPI.BATCH_ENDPOINTS, e.g. 'tweets_by' or 'wikipedia'
+                        ids (iterable): unique values identifying the politicians or organizations
+                        optional:
+                        max_workers (int): maximum number of requests in flight (api.max_workers by default)
+                        ordered (bool): return the results in input order (True by default), or
+                            stream (_id, result) tuples as they finish
+                        **filters: passed to the endpoint, e.g. text_contains, from_date, to_date, aggregate_by
+
+        Returns:
+            list: the DataFrame (or Series for get_one) of every id, in the same order as ids
+            generator: (_id, DataFrame) tuples in completion order if ordered is False
+        """
+        if endpoint not in SMMAPI.BATCH_ENDPOINTS:
+            raise ValueError(f"endpoint must be one of {SMMAPI.BATCH_ENDPOINTS}, not '{endpoint}'")
+
+        return _fan_out(getattr(self, endpoint), ids, max_workers or self.api.max_workers, ordered, **filters)
 
-        response.pop('response_type')
-        response.pop('aggregated_by')
-        response['date'] = response.pop('labels')
-        response['tweets'] = response.pop('values')
+    @_memoized
+    def batch(self, endpoint: str, ids, max_workers: int=None, chobs_format: str='wide', **filters) -> pd.DataFrame:
+        """Query one endpoint for many politicians/organizations and return one long frame keyed by the
+        id column, see SMMAPI.batch
 
-        df = pd.DataFrame(response)
+        Input parameters:
+                        endpoint (str): one of SMMAPI.BATCH_ENDPOINTS, e.g. 'tweets_by'
+                        ids (iterable): unique values identifying the politicians or organizations
+                        optional:
+                        max_workers (int): maximum number of requests in flight (api.max_workers by default)
+                        chobs_format (str): 'wide' or 'long', the format of raw chobs (see wikipedia)
+                        **filters: passed to the endpoint, e.g. text_contains, from_date, to_date, aggregate_by
+
+        Returns:
+            DataFrame: get_one: the entities indexed by the id column; aggregated series: the id column,
+                date and values of every entity; raw chobs: the id column followed by the chobs of every entity
+        """
+        if endpoint == 'get_one':
+            responses = self.api.batch(endpoint, ids, max_workers)
+            return pd.DataFrame(list(responses.values())).set_index(self.id_column)
+
+        filters.setdefault('aggregate_by', 'month')
+        responses = self.api.batch(endpoint, ids, max_workers, **filters)
 
-        df['date'] = pd.to_datetime(df['date'])
+        if filters['aggregate_by'] is not None:
+            return _batch_frame(responses, PANEL_METRICS[endpoint], self.id_column)
 
+        frames = [_chobs_frame(response['chobs'], chobs_format) for response in responses.values()]
+        ids = np.repeat(np.asarray(list(responses)), [len(frame) for frame in frames])
+        df = pd.concat(frames, ignore_index=True) if frames else _chobs_frame([], chobs_format)
+        df.insert(0, self.id_column, ids)
         return df
+
+    @_memoized
+    def timeline(self, _id, sources=tuple(PANEL_METRICS), freq: str='month', from_date=None, to_date=None,
+                 max_workers: int=None) -> pd.DataFrame:
+        """Returns the activity of politicians/organizations on several platforms on one calendar
+
+        The sources are fetched concurrently, aggregated by the server at freq if it is one of the
+        aggregate_by of the API (by day otherwise), resampled to buckets of freq labelled by their first
+        day, and aligned on every bucket from the first to the last one, with 0 for the buckets without
+        activity.
+
+        Input parameters:
+                        _id (str or list): a unique value identifying a politician or an organization,
+                            or a list of them
+                        optional:
+                        sources (iterable): time-series methods to include, keys of PANEL_METRICS (all by default)
+                        freq (str): the buckets of the calendar, 'day', 'week' (starting on Monday), 'month'
+                            (by default), 'year' or a pandas frequency, e.g. '2W-MON' or 'QS'
+                        from_date (string($date)): first day of the calendar (format: YYYY-MM-DD)
+                        to_date (string($date)): last day of the calendar (format: YYYY-MM-DD)
+                        max_workers (int): maximum number of requests in flight (api.max_workers by default)
+
+        Returns:
+            DataFrame, indexed by date (or by (id_column, date) for a list of ids) with one column per
+                source, e.g. tweets, posts, chobs
+        """
+        for source in sources:
+            if source not in PANEL_METRICS:
+                raise ValueError(f"sources must be in {tuple(PANEL_METRICS)}, not '{source}'")
+
+        many = isinstance(_id, (list, tuple, set, pd.Index, np.ndarray))
+        ids = list(dict.fromkeys(_id)) if many else [_id]
+        rule = TIMELINE_FREQS.get(freq, freq)
+        filters = {'from_date': from_date, 'to_date': to_date,
+                   'aggregate_by': freq if freq in TIMELINE_FREQS else 'day'}
+
+        with ThreadPoolExecutor(max_workers=max_workers or self.api.max_workers) as executor:
+            futures = {source: [executor.submit(getattr(self.api, source), _id=i, **filters) for i in ids]
+                       for source in sources}
+            responses = {source: dict(zip(ids, (future.result() for future in futures[source])))
+                         for source in sources}
+
+        grouper = pd.Grouper(key='date', freq=rule, label='left', closed='left')
+        columns = []
+        for source in sources:
+            long = _batch_frame(responses[source], PANEL_METRICS[source], self.id_column)
+            columns.append(long.groupby([self.id_column, grouper])[PANEL_METRICS[source]].sum())
+        df = pd.concat(columns, axis=1) if columns else pd.DataFrame()
+
+        offset = pd.tseries.frequencies.to_offset(rule)
+        dates = df.index.get_level_values('date') if len(df) else pd.DatetimeIndex([])
+        start = offset.rollback(pd.Timestamp(from_date).normalize()) if from_date is not None else dates.min()
+        # without to_date the calendar ends with the last activity, or is the bucket of from_date if there is none
+        end = pd.Timestamp(to_date) if to_date is not None else dates.max() if len(dates) else start
+        calendar = pd.date_range(start, end, freq=rule, name='date') if start is not pd.NaT else dates[:0]
+
+        index = pd.MultiIndex.from_product([ids, calendar], names=[self.id_column, 'date'])
+        df = df.reindex(index, fill_value=0).reindex(columns=[PANEL_METRICS[source] for source in sources])
+
+        return df if many else df.droplevel(self.id_column)
+
+    def iter_frames(self, endpoint: str, window=None, prefetch: int=2, chobs_format: str='wide', **query):
+        """Iterate over the DataFrames of the pages of a query, downloading the next pages while the
+        previous ones are processed, see SMMAPI.iter_pages
+
+        Input parameters:
+                        endpoint (str): one of SMMAPI.PAGED_ENDPOINTS, e.g. 'wikipedia'
+                        optional:
+                        window (int or str): split the query into date windows of this many days, or
+                            calendar 'week', 'month' or 'year' windows; requires from_date
+                        prefetch (int): number of pages or windows downloaded ahead (2 by default)
+                        chobs_format (str): 'wide' or 'long', the format of raw chobs (see wikipedia)
+                        **query: the ids and filters of the DataView method, e.g. _id, from_date, aggregate_by
+
+        Returns:
+            generator: a DataFrame per page, as returned by the DataView method; the from_date and to_date
+                of aggregated frames are the bounds of their window; the chobs are numbered across the pages
+        """
+        query.setdefault('aggregate_by', 'month')
+        value_column = PANEL_METRICS.get(endpoint, 'tweets')
+        start = 0
+
+        for page_query, response in self.api._iter_windows(endpoint, window, prefetch, **query):
+            if 'labels' in response:
+                # the query columns of the aggregated frames, as in the DataView methods
+                yield _aggregated_frame(response, value_column,
+                                        **{k: v for k, v in page_query.items() if k != 'aggregate_by'})
+                continue
+
+            chobs = response['chobs'] if 'chobs' in response else response['results']
+            yield _number_chobs(_chobs_frame(chobs, chobs_format), start, len(chobs), chobs_format)
+            start += len(chobs)
+
+    @_memoized
+    def panel(self, ids=None, metrics=tuple(PANEL_METRICS), from_date=None, to_date=None, aggregate_by='month',
+              path: str=None, chunksize: int=500):
+        """Returns the aggregated metrics of many politicians/organizations side by side
+
+        Input parameters:
+                        optional:
+                        ids (iterable): unique values identifying the politicians or organizations (all by default)
+                        metrics (iterable): time-series methods to include, keys of PANEL_METRICS (all by default)
+                        from_date (string($date)): filter by activity after this date (format: YYYY-MM-DD)
+                        to_date (string($date)): filter by activity before this date (format: YYYY-MM-DD)
+                        aggregate_by (str): criteria that will be used to aggregate (month by default)
+                        path (str): write the panel to this Parquet file in chunks of entities instead of
+                            returning it, for panels that do not fit in memory (requires pyarrow)
+                        chunksize (int): number of entities per chunk when writing to path
+
+        Returns:
+            DataFrame, indexed by (id_column, date) with one column per metric, e.g. tweets, posts, chobs;
+                or path if the panel was written to disk
+        """
+        for metric in metrics:
+            if metric not in PANEL_METRICS:
+                raise ValueError(f"metrics must be in {tuple(PANEL_METRICS)}, not '{metric}'")
+        if aggregate_by is None:
+            raise ValueError('the panel requires aggregated metrics')
+
+        # a repeated id would repeat its (entity, date) keys
+        ids = list(dict.fromkeys(self.get_all().index if ids is None else ids))
+        filters = {'from_date': from_date, 'to_date': to_date, 'aggregate_by': aggregate_by}
+
+        if path is None:
+            return self._panel(ids, metrics, filters)
+
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError('writing the panel requires pyarrow: pip install smm_wrapper[parquet]')
+
+        writer = None
+        try:
+            for start in range(0, len(ids), chunksize):
+                table = pa.Table.from_pandas(self._panel(ids[start:start + chunksize], metrics, filters).reset_index(),
+                                             preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table.cast(writer.schema))
+        finally:
+            if writer is not None:
+                writer.close()
+
+        return path
+
+    def _panel(self, ids: list, metrics, filters: dict) -> pd.DataFrame:
+        """Fetch the metrics of the ids concurrently and assemble them into one (entity, date) frame
+        """
+        with ThreadPoolExecutor(max_workers=self.api.max_workers) as executor:
+            futures = {metric: [executor.submit(getattr(self.api, metric), _id=_id, **filters) for _id in ids]
+                       for metric in metrics}
+            responses = {metric: [future.result() for future in futures[metric]] for metric in metrics}
+
+        # keys of every metric: the entity repeated for each of its labels, and the labels
+        keys = {}
+        for metric in metrics:
+            lengths = [len(response['labels']) for response in responses[metric]]
+            keys[metric] = (np.repeat(np.asarray(ids, dtype=object), lengths),
+                            list(itertools.chain.from_iterable(r['labels'] for r in responses[metric])))
+
+        # parse every distinct label only once
+        labels = tuple(pd.unique(np.asarray(list(itertools.chain.from_iterable(k[1] for k in keys.values())),
+                                            dtype=object)))
+        dates = dict(zip(labels, _parse_labels(labels)))
+
+        indexes, values = {}, {}
+        for metric, (entities, metric_labels) in keys.items():
+            metric_index = pd.MultiIndex.from_arrays([entities, pd.DatetimeIndex([dates[l] for l in metric_labels])])
+            metric_values = np.fromiter(itertools.chain.from_iterable(r['values'] for r in responses[metric]),
+                                        dtype=float, count=len(metric_labels))
+            # a label repeated in a response (e.g. by overlapping date windows) keeps its last value
+            if metric_index.has_duplicates:
+                last = ~metric_index.duplicated(keep='last')
+                metric_index, metric_values = metric_index[last], metric_values[last]
+            indexes[metric], values[metric] = metric_index, metric_values
+
+        index = pd.MultiIndex.from_arrays([[], pd.DatetimeIndex([])], names=[self.id_column, 'date'])
+        for metric_index in indexes.values():
+            index = index.union(metric_index, sort=False)
+        index = index.set_names([self.id_column, 'date']).sort_values()
+
+        columns = {}
+        for metric in metrics:
+            column = np.full(len(index), np.nan)
+            column[index.get_indexer(indexes[metric])] = values[metric]
+            columns[PANEL_METRICS[metric]] = column
+
+        return pd.DataFrame(columns, index=index)
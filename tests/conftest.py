@@ -0,0 +1,15 @@
+import pytest
+
+from smm_wrapper import SMMAPI
+from smm_wrapper.mockserver import MockServer
+
+
+@pytest.fixture
+def server():
+    with MockServer() as server:
+        yield server
+
+
+@pytest.fixture
+def api(server):
+    return SMMAPI(domain=server.domain, unit='politicians')
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+
+import pytest
+
+httpx = pytest.importorskip('httpx')
+
+from smm_wrapper import (SMMAPI, SMMPoliticians, AsyncSMMAPI, AsyncDataView, SQLiteCache, RetryPolicy,
+                         AIMDConcurrency, Recorder)
+from smm_wrapper.async_api import _timeout
+from smm_wrapper.mockserver import MockServer
+
+
+def _run(server, queries, **kwargs):
+    """Returns the result of queries(api), run with an AsyncSMMAPI on the server
+    """
+    async def run():
+        async with AsyncSMMAPI(domain=server.domain, unit='politicians', **kwargs) as api:
+            return await queries(api)
+
+    return asyncio.run(run())
+
+
+def test_same_results(server, api):
+    async def queries(api):
+        return [await api.get_all(), await api.get_one(2), await api.all_search(names_contain='a'),
+                await api.tweets_by(_id=1, from_date='2018-01-01'), await api.posts_by(_id=1, aggregate_by='year'),
+                await api.wikipedia(_id=1, aggregate_by=None), await api.general_tweets(aggregate_by='week')]
+
+    assert _run(server, queries) == [
+        api.get_all(), api.get_one(2), api.all_search(names_contain='a'),
+        api.tweets_by(_id=1, from_date='2018-01-01'), api.posts_by(_id=1, aggregate_by='year'),
+        api.wikipedia(_id=1, aggregate_by=None), api.general_tweets(aggregate_by='week')]
+
+
+def test_fetch_many_order():
+    ids = [5, 3, 9, 1, 7]
+    with MockServer(latency=(0.0, 0.02), seed=0) as server:
+        results = _run(server, lambda api: api.fetch_many('get_one', ids), max_workers=3)
+
+    assert [entity['politician_id'] for entity in results] == ids
+
+
+def test_redirects_followed():
+    # the url of get_one has no trailing slash, the SMM API redirects it; requests and httpx must follow
+    with MockServer(append_slash=True) as server:
+        expected = SMMAPI(domain=server.domain, unit='politicians').get_one(2)
+        assert _run(server, lambda api: api.get_one(2)) == expected
+        assert expected['politician_id'] == 2
+        assert server.requests == 4
+
+
+def test_timeout():
+    assert _timeout((2, 30)) == httpx.Timeout(30, connect=2)
+    assert _timeout(5) == httpx.Timeout(5)
+    assert _timeout(None) == httpx.Timeout(None)
+
+
+def test_cache_revalidation(server, tmp_path):
+    cache = SQLiteCache(path=str(tmp_path / 'responses.sqlite'), default_ttl=0)
+
+    async def twice(api):
+        return await api.get_all(), await api.get_all()
+
+    first, second = _run(server, twice, cache=cache)
+    assert first == second
+    assert cache.stats() == {'hits': 0, 'misses': 1, 'revalidations': 1}
+
+
+def test_retries(caplog):
+    with MockServer(error_rate=1.0, error_status=503) as server:
+        with caplog.at_level(logging.WARNING, logger='smm_wrapper.api'), pytest.raises(httpx.HTTPStatusError):
+            _run(server, lambda api: api.get_all(), retry=RetryPolicy(attempts=2, max_backoff=0.01))
+
+    assert server.requests == 3
+    assert len(caplog.records) == 2
+
+
+def test_concurrency():
+    concurrency = AIMDConcurrency(initial=2, max_limit=2)
+    with MockServer(latency=0.02) as server:
+        results = _run(server, lambda api: api.fetch_many('get_one', range(1, 9)), concurrency=concurrency)
+
+    assert len(results) == 8
+    assert concurrency.in_flight == 0 and concurrency.limit == 2
+
+    with MockServer(error_rate=1.0, error_status=503) as server:
+        with pytest.raises(httpx.HTTPStatusError):
+            _run(server, lambda api: api.get_all(), concurrency=concurrency,
+                 retry=RetryPolicy(attempts=2, max_backoff=0.01))
+
+    assert concurrency.in_flight == 0 and concurrency.limit == 1
+
+
+def test_instrumentation(server, api):
+    recorder = Recorder()
+    _run(server, lambda api: AsyncDataView(api, 'politician_id').tweets_by(_id=1), instrumentation=recorder)
+
+    api.instrumentation = expected = Recorder()
+    SMMPoliticians(domain=server.domain, instrumentation=expected).dv.tweets_by(_id=1)
+
+    assert [name for name, _ in recorder.events] == [name for name, _ in expected.events]
+    assert recorder.summary()['requests'] == 1 and recorder.summary()['bytes'] > 0
+
+
+def test_dataview(server):
+    dv = SMMPoliticians(domain=server.domain).dv
+
+    async def frames(api):
+        adv = AsyncDataView(api, 'politician_id')
+        return await adv.get_all(), await adv.wikipedia(_id=1, aggregate_by=None), await adv.comments_by(_id=1)
+
+    all_, chobs, comments = _run(server, frames)
+    assert all_.equals(dv.get_all())
+    assert chobs.equals(dv.wikipedia(_id=1, aggregate_by=None))
+    assert comments.equals(dv.comments_by(_id=1))
@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+import requests
+
+from smm_wrapper import SMMAPI, SMMPoliticians
+from smm_wrapper.mockserver import MockServer
+
+
+@pytest.fixture
+def dv(server):
+    return SMMPoliticians(domain=server.domain).dv
+
+
+def test_batch(api, server):
+    results = api.batch('get_one', [3, 1, 3, 2, 1])
+
+    assert list(results) == [3, 1, 2]
+    assert all(entity['politician_id'] == _id for _id, entity in results.items())
+    # repeated ids are requested once
+    assert server.requests == 3
+
+
+def test_batch_filters(api):
+    results = api.batch('wikipedia', [2, 1], from_date='2019-01-01', aggregate_by='year')
+
+    assert results == {_id: api.wikipedia(_id=_id, from_date='2019-01-01', aggregate_by='year') for _id in (2, 1)}
+
+
+def test_batch_errors():
+    with MockServer(error_rate=1.0, error_status=404) as server:
+        with pytest.raises(requests.HTTPError):
+            SMMAPI(domain=server.domain, unit='politicians').batch('tweets_by', [1, 2])
+
+
+def test_dataview_batch(dv):
+    df = dv.batch('tweets_by', [2, 1, 2], aggregate_by='year')
+
+    assert list(df.columns) == ['politician_id', 'date', 'tweets']
+    assert list(df['politician_id'].unique()) == [2, 1]
+    for _id in (1, 2):
+        expected = dv.tweets_by(_id=_id, aggregate_by='year')
+        rows = df[df['politician_id'] == _id]
+        assert rows['date'].tolist() == expected['date'].tolist()
+        assert rows['tweets'].tolist() == expected['tweets'].tolist()
+
+
+def test_dataview_batch_entities(dv):
+    df = dv.batch('get_one', [4, 2])
+
+    assert df.index.tolist() == [4, 2]
+    pd.testing.assert_frame_equal(df, dv.get_all().loc[[4, 2]], check_like=True)
+
+
+def test_dataview_batch_chobs(dv):
+    df = dv.batch('wikipedia', [1, 2], aggregate_by=None, chobs_format='long')
+    chobs = dv.wikipedia(_id=1, aggregate_by=None, chobs_format='long')
+
+    assert df.columns[0] == 'politician_id'
+    assert df['politician_id'].value_counts().to_dict() == {1: len(chobs), 2: len(chobs)}
+
+
+def test_dataview_batch_empty(dv):
+    df = dv.batch('posts_by', [])
+
+    assert df.empty and list(df.columns) == ['politician_id', 'date', 'posts']
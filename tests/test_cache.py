@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+from smm_wrapper import SMMAPI, SQLiteCache, Recorder
+from smm_wrapper.mockserver import MockServer
+
+
+def test_hit(server, tmp_path):
+    cache = SQLiteCache(path=str(tmp_path / 'responses.sqlite'))
+    api = SMMAPI(domain=server.domain, unit='politicians', cache=cache)
+
+    first = api.get_all()
+    assert api.get_all() == first
+    assert server.requests == 1
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'revalidations': 0}
+
+
+def test_persistent(server, tmp_path):
+    path = str(tmp_path / 'responses.sqlite')
+    first = SMMAPI(domain=server.domain, unit='politicians', cache=SQLiteCache(path=path)).get_one(1)
+
+    cache = SQLiteCache(path=path)
+    assert SMMAPI(domain=server.domain, unit='politicians', cache=cache).get_one(1) == first
+    assert server.requests == 1 and cache.hits == 1
+
+
+def test_revalidation(server, tmp_path):
+    # stale at once: every request is sent again, with the ETag of the stored response
+    cache = SQLiteCache(path=str(tmp_path / 'responses.sqlite'), default_ttl=0)
+    recorder = Recorder()
+    api = SMMAPI(domain=server.domain, unit='politicians', cache=cache, instrumentation=recorder)
+
+    first = api.tweets_by(_id=1)
+    second = api.tweets_by(_id=1)
+
+    assert second == first
+    assert server.requests == 2
+    assert cache.stats() == {'hits': 0, 'misses': 1, 'revalidations': 1}
+    assert [fields['outcome'] for name, fields in recorder.events if name == 'cache'] == ['miss', 'revalidated']
+    assert [fields['status'] for name, fields in recorder.events if name == 'request_end'] == [200, 304]
+
+
+def test_errors_not_stored(tmp_path):
+    cache = SQLiteCache(path=str(tmp_path / 'responses.sqlite'))
+    with MockServer(error_rate=1.0, error_status=404) as server:
+        api = SMMAPI(domain=server.domain, unit='politicians', cache=cache)
+        with pytest.raises(Exception):
+            api.get_all()
+
+    assert cache.get(cache.key(api.get_all_route()[0])) is None
+
+
+def test_eviction(tmp_path):
+    cache = SQLiteCache(path=str(tmp_path / 'responses.sqlite'), max_size=3000)
+    for i in range(4):
+        cache.set(f'key{i}', 'x' * 1000, 'all')
+
+    assert cache.get('key0') is None
+    assert cache.get('key3').value == 'x' * 1000
+
+
+def test_counters_thread_safe(tmp_path):
+    cache = SQLiteCache(path=str(tmp_path / 'responses.sqlite'))
+    cache.set('key', {'values': []}, 'all')
+
+    def lookups():
+        for _ in range(200):
+            cache.lookup('key')
+
+    threads = [threading.Thread(target=lookups) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.stats()['hits'] == 1600
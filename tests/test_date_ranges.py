@@ -0,0 +1,63 @@
+import datetime
+
+import pytest
+
+from smm_wrapper import SMMAPI, DateRangeCache
+from smm_wrapper import cache
+
+
+@pytest.fixture
+def plain(server):
+    return SMMAPI(domain=server.domain, unit='politicians', coalesce=False)
+
+
+def test_date_ranges(server, plain):
+    api = SMMAPI(domain=server.domain, unit='politicians', date_ranges=DateRangeCache())
+
+    def check(aggregate_by, from_date, to_date, requests):
+        before = server.requests
+        response = api.tweets_by(_id=1, from_date=from_date, to_date=to_date, aggregate_by=aggregate_by)
+        assert server.requests - before == requests
+        assert response == plain.tweets_by(_id=1, from_date=from_date, to_date=to_date, aggregate_by=aggregate_by)
+
+    check('day', '2018-01-01', '2018-06-30', 1)
+    check('day', '2018-02-01', '2018-03-15', 0)
+    check('day', '2017-12-01', '2018-07-31', 2)
+    check('month', '2018-01-01', '2018-12-31', 1)
+    check('month', '2018-03-01', '2018-05-31', 0)
+    # cuts the bucket of March: sent as it is
+    check('month', '2018-03-15', '2018-05-31', 1)
+    assert api.date_ranges.stats() == {'hits': 2, 'partial': 1, 'misses': 2}
+
+
+def test_interval(monkeypatch):
+    monkeypatch.setattr(cache, '_today', lambda: datetime.date(2018, 6, 30))
+    interval = DateRangeCache.interval
+
+    assert interval({'aggregate_by': 'day', 'from_date': '2018-01-01'}) == (
+        datetime.date(2018, 1, 1), datetime.date(2018, 6, 30))
+    assert interval({'aggregate_by': 'month', 'to_date': '2030-12-31'}) == (
+        datetime.date.min, datetime.date(2018, 6, 30))
+    # the current bucket is incomplete
+    assert interval({'aggregate_by': 'week', 'from_date': '2018-06-04'}) is None
+    assert interval({'aggregate_by': 'day', 'from_date': '2018-07-01'}) is None
+    assert interval({'aggregate_by': 'month', 'from_date': '2018-01-15', 'to_date': '2018-03-31'}) is None
+    assert interval({'aggregate_by': None, 'from_date': '2018-01-01'}) is None
+    assert interval({'aggregate_by': 'day', 'from_date': '2018-02-30'}) is None
+
+
+def test_open_end(server, plain, monkeypatch):
+    # the days after today are downloaded when they come, not taken as covered
+    api = SMMAPI(domain=server.domain, unit='politicians', date_ranges=DateRangeCache())
+
+    monkeypatch.setattr(cache, '_today', lambda: datetime.date(2018, 6, 30))
+    assert api.tweets_by(_id=1, from_date='2018-01-01', aggregate_by='day') == plain.tweets_by(
+        _id=1, from_date='2018-01-01', to_date='2018-06-30', aggregate_by='day')
+
+    monkeypatch.setattr(cache, '_today', lambda: datetime.date(2018, 12, 31))
+    before = server.requests
+    assert api.tweets_by(_id=1, from_date='2018-01-01', aggregate_by='day') == plain.tweets_by(
+        _id=1, from_date='2018-01-01', to_date='2018-12-31', aggregate_by='day')
+    assert server.requests - before == 2
+    assert api.date_ranges.stats() == {'hits': 0, 'partial': 1, 'misses': 1}
+
@@ -0,0 +1,50 @@
+import importlib.util
+
+import pytest
+
+from smm_wrapper import SMMAPI
+from smm_wrapper.decoders import DECODERS, get_decoder
+
+
+BODY = '{"labels": ["2018-01-01"], "values": [1, 2.5, -3], "text": "é\\u00fc", "none": null}'.encode('utf-8')
+
+INSTALLED = [name for name in DECODERS if name == 'json' or importlib.util.find_spec(name) is not None]
+
+
+@pytest.mark.parametrize('name', INSTALLED)
+def test_same_result(name):
+    assert get_decoder(name)(BODY) == get_decoder('json')(BODY)
+
+
+def test_default_is_fastest_installed():
+    assert get_decoder()(BODY) == get_decoder(INSTALLED[0])(BODY)
+    if INSTALLED[0] == 'json':
+        assert get_decoder() is get_decoder('json')
+
+
+def test_callable():
+    decode = lambda content: {'decoded': len(content)}
+    assert get_decoder(decode) is decode
+
+
+def test_unknown():
+    with pytest.raises(ValueError):
+        get_decoder('ujson')
+
+
+@pytest.mark.parametrize('name', [name for name in DECODERS if name not in INSTALLED])
+def test_not_installed(name):
+    with pytest.raises(ImportError):
+        get_decoder(name)
+
+
+def test_api_decoder(server):
+    calls = []
+
+    def decode(content):
+        calls.append(len(content))
+        return get_decoder('json')(content)
+
+    api = SMMAPI(domain=server.domain, unit='politicians', json_decoder=decode)
+    assert api.get_one(1) == SMMAPI(domain=server.domain, unit='politicians', json_decoder='json').get_one(1)
+    assert len(calls) == 1
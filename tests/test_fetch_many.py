@@ -0,0 +1,63 @@
+import pytest
+import requests
+
+from smm_wrapper import SMMAPI, SMMPoliticians, RetryPolicy
+from smm_wrapper.mockserver import MockServer
+
+
+IDS = [5, 3, 9, 1, 7, 2, 8, 4, 6, 10]
+
+
+def test_fetch_many_order():
+    # a random latency makes the requests finish out of order
+    with MockServer(latency=(0.0, 0.02), seed=0) as server:
+        api = SMMAPI(domain=server.domain, unit='politicians', max_workers=4)
+        expected = [api.get_one(_id) for _id in IDS]
+
+        assert api.fetch_many('get_one', IDS) == expected
+        assert [entity['politician_id'] for entity in api.fetch_many('get_one', IDS)] == IDS
+
+
+def test_fetch_many_as_completed(api):
+    results = dict(api.fetch_many('tweets_by', IDS, ordered=False, aggregate_by='year'))
+
+    assert sorted(results) == sorted(IDS)
+    assert all(result['aggregated_by'] == 'year' for result in results.values())
+
+
+def test_fetch_many_filters(api):
+    results = api.fetch_many('tweets_by', [1, 2], from_date='2019-01-01', aggregate_by='month')
+
+    assert [result['labels'][0] for result in results] == ['2019-01-01', '2019-01-01']
+
+
+def test_fetch_many_unknown_endpoint(api):
+    with pytest.raises(ValueError):
+        api.fetch_many('all_search', IDS)
+
+
+def test_fetch_many_error():
+    with MockServer(error_rate=1.0, error_status=404) as server:
+        api = SMMAPI(domain=server.domain, unit='politicians')
+        with pytest.raises(requests.HTTPError):
+            api.fetch_many('tweets_by', IDS)
+        with pytest.raises(requests.HTTPError):
+            dict(api.fetch_many('tweets_by', IDS, ordered=False))
+
+
+def test_fetch_many_retried_errors():
+    with MockServer(error_rate=0.3, seed=1) as server:
+        api = SMMAPI(domain=server.domain, unit='politicians',
+                     retry=RetryPolicy(attempts=10, backoff_factor=0.001, max_backoff=0.01))
+        results = api.fetch_many('get_one', IDS)
+
+    assert server.errors > 0
+    assert [entity['politician_id'] for entity in results] == IDS
+
+
+def test_dataview_fetch_many(server):
+    dv = SMMPoliticians(domain=server.domain).dv
+    frames = dv.fetch_many('tweets_by', [2, 1], aggregate_by='year')
+
+    assert len(frames) == 2
+    assert list(frames[1]['tweets']) == list(dv.tweets_by(_id=1, aggregate_by='year')['tweets'])
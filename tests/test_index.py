@@ -0,0 +1,49 @@
+import pytest
+
+from smm_wrapper import SMMAPI, EntityIndex
+
+
+@pytest.fixture
+def apis(server):
+    return (SMMAPI(domain=server.domain, unit='politicians'), SMMAPI(domain=server.domain, unit='organizations'))
+
+
+@pytest.fixture
+def index(apis):
+    return EntityIndex.from_api(*apis)
+
+
+def test_lookups(index, apis):
+    politicians, organizations = (api.get_all() for api in apis)
+    politician, organization = politicians[0], organizations[0]
+
+    assert index.by_twitter_id(politician['tw_ids'][0]) == [('politicians', politician['politician_id'])]
+    assert index.by_twitter_id(str(politician['tw_ids'][0]), unit='politicians') == \
+        [('politicians', politician['politician_id'])]
+    assert index.by_twitter_id(politician['tw_ids'][0], unit='organizations') == []
+    assert index.by_facebook_id(organization['fb_ids'][0]) == [('organizations', organization['organization_id'])]
+    assert index.by_wikipedia_id(politician['wp_ids'][0]) == [('politicians', politician['politician_id'])]
+    assert index.by_twitter_screen_name(politician['tw_sns'][0].upper()) == \
+        [('politicians', politician['politician_id'])]
+    title = organization['wp_titles'][0]
+    assert index.by_wikipedia_title(title.lower(), unit='organizations') == \
+        [('organizations', entity['organization_id']) for entity in organizations if title in entity['wp_titles']]
+    assert index.by_twitter_id(-1) == []
+    assert index.entities[('politicians', politician['politician_id'])] == politician
+
+
+@pytest.mark.parametrize('text', ['vorlage', 'Sophie', 'abbild6', 'SPD', 'zz', 'nobody'])
+def test_search(index, apis, text):
+    politicians, _ = apis
+    expected = sorted(politicians.all_search(names_contain=text), key=lambda entity: entity['politician_id'])
+
+    assert index.search(text, unit='politicians') == expected
+
+
+def test_save_load(index, tmp_path):
+    path = str(tmp_path / 'index.pickle')
+    index.save(path)
+    loaded = EntityIndex.load(path)
+
+    assert loaded.entities == index.entities
+    assert loaded.search('vorlage') == index.search('vorlage')
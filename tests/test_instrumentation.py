@@ -0,0 +1,38 @@
+import pytest
+
+from smm_wrapper import SMMAPI, Recorder, PrometheusInstrumentation
+from smm_wrapper.instrumentation import RequestMetrics
+from smm_wrapper.mockserver import MockServer
+
+
+def test_recorder_summary():
+    recorder = Recorder()
+    with MockServer() as server:
+        api = SMMAPI(domain=server.domain, unit='politicians', instrumentation=recorder)
+        api.tweets_by(_id=1)
+        list(api.wikipedia(_id=1, aggregate_by=None, stream=True))
+
+    summary = recorder.summary()
+    assert summary['requests'] == 2
+    assert summary['bytes'] > 0
+    assert [name for name, _ in recorder.events].count('decode') == 1
+
+
+def test_prometheus_streamed_request():
+    prometheus_client = pytest.importorskip('prometheus_client')
+    registry = prometheus_client.CollectorRegistry()
+    instrumentation = PrometheusInstrumentation(registry=registry)
+
+    # a streamed response has a ttfb but no download time, its body is read by the caller
+    instrumentation.request_end(RequestMetrics('http://host/api/politicians/wikipedia/chobs/', 'wikipedia', 0, 200,
+                                               None, 0.2, 0.1, None, None, None))
+
+    with MockServer() as server:
+        api = SMMAPI(domain=server.domain, unit='politicians', instrumentation=instrumentation)
+        list(api.wikipedia(_id=1, aggregate_by=None, stream=True))
+        api.tweets_by(_id=1)
+
+    assert registry.get_sample_value('smm_request_seconds_count',
+                                     {'family': 'wikipedia', 'status': '200', 'phase': 'ttfb'}) == 2
+    assert registry.get_sample_value('smm_request_seconds_count',
+                                     {'family': 'twitter', 'status': '200', 'phase': 'download'}) == 1
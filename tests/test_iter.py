@@ -0,0 +1,95 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from smm_wrapper import SMMPoliticians
+from smm_wrapper.api import _windows
+
+
+@pytest.fixture
+def dv(server):
+    return SMMPoliticians(domain=server.domain).dv
+
+
+def test_windows():
+    assert _windows('2018-01-01', '2018-01-10', 4) == [
+        ('2018-01-01', '2018-01-04'), ('2018-01-05', '2018-01-08'), ('2018-01-09', '2018-01-10')]
+    # 2018-01-03 is a Wednesday, the calendar windows end on a Sunday, the end of a month and of a year
+    assert _windows('2018-01-03', '2018-01-16', 'week') == [
+        ('2018-01-03', '2018-01-07'), ('2018-01-08', '2018-01-14'), ('2018-01-15', '2018-01-16')]
+    assert _windows('2018-11-15', '2019-01-31', 'month') == [
+        ('2018-11-15', '2018-11-30'), ('2018-12-01', '2018-12-31'), ('2019-01-01', '2019-01-31')]
+    assert _windows('2017-06-01', '2018-03-01', 'year') == [('2017-06-01', '2017-12-31'), ('2018-01-01', '2018-03-01')]
+    assert _windows('2018-01-02', '2018-01-01', 1) == []
+    assert _windows(datetime.date.today().isoformat(), None, 1)[-1][1] == datetime.date.today().isoformat()
+
+
+@pytest.mark.parametrize('window', [0, -1, 1.5, True, 'day', None])
+def test_invalid_windows(window):
+    with pytest.raises(ValueError):
+        _windows('2018-01-01', '2018-12-31', window)
+
+
+def test_iter_pages_windows(dv):
+    pages = list(dv.api.iter_pages('tweets_by', window='month', _id=1, from_date='2018-01-01',
+                                   to_date='2018-12-31', aggregate_by='day'))
+    whole = dv.api.tweets_by(_id=1, from_date='2018-01-01', to_date='2018-12-31', aggregate_by='day')
+
+    assert len(pages) == 12
+    assert [label for page in pages for label in page['labels']] == whole['labels']
+    assert [value for page in pages for value in page['values']] == whole['values']
+
+
+def test_iter_pages_without_window(dv):
+    assert list(dv.api.iter_pages('posts_by', _id=2, aggregate_by='year')) == \
+        [dv.api.posts_by(_id=2, aggregate_by='year')]
+
+
+def test_iter_pages_invalid(dv):
+    # raised when called, not when iterated
+    with pytest.raises(ValueError):
+        dv.api.iter_pages('get_all')
+    with pytest.raises(ValueError):
+        dv.api.iter_pages('tweets_by', window='month', _id=1)
+    with pytest.raises(ValueError):
+        dv.api.iter_pages('tweets_by', window=0, _id=1, from_date='2018-01-01')
+
+
+def test_next_links(dv, monkeypatch):
+    # paginated responses are followed in order
+    pages = {'page2': {'results': [3, 4], 'next': 'page3'}, 'page3': {'results': [5], 'next': None}}
+    monkeypatch.setattr(dv.api, 'request', lambda url, *args, **kwargs: pages[url])
+    first = lambda **query: {'results': [query['n'], 2], 'next': 'page2'}
+
+    responses = list(dv.api._follow(first, [{'n': 1}], prefetch=2))
+    assert [response['results'] for _, response in responses] == [[1, 2], [3, 4], [5]]
+    assert [query for query, _ in responses] == [{'n': 1}] * 3
+
+
+def test_iter_frames_windows(dv):
+    frames = list(dv.iter_frames('tweets_by', window='month', _id=1, from_date='2018-01-01', to_date='2018-03-31',
+                                 aggregate_by='day'))
+
+    assert [(frame['from_date'].iloc[0], frame['to_date'].iloc[0]) for frame in frames] == [
+        ('2018-01-01', '2018-01-31'), ('2018-02-01', '2018-02-28'), ('2018-03-01', '2018-03-31')]
+    assert frames[1].attrs['query'] == {'_id': 1, 'from_date': '2018-02-01', 'to_date': '2018-02-28'}
+
+    whole = dv.tweets_by(_id=1, from_date='2018-01-01', to_date='2018-03-31', aggregate_by='day')
+    pd.testing.assert_frame_equal(pd.concat(frames, ignore_index=True)[['date', 'tweets']], whole[['date', 'tweets']])
+
+
+def test_iter_frames_without_window(dv):
+    frames = list(dv.iter_frames('comments_by', _id=1, from_date='2018-01-01', aggregate_by='month'))
+
+    assert len(frames) == 1
+    pd.testing.assert_frame_equal(frames[0], dv.comments_by(_id=1, from_date='2018-01-01', aggregate_by='month'))
+
+
+def test_iter_frames_chobs(dv):
+    frames = list(dv.iter_frames('wikipedia', window='year', _id=1, from_date='2018-01-01', to_date='2019-12-31',
+                                 aggregate_by=None))
+
+    assert len(frames) == 2
+    # the chobs are numbered across the windows
+    assert frames[1].index[0] == len(frames[0])
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+import requests
+
+from smm_wrapper import SMMPoliticians, FrameMemo
+
+
+def test_memo_copies(server):
+    memo = FrameMemo()
+    dv = SMMPoliticians(domain=server.domain, memo=memo).dv
+
+    df = dv.get_all()
+    df.iloc[0, 0] = 'changed'
+    df.iloc[0]['tw_ids'].append(999)
+    entity = dv.get_one(1)
+    entity['tw_ids'].append(999)
+
+    assert dv.get_all().iloc[0, 0] != 'changed'
+    assert 999 not in dv.get_all().iloc[0]['tw_ids']
+    assert 999 not in dv.get_one(1)['tw_ids']
+    assert server.requests == 2
+    assert memo.hits == 3
+
+
+def test_memo_arguments(server):
+    # the same call, with the arguments given positionally, by name or as defaults
+    memo = FrameMemo()
+    dv = SMMPoliticians(domain=server.domain, memo=memo).dv
+
+    first = dv.tweets_by(None, 1)
+    assert dv.tweets_by(_id=1).equals(first)
+    assert dv.tweets_by(_id=1, aggregate_by='month').equals(first)
+    dv.tweets_by(_id=1, aggregate_by='year')
+    assert memo.stats()['hits'] == 2 and memo.stats()['misses'] == 2
+    assert server.requests == 2
+
+
+def test_memo_bounds(server):
+    dv = SMMPoliticians(domain=server.domain).dv
+    size = int(dv.tweets_by(_id=1, aggregate_by='day').memory_usage(deep=True).sum())
+    memo = FrameMemo(max_bytes=int(2.5 * size), ttl=0.2)
+    dv.memo = memo
+
+    for _id in range(1, 6):
+        dv.tweets_by(_id=_id, aggregate_by='day')
+    assert memo.stats()['frames'] == 2 and memo.evictions == 3
+
+    dv.tweets_by(_id=5, aggregate_by='day')
+    assert memo.hits == 1
+    time.sleep(0.25)
+    dv.tweets_by(_id=5, aggregate_by='day')
+    assert memo.hits == 1
+
+
+def test_memo_clear(server):
+    memo = FrameMemo()
+    dv = SMMPoliticians(domain=server.domain, memo=memo).dv
+
+    dv.get_all()
+    memo.clear()
+    assert memo.stats()['frames'] == 0 and memo.stats()['bytes'] == 0
+    dv.get_all()
+    assert server.requests == 2
+
+
+def test_memo_errors_not_stored(server):
+    memo = FrameMemo()
+    dv = SMMPoliticians(domain=server.domain, memo=memo).dv
+
+    with pytest.raises(requests.HTTPError):
+        dv.tweets_by(_id=1, aggregate_by='hour')
+    assert memo.stats()['frames'] == 0
@@ -0,0 +1,74 @@
+import os
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl
+
+import pytest
+import requests
+
+from smm_wrapper import SMMAPI
+from smm_wrapper.mockserver import MockServer
+
+
+class _Upstream(BaseHTTPRequestHandler):
+
+    """An API that requires an api_key and basic auth, and answers /api/politicians/broken/ with HTML
+    """
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        if params.get('api_key') != 'secret' or 'Authorization' not in self.headers:
+            status, content, data = 401, 'application/json', b'{"detail": "Authentication required."}'
+        elif url.path == '/api/politicians/broken/':
+            status, content, data = 502, 'text/html', b'<html>Bad Gateway</html>'
+        else:
+            status, content, data = 200, 'application/json', json.dumps([{'politician_id': 1}]).encode()
+
+        self.send_response(status)
+        self.send_header('Content-Type', content)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def upstream():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Upstream)
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+    yield 'http://127.0.0.1:{}'.format(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+def test_fixtures():
+    with MockServer() as server:
+        api = SMMAPI(domain=server.domain, unit='politicians')
+        entities = api.get_all()
+        assert api.get_one(entities[0]['politician_id']) == entities[0]
+        series = api.tweets_by(_id=1, from_date='2018-01-01', to_date='2018-12-31', aggregate_by='month')
+        assert series['labels'][0] == '2018-01-01' and len(series['labels']) == 12
+        assert api.wikipedia(_id=1, aggregate_by=None)['chobs']
+
+
+def test_record_and_replay(upstream, tmp_path):
+    with MockServer(fixtures=str(tmp_path), record=upstream) as server:
+        api = SMMAPI(domain=server.domain, unit='politicians', username='user', password='pass', api_key='secret')
+        assert api.get_all() == [{'politician_id': 1}]
+        response = requests.get(f'http://{server.domain}/api/politicians/broken/', params={'api_key': 'secret'},
+                                auth=('user', 'pass'))
+        assert response.status_code == 502
+        assert response.json() == {'detail': '<html>Bad Gateway</html>'}
+
+    recorded = [json.load(open(os.path.join(tmp_path, name))) for name in os.listdir(tmp_path)]
+    assert len(recorded) == 2
+    assert all('secret' not in json.dumps(record) for record in recorded)
+
+    # replayed without the upstream, whatever the api_key
+    with MockServer(fixtures=str(tmp_path)) as server:
+        assert SMMAPI(domain=server.domain, unit='politicians').get_all() == [{'politician_id': 1}]
+        assert requests.get(f'http://{server.domain}/api/politicians/broken/').status_code == 502
@@ -0,0 +1,108 @@
+import time
+import asyncio
+import threading
+
+from smm_wrapper import SMMAPI, TokenBucket, AIMDConcurrency, RetryPolicy
+from smm_wrapper.mockserver import MockServer
+
+
+def test_burst_then_rate():
+    bucket = TokenBucket(rate=50, burst=5)
+
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.05
+
+    for _ in range(10):
+        bucket.acquire()
+    assert 0.15 < time.monotonic() - start < 0.4
+
+
+def test_acquire_async():
+    bucket = TokenBucket(rate=50, burst=1)
+
+    async def run():
+        await asyncio.gather(*[bucket.acquire_async() for _ in range(6)])
+
+    start = time.monotonic()
+    asyncio.run(run())
+    assert 0.08 < time.monotonic() - start < 0.3
+
+
+def test_shared_bucket(server):
+    # two clients sharing a bucket stay under its rate together
+    bucket = TokenBucket(rate=40, burst=1)
+    politicians = SMMAPI(domain=server.domain, unit='politicians', rate_limiter=bucket)
+    organizations = SMMAPI(domain=server.domain, unit='organizations', rate_limiter=bucket)
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=api.fetch_many, args=('get_one', range(1, 5)))
+               for api in (politicians, organizations)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert server.requests == 8
+    assert time.monotonic() - start > 7 / 40 - 0.02
+
+
+def test_aimd_increase_and_decrease():
+    concurrency = AIMDConcurrency(initial=4, min_limit=2, max_limit=5, latency_target=1.0)
+
+    # one more request per window of limit successful requests
+    for _ in range(4):
+        concurrency.acquire()
+        concurrency.release(0.1)
+    assert 4.9 < concurrency.limit < 5
+    for _ in range(4):
+        concurrency.acquire()
+        concurrency.release(0.1)
+    assert concurrency.limit == 5
+
+    concurrency.acquire()
+    concurrency.release(0.1, overloaded=True)
+    assert concurrency.limit == 2.5
+    concurrency.acquire()
+    concurrency.release(0.1, overloaded=True)
+    assert concurrency.limit == 2
+
+    # slow requests neither increase nor decrease the limit
+    concurrency.acquire()
+    concurrency.release(2.0)
+    assert concurrency.limit == 2 and concurrency.in_flight == 0
+
+
+def test_aimd_limits_in_flight():
+    concurrency = AIMDConcurrency(initial=2, max_limit=2)
+    in_flight = []
+    lock = threading.Lock()
+
+    def request():
+        concurrency.acquire()
+        with lock:
+            in_flight.append(concurrency.in_flight)
+        time.sleep(0.02)
+        concurrency.release(0.02)
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(in_flight) == 2
+
+
+def test_aimd_backs_off_on_errors():
+    concurrency = AIMDConcurrency(initial=8)
+    with MockServer(error_rate=1.0, error_status=503) as server:
+        api = SMMAPI(domain=server.domain, unit='politicians', concurrency=concurrency,
+                     retry=RetryPolicy(attempts=2, max_backoff=0.01))
+        try:
+            api.get_all()
+        except Exception:
+            pass
+
+    assert concurrency.limit == 1 and concurrency.in_flight == 0
@@ -0,0 +1,68 @@
+import pytest
+
+from smm_wrapper import SMMPoliticians, Reaggregator
+
+
+@pytest.fixture
+def dv(server):
+    return SMMPoliticians(domain=server.domain).dv
+
+
+def test_reaggregator(server, dv):
+    reaggregator = Reaggregator(dv)
+
+    reaggregator.tweets_by(_id=1, aggregate_by='day')
+    before = server.requests
+    for aggregate_by in ('week', 'month', 'year'):
+        assert reaggregator.tweets_by(_id=1, aggregate_by=aggregate_by).equals(
+            dv.tweets_by(_id=1, aggregate_by=aggregate_by))
+    # one request per DataView call, none for the Reaggregator
+    assert server.requests - before == 3
+
+
+def test_reaggregator_filters(server, dv):
+    reaggregator = Reaggregator(dv)
+    query = {'_id': 2, 'from_date': '2018-01-01', 'to_date': '2018-12-31'}
+
+    assert reaggregator.posts_by(aggregate_by='month', **query).equals(dv.posts_by(aggregate_by='month', **query))
+    assert reaggregator.posts_by(aggregate_by='year', **query).equals(dv.posts_by(aggregate_by='year', **query))
+    # another query is another series
+    before = server.requests
+    reaggregator.posts_by(_id=3, aggregate_by='year')
+    assert server.requests - before == 1
+
+
+def test_reaggregator_passed_through(server, dv):
+    # raw chobs and the aggregations coarser than finest are asked to the DataView
+    reaggregator = Reaggregator(dv, finest='month')
+
+    assert reaggregator.wikipedia(_id=1, aggregate_by=None).equals(dv.wikipedia(_id=1, aggregate_by=None))
+    before = server.requests
+    assert reaggregator.tweets_by(_id=1, aggregate_by='week').equals(dv.tweets_by(_id=1, aggregate_by='week'))
+    assert server.requests - before == 2
+
+
+def test_reaggregator_copies(dv):
+    reaggregator = Reaggregator(dv)
+
+    df = reaggregator.tweets_by(_id=1, aggregate_by='month')
+    df.loc[0, 'tweets'] = -1
+    assert reaggregator.tweets_by(_id=1, aggregate_by='month').loc[0, 'tweets'] != -1
+
+
+def test_reaggregator_max_series(server, dv):
+    reaggregator = Reaggregator(dv, max_series=2)
+
+    for _id in (1, 2, 3):
+        reaggregator.tweets_by(_id=_id, aggregate_by='month')
+    before = server.requests
+    reaggregator.tweets_by(_id=3, aggregate_by='year')
+    reaggregator.tweets_by(_id=1, aggregate_by='year')
+    assert server.requests - before == 1
+
+
+def test_reaggregator_errors(dv):
+    with pytest.raises(ValueError, match='finest'):
+        Reaggregator(dv, finest='hour')
+    with pytest.raises(ValueError, match='endpoint'):
+        Reaggregator(dv).get('get_all')
@@ -0,0 +1,89 @@
+import time
+import email.utils
+
+import pytest
+import requests
+
+from smm_wrapper import SMMAPI, RetryPolicy
+from smm_wrapper.mockserver import MockServer
+
+
+def _response(status: int, **headers) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers)
+    return response
+
+
+def _error(status: int, **headers) -> requests.HTTPError:
+    return requests.HTTPError(response=_response(status, **headers))
+
+
+def test_is_retryable():
+    policy = RetryPolicy()
+
+    assert policy.is_retryable(_error(503))
+    assert policy.is_retryable(_error(429))
+    assert not policy.is_retryable(_error(404))
+    assert policy.is_retryable(requests.ConnectionError())
+    assert policy.is_retryable(requests.Timeout())
+    assert not policy.is_retryable(ValueError())
+
+
+def test_backoff():
+    policy = RetryPolicy(backoff_factor=0.5, max_backoff=3, jitter=False)
+
+    assert [policy.backoff(attempt) for attempt in range(4)] == [0.5, 1, 2, 3]
+
+
+def test_retry_after():
+    policy = RetryPolicy(backoff_factor=0.5, max_backoff=30, jitter=False)
+
+    assert policy.backoff(0, _response(503, **{'Retry-After': '7'})) == 7
+    date = email.utils.formatdate(time.time() + 20, usegmt=True)
+    assert 15 < policy.backoff(0, _response(503, **{'Retry-After': date})) <= 20
+    assert policy.backoff(0, _response(503, **{'Retry-After': 'soon'})) == 0.5
+    assert RetryPolicy(max_backoff=2).backoff(0, _response(429, **{'Retry-After': '60'})) == 2
+    assert RetryPolicy(respect_retry_after=False, jitter=False).backoff(
+        0, _response(503, **{'Retry-After': '60'})) == 0.5
+
+
+def test_retried_until_attempts():
+    # the mock server answers 503 with Retry-After: 1, capped by max_backoff
+    with MockServer(error_rate=1.0, error_status=503) as server:
+        api = SMMAPI(domain=server.domain, unit='politicians', retry=RetryPolicy(attempts=3, max_backoff=0.01))
+        start = time.monotonic()
+        with pytest.raises(requests.HTTPError):
+            api.get_all()
+
+    assert server.requests == 4
+    assert time.monotonic() - start < 1
+
+
+def test_not_retried():
+    with MockServer(error_rate=1.0, error_status=404) as server:
+        api = SMMAPI(domain=server.domain, unit='politicians', retry=RetryPolicy(attempts=3, max_backoff=0.01))
+        with pytest.raises(requests.HTTPError):
+            api.get_all()
+
+    assert server.requests == 1
+
+
+def test_retry_then_success():
+    with MockServer(error_rate=0.5, seed=3) as server:
+        api = SMMAPI(domain=server.domain, unit='politicians', retry=RetryPolicy(attempts=20, max_backoff=0.01))
+        entities = [api.get_one(_id) for _id in range(1, 11)]
+
+    assert server.errors > 0
+    assert [entity['politician_id'] for entity in entities] == list(range(1, 11))
+
+
+def test_retries_logged(caplog, capsys):
+    with MockServer(error_rate=1.0, error_status=503) as server:
+        api = SMMAPI(domain=server.domain, unit='politicians', retry=RetryPolicy(attempts=2, max_backoff=0.01))
+        with caplog.at_level('WARNING', logger='smm_wrapper.api'), pytest.raises(requests.HTTPError):
+            api.get_all()
+
+    assert capsys.readouterr().out == ''
+    assert [record.getMessage().split(': ')[0].split(' failed ')[1] for record in caplog.records] == \
+        ['(attempt 1 of 3)', '(attempt 2 of 3)']
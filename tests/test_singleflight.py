@@ -0,0 +1,79 @@
+import time
+import threading
+
+from smm_wrapper import SMMAPI, SingleFlight
+from smm_wrapper.mockserver import MockServer
+
+
+def _concurrently(n, target):
+    """Run target in n threads started together, returns their results
+    """
+    barrier = threading.Barrier(n)
+    results = [None] * n
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = target()
+        except Exception as exc:
+            results[i] = exc
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_coalesced():
+    flights = SingleFlight()
+    calls = []
+
+    def call():
+        calls.append(1)
+        time.sleep(0.1)
+        return {'values': [1, 2]}
+
+    results = _concurrently(5, lambda: flights.do('key', call))
+
+    assert len(calls) == 1 and flights.shared == 4
+    assert all(result == {'values': [1, 2]} for result in results)
+    # every caller gets its own copy
+    assert len({id(result) for result in results}) == 5
+    assert len({id(result['values']) for result in results}) == 5
+
+
+def test_not_cached():
+    flights = SingleFlight()
+    calls = []
+
+    flights.do('key', lambda: calls.append(1))
+    flights.do('key', lambda: calls.append(1))
+    assert len(calls) == 2 and flights.shared == 0
+
+
+def test_error_shared():
+    flights = SingleFlight()
+
+    def call():
+        time.sleep(0.1)
+        raise ValueError('failed')
+
+    results = _concurrently(3, lambda: flights.do('key', call))
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flights.do('key', lambda: 'next') == 'next'
+
+
+def test_api_coalesces():
+    with MockServer(latency=0.1) as server:
+        api = SMMAPI(domain=server.domain, unit='politicians')
+        results = _concurrently(4, lambda: api.tweets_by(_id=1))
+
+        assert server.requests == 1
+        assert all(result == results[0] for result in results)
+        assert api.flights.shared == 3
+
+        api = SMMAPI(domain=server.domain, unit='politicians', coalesce=False)
+        _concurrently(4, lambda: api.tweets_by(_id=1))
+        assert server.requests == 5 and api.flights is None
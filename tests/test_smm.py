@@ -0,0 +1,30 @@
+import sys
+import subprocess
+
+import pytest
+
+from smm_wrapper import SMM, SMMPoliticians, SMMOrganizations
+
+
+@pytest.mark.parametrize('unit, id_column', [('politicians', 'politician_id'), ('organizations', 'organization_id')])
+def test_smm_dv(server, unit, id_column):
+    dv = SMM(domain=server.domain, unit=unit).dv
+
+    assert dv.id_column == id_column
+    assert dv.get_all().index.name == id_column
+
+
+def test_units(server):
+    assert SMMPoliticians(domain=server.domain).dv.id_column == 'politician_id'
+    assert SMMOrganizations(domain=server.domain).dv.id_column == 'organization_id'
+
+
+def test_lazy_imports():
+    # the api works without importing pandas, the DataView imports it on first use
+    code = ('import sys, smm_wrapper; '
+            'smm = smm_wrapper.SMMPoliticians(); smm.api.get_all_route(); '
+            'assert "pandas" not in sys.modules; '
+            'smm.dv; smm_wrapper.DataView; '
+            'assert "pandas" in sys.modules; '
+            'print(smm_wrapper.__version__)')
+    subprocess.run([sys.executable, '-c', code], check=True, capture_output=True)
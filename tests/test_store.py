@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from smm_wrapper import SMMPoliticians, ParquetStore
+
+
+@pytest.fixture
+def dv(server):
+    return SMMPoliticians(domain=server.domain).dv
+
+
+def test_round_trip(dv, tmp_path):
+    store = ParquetStore(str(tmp_path))
+    df = dv.tweets_by(_id=1, aggregate_by='day')
+    store.write(df, 'tweets_by', 'politicians')
+
+    read = store.read('tweets_by', 'politicians', entity=1)
+    assert list(read['entity'].unique()) == ['1'] and list(read['unit'].unique()) == ['politicians']
+    assert read['date'].tolist() == df['date'].tolist()
+    assert read['tweets'].tolist() == df['tweets'].tolist()
+
+
+def test_entities_not_overwritten(dv, tmp_path):
+    store = ParquetStore(str(tmp_path))
+    for _id in (1, 2):
+        store.write(dv.tweets_by(_id=_id, aggregate_by='month'), 'tweets_by', 'politicians')
+    store.write(dv.tweets_by(twitter_user_id=123, aggregate_by='month'), 'tweets_by', 'politicians')
+    store.write(dv.tweets_by(aggregate_by='month'), 'tweets_by', 'politicians')
+
+    read = store.read('tweets_by', 'politicians')
+    assert sorted(read['entity'].unique()) == ['1', '2', 'all', 'twitter_user_id-123']
+    assert len(store.read('tweets_by', entity=[1, 2])) == 2 * len(dv.tweets_by(_id=1, aggregate_by='month'))
+
+
+def test_unknown_entity(dv, tmp_path):
+    store = ParquetStore(str(tmp_path))
+    chobs = dv.wikipedia(_id=1, aggregate_by=None)
+
+    with pytest.raises(ValueError, match='query'):
+        store.write(chobs, 'wikipedia', 'politicians')
+
+    several = pd.concat([dv.tweets_by(_id=1), dv.tweets_by(_id=2)], ignore_index=True)
+    several.attrs['query'] = {}
+    with pytest.raises(ValueError, match='several _id'):
+        store.write(several, 'tweets_by', 'politicians')
+    with pytest.raises(ValueError, match='endpoint'):
+        store.write(dv.tweets_by(_id=1), 'get_all', 'politicians')
+
+    store.write(chobs, 'wikipedia', 'politicians', entity=1)
+    assert len(store.read('wikipedia', entity=1)) == len(chobs)
+
+
+def test_date_filter(dv, tmp_path):
+    store = ParquetStore(str(tmp_path), row_group_size=30)
+    df = dv.tweets_by(_id=1, aggregate_by='day')
+    store.write(df, 'tweets_by', 'politicians')
+
+    read = store.read('tweets_by', from_date='2018-03-01', to_date='2018-03-31', columns=['date', 'tweets'])
+    expected = df[(df['date'] >= '2018-03-01') & (df['date'] <= '2018-03-31')]
+    assert list(read.columns) == ['date', 'tweets']
+    assert read['tweets'].tolist() == expected['tweets'].tolist()
+
+
+def test_missing_endpoint(tmp_path):
+    assert ParquetStore(str(tmp_path)).read('posts_by').empty
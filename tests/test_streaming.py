@@ -0,0 +1,77 @@
+import json
+
+import pytest
+import requests
+
+from smm_wrapper import SMMAPI, RetryPolicy
+from smm_wrapper.mockserver import MockServer
+from smm_wrapper.streaming import iter_json_array
+
+
+PAYLOADS = [
+    [1, 2.5, -3, 1e10, 4.25e-3, 0, True, False, None],
+    {'response_type': 'raw', 'count': 12.5, 'values': [3.25, 4, -0.5e2], 'chobs': [{'a': 1}]},
+    {'chobs': [{'rev_id': 12345, 'ins_tokens': ['é', 'ü'], 'score': 0.75}, {'rev_id': 7, 'ins_tokens': []}]},
+    [],
+    {'labels': ['2017-01-01'], 'values': []},
+]
+
+
+def _expected(payload, key=None):
+    if isinstance(payload, list):
+        return payload
+    if key is not None:
+        return payload[key]
+    return next(value for value in payload.values() if isinstance(value, list))
+
+
+@pytest.mark.parametrize('payload', PAYLOADS)
+def test_every_split(payload):
+    data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    for offset in range(len(data) + 1):
+        assert list(iter_json_array([data[:offset], data[offset:]])) == _expected(payload)
+
+
+@pytest.mark.parametrize('payload', PAYLOADS)
+def test_byte_chunks(payload):
+    data = json.dumps(payload, ensure_ascii=False, indent=1).encode('utf-8')
+    assert list(iter_json_array(data[i:i + 1] for i in range(len(data)))) == _expected(payload)
+
+
+@pytest.mark.parametrize('chunks, expected', [
+    ([b'[1, 2.', b'5]'], [1, 2.5]),
+    ([b'[1e', b'10]'], [1e10]),
+    ([b'[12', b'34 ', b']'], [1234]),
+    ([b'{"values": [3.', b'25, 4]}'], [3.25, 4]),
+])
+def test_number_split(chunks, expected):
+    assert list(iter_json_array(chunks)) == expected
+
+
+def test_key():
+    data = json.dumps(PAYLOADS[1]).encode('utf-8')
+    for offset in range(len(data) + 1):
+        assert list(iter_json_array([data[:offset], data[offset:]], key='chobs')) == [{'a': 1}]
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'[1, 2.', b']']))
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'[1, 2']))
+
+
+def test_stream(api):
+    assert list(api.wikipedia(_id=1, aggregate_by=None, stream=True)) == \
+        api.wikipedia(_id=1, aggregate_by=None)['chobs']
+    assert list(api.get_all(stream=True)) == api.get_all()
+
+
+def test_failed_streams_release_connections():
+    # with a blocking pool of one connection, a leaked streamed response would block the next request
+    with MockServer(error_rate=1.0, error_status=404) as server:
+        api = SMMAPI(domain=server.domain, unit='politicians', max_workers=1, pool_block=True,
+                     retry=RetryPolicy(attempts=0, timeout=(1, 2)))
+        for _ in range(3):
+            with pytest.raises(requests.HTTPError):
+                list(api.wikipedia(_id=1, aggregate_by=None, stream=True))
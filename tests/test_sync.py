@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+from smm_wrapper import SMMPoliticians, IncrementalSync
+
+
+@pytest.fixture
+def dv(server):
+    return SMMPoliticians(domain=server.domain).dv
+
+
+@pytest.mark.parametrize('from_date', [None, '2018-01-01'])
+def test_sync_twice(dv, tmp_path, from_date):
+    sync = IncrementalSync(dv, str(tmp_path))
+    query = {'_id': 1, 'aggregate_by': 'day'}
+    if from_date is not None:
+        query['from_date'] = from_date
+
+    first = sync.sync('tweets_by', **query)
+    second = sync.sync('tweets_by', **query)
+    assert sync.tweets_by(_id=1, from_date=from_date, aggregate_by='day').equals(second)
+
+    expected = dv.tweets_by(_id=1, from_date=from_date, aggregate_by='day')
+    pd.testing.assert_frame_equal(first, expected)
+    pd.testing.assert_frame_equal(second, expected)
+    assert second.attrs == expected.attrs
+
+
+def test_only_new_buckets(dv, tmp_path, monkeypatch):
+    sync = IncrementalSync(dv, str(tmp_path), overlap='7D')
+    sync.sync('tweets_by', _id=1, aggregate_by='day')
+
+    calls = []
+    tweets_by = dv.tweets_by
+    monkeypatch.setattr(dv, 'tweets_by', lambda **query: calls.append(query) or tweets_by(**query))
+    sync.sync('tweets_by', _id=1, aggregate_by='day')
+
+    mark = sync.high_water_mark('tweets_by', _id=1, aggregate_by='day')
+    assert calls == [{'_id': 1, 'aggregate_by': 'day', 'from_date': (mark - pd.Timedelta('7D')).strftime('%Y-%m-%d')}]
+
+
+def test_late_buckets(dv, tmp_path):
+    # the stored series misses the last buckets, e.g. it was synced before they had data
+    sync = IncrementalSync(dv, str(tmp_path), overlap='60D')
+    stored = sync.sync('tweets_by', _id=1, aggregate_by='month')
+    path = sync._file('tweets_by', sync._query('tweets_by', {'_id': 1}))
+    truncated = stored.iloc[:-2].copy()
+    truncated.iloc[-1, truncated.columns.get_loc('tweets')] = -1
+    truncated.to_pickle(path)
+
+    pd.testing.assert_frame_equal(sync.sync('tweets_by', _id=1, aggregate_by='month'), stored)
+
+
+def test_high_water_mark(dv, tmp_path):
+    sync = IncrementalSync(dv, str(tmp_path))
+    assert sync.high_water_mark('wikipedia', _id=1) is None
+
+    df = sync.wikipedia(_id=1)
+    assert sync.high_water_mark('wikipedia', _id=1) == df['date'].max()
+    assert sync.high_water_mark('wikipedia', _id=1, aggregate_by='month') == df['date'].max()
+    assert sync.high_water_mark('wikipedia', _id=1, aggregate_by='year') is None
+
+
+def test_invalid(dv, tmp_path):
+    sync = IncrementalSync(dv, str(tmp_path))
+
+    with pytest.raises(ValueError):
+        sync.sync('get_all')
+    with pytest.raises(ValueError):
+        sync.sync('wikipedia', _id=1, aggregate_by=None)
+    with pytest.raises(ValueError):
+        sync.high_water_mark('wikipedia', _id=1, aggregate_by=None)
@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+from smm_wrapper import SMMPoliticians
+
+
+@pytest.fixture
+def dv(server):
+    return SMMPoliticians(domain=server.domain).dv
+
+
+def test_timeline(dv):
+    timeline = dv.timeline(1, sources=['tweets_by', 'posts_by', 'wikipedia'], freq='month')
+
+    assert timeline.index.name == 'date'
+    assert list(timeline.columns) == ['tweets', 'posts', 'chobs']
+    tweets = dv.tweets_by(_id=1, aggregate_by='month')
+    assert timeline.index.tolist() == tweets['date'].tolist()
+    assert timeline['tweets'].tolist() == tweets['tweets'].tolist()
+
+
+def test_timeline_calendar(dv):
+    # the fixtures end in 2019, the weeks of 2020 are on the calendar with 0
+    timeline = dv.timeline(1, sources=['tweets_by'], freq='week', from_date='2019-12-02', to_date='2020-01-31')
+
+    assert timeline.index.tolist() == pd.date_range('2019-12-02', '2020-01-27', freq='W-MON').tolist()
+    assert (timeline.loc[:'2019-12-30', 'tweets'] > 0).all()
+    assert (timeline.loc['2020-01-06':, 'tweets'] == 0).all()
+
+
+def test_timeline_pandas_freq(dv):
+    # by quarter, from the activity by day
+    timeline = dv.timeline(1, sources=['tweets_by'], freq='QS', from_date='2018-01-01', to_date='2018-12-31')
+    days = dv.tweets_by(_id=1, aggregate_by='day', from_date='2018-01-01', to_date='2018-12-31')
+
+    assert timeline.index.tolist() == pd.date_range('2018-01-01', '2018-10-01', freq='QS').tolist()
+    assert timeline['tweets'].tolist() == days.groupby(days['date'].dt.quarter)['tweets'].sum().tolist()
+
+
+def test_timeline_without_activity(dv):
+    timeline = dv.timeline(1, sources=['tweets_by', 'posts_by'], freq='month', from_date='2030-02-10')
+
+    assert timeline.index.tolist() == [pd.Timestamp('2030-02-01')]
+    assert (timeline == 0).all().all()
+
+
+def test_timeline_ids(dv):
+    timeline = dv.timeline([2, 1, 2], sources=['tweets_by', 'comments_by'], freq='year')
+
+    assert timeline.index.names == ['politician_id', 'date']
+    assert timeline.index.get_level_values('politician_id').unique().tolist() == [2, 1]
+    assert timeline.loc[1].equals(dv.timeline(1, sources=['tweets_by', 'comments_by'], freq='year'))
+
+
+def test_timeline_sources(dv):
+    with pytest.raises(ValueError, match='sources'):
+        dv.timeline(1, sources=['get_all'])
@@ -0,0 +1,151 @@
+import pandas as pd
+import pytest
+
+from smm_wrapper import SMMPoliticians
+from smm_wrapper.views import _aggregated_frame, _chobs_frame, _CHOBS_COLUMNS, _TOKEN_LISTS
+from smm_wrapper.mockserver import MockServer
+
+
+@pytest.fixture
+def dv(server):
+    return SMMPoliticians(domain=server.domain).dv
+
+
+def test_panel(dv):
+    panel = dv.panel(ids=[2, 1], metrics=['tweets_by', 'wikipedia'], aggregate_by='year')
+
+    assert panel.index.names == ['politician_id', 'date']
+    assert list(panel.columns) == ['tweets', 'chobs']
+    for _id in (1, 2):
+        tweets = dv.tweets_by(_id=_id, aggregate_by='year')
+        assert panel.loc[_id, 'tweets'].tolist() == tweets['tweets'].astype(float).tolist()
+        assert panel.loc[_id].index.tolist() == tweets['date'].tolist()
+
+
+def test_panel_repeated_keys():
+    # ids given twice, and labels repeated in the responses
+    with MockServer(scale=2) as server:
+        dv = SMMPoliticians(domain=server.domain).dv
+        panel = dv.panel(ids=[1, 2, 1], metrics=['tweets_by', 'posts_by'], aggregate_by='month')
+
+    assert panel.index.is_unique
+    assert sorted(panel.index.get_level_values(0).unique()) == [1, 2]
+
+
+def test_panel_path(dv, tmp_path):
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'panel.parquet')
+    panel = dv.panel(ids=[1, 2, 3], metrics=['posts_by', 'comments_by'], aggregate_by='month')
+
+    assert dv.panel(ids=[1, 2, 3], metrics=['posts_by', 'comments_by'], aggregate_by='month', path=path,
+                    chunksize=2) == path
+    pd.testing.assert_frame_equal(pd.read_parquet(path).set_index(['politician_id', 'date']), panel,
+                                  check_index_type=False)
+
+
+def test_panel_invalid(dv):
+    with pytest.raises(ValueError):
+        dv.panel(ids=[1], metrics=['get_all'])
+    with pytest.raises(ValueError):
+        dv.panel(ids=[1], aggregate_by=None)
+
+
+def _baseline_frame(response, value_column, **query):
+    """The aggregated frame as the DataView used to build it: repeated object columns, parsed dates
+    """
+    response = dict(response, **{key: value for key, value in query.items() if value is not None})
+    response.pop('response_type')
+    response.pop('aggregated_by')
+    response['date'] = response.pop('labels')
+    response[value_column] = response.pop('values')
+    df = pd.DataFrame(response)
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+def test_aggregated_frame(dv):
+    response = dv.api.tweets_by(_id=1, text_contains='a', from_date='2018-01-01', aggregate_by='week')
+    copy = {key: list(value) if isinstance(value, list) else value for key, value in response.items()}
+    df = _aggregated_frame(response, 'tweets', _id=1, text_contains='a', from_date='2018-01-01', to_date=None)
+
+    assert response == copy
+    assert df.attrs['query'] == {'_id': 1, 'text_contains': 'a', 'from_date': '2018-01-01'}
+    assert list(df.columns) == ['_id', 'text_contains', 'from_date', 'date', 'tweets']
+    assert all(isinstance(df[column].dtype, pd.CategoricalDtype) for column in ('_id', 'text_contains', 'from_date'))
+    assert df['date'].dtype.kind == 'M' and df['tweets'].dtype.kind == 'i'
+
+    baseline = _baseline_frame(response, 'tweets', _id=1, text_contains='a', from_date='2018-01-01')
+    pd.testing.assert_frame_equal(df, baseline, check_dtype=False, check_categorical=False)
+
+
+@pytest.mark.parametrize('method', ['tweets_by', 'replies_to', 'posts_by', 'comments_by', 'wikipedia'])
+def test_aggregated_methods(dv, method):
+    df = getattr(dv, method)(_id=2, aggregate_by='month')
+    response = getattr(dv.api, method)(_id=2, aggregate_by='month')
+
+    assert df['date'].dt.strftime('%Y-%m-%d').tolist() == response['labels']
+    assert df.iloc[:, -1].tolist() == response['values']
+    assert df['_id'].tolist() == [2] * len(df)
+
+
+def test_empty_aggregated_frame():
+    df = _aggregated_frame({'response_type': 'aggregated', 'aggregated_by': 'day', 'labels': [], 'values': []},
+                           'posts', _id=1)
+
+    assert df.empty and list(df.columns) == ['_id', 'date', 'posts']
+
+
+CHOBS = [
+    {'right_token': 1, 'left_token': 0, 'ins_tokens': [5, 6], 'del_tokens': [7],
+     'right_token_str': 'b', 'left_token_str': 'a', 'ins_tokens_str': ['e', 'f'], 'del_tokens_str': ['g']},
+    {'right_token': 3, 'left_token': 2, 'ins_tokens': [], 'del_tokens': None,
+     'right_token_str': 'd', 'left_token_str': 'c', 'ins_tokens_str': [], 'del_tokens_str': None},
+    {'right_token': 4, 'left_token': 3, 'ins_tokens': [8],
+     'right_token_str': 'e', 'left_token_str': 'd', 'ins_tokens_str': ['h']},
+]
+
+
+def test_chobs_wide():
+    df = _chobs_frame(CHOBS)
+
+    assert list(df.columns) == _CHOBS_COLUMNS
+    assert df['right_token'].tolist() == [1, 3, 4]
+    assert [list(tokens) for tokens in df['ins_tokens']] == [[5, 6], [], [8]]
+    # missing and null token lists are empty lists
+    assert [list(tokens) for tokens in df['del_tokens_str']] == [['g'], [], []]
+
+
+def test_chobs_baseline(dv):
+    # the values of the frame built with apply(pd.Series) before
+    response = dv.api.wikipedia(_id=1, aggregate_by=None)
+    baseline = pd.DataFrame({'chobs': response['chobs']})['chobs'].apply(pd.Series)[_CHOBS_COLUMNS]
+    df = dv.wikipedia(_id=1, aggregate_by=None)
+
+    assert len(df) == len(baseline)
+    for column in _CHOBS_COLUMNS:
+        values = [list(value) if column in _TOKEN_LISTS or column in _TOKEN_LISTS.values() else value
+                  for value in df[column]]
+        assert values == baseline[column].tolist()
+
+
+def test_chobs_long():
+    df = _chobs_frame(CHOBS, 'long')
+
+    assert list(df.columns) == ['chob', 'op', 'token', 'token_str']
+    assert df['chob'].tolist() == [0, 0, 0, 2]
+    assert df['op'].tolist() == ['ins', 'ins', 'del', 'ins']
+    assert df['token'].tolist() == [5, 6, 7, 8] and df['token_str'].tolist() == ['e', 'f', 'g', 'h']
+    assert list(df['op'].cat.categories) == ['ins', 'del']
+
+
+def test_chobs_chunks(dv):
+    whole = dv.wikipedia(_id=1, aggregate_by=None, chobs_format='long')
+    chunks = list(dv.wikipedia(_id=1, aggregate_by=None, chobs_format='long', chunksize=64))
+
+    assert len(chunks) == -(-300 // 64)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), whole, check_categorical=False)
+
+
+def test_chobs_invalid_format():
+    with pytest.raises(ValueError):
+        _chobs_frame(CHOBS, 'tall')